@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.blog'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        # WebP/AVIF похідні завантажених обкладинок генеруються у фоні
+        from apps.core.images import responsive_images
+        from .models import BlogPost
+        responsive_images(BlogPost, 'featured_image')
@@ -0,0 +1,98 @@
+"""
+In-process індекс опублікованих статей блогу
+
+Тримає в пам'яті воркера легкі копії статей (без контенту) та впорядковані списки
+id по категоріях. Перебудовується однією вибіркою після post_save/post_delete
+BlogPost; інші воркери дізнаються про зміни через версію в кеші.
+"""
+import threading
+import uuid
+from collections import defaultdict
+
+from apps.core.cache import AppCache
+
+from .models import BlogPost
+
+blog_cache = AppCache('blog')
+VERSION_CACHE_KEY = 'index:version'
+
+# Поля, які не потрібні для списків/карток - не тягнемо їх у пам'ять
+HEAVY_FIELDS = ('content', 'rendered_content', 'rendered_hash', 'search_vector')
+
+
+class BlogIndex:
+    """Незмінний знімок опублікованих статей (порядок як у BlogPost.Meta.ordering)"""
+
+    def __init__(self, posts, version=None):
+        self.version = version
+        self.by_id = {post.id: post for post in posts}
+        self.by_slug = {post.slug: post for post in posts}
+        self.ordered_ids = [post.id for post in posts]
+        self.last_modified = max((post.updated_at for post in posts), default=None)
+        self.category_ids = defaultdict(list)
+        for post in posts:
+            self.category_ids[post.category].append(post.id)
+
+    def get(self, slug):
+        return self.by_slug.get(slug)
+
+    def posts(self, category=None):
+        """Список статей (усіх або однієї категорії) у порядку -created_at"""
+        ids = self.category_ids.get(category, []) if category else self.ordered_ids
+        return [self.by_id[post_id] for post_id in ids]
+
+    def popular(self, limit=3):
+        return [self.by_id[post_id] for post_id in self.ordered_ids[:limit]]
+
+    def related(self, post, limit=3):
+        """Інші статті тієї ж категорії"""
+        related = []
+        for post_id in self.category_ids.get(post.category, []):
+            if post_id != post.id:
+                related.append(self.by_id[post_id])
+                if len(related) == limit:
+                    break
+        return related
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def build_blog_index(version=None):
+    """Будує індекс однією вибіркою з БД"""
+    posts = list(BlogPost.objects.filter(is_published=True).defer(*HEAVY_FIELDS))
+    return BlogIndex(posts, version=version)
+
+
+def get_blog_index_version():
+    """Спільна для всіх воркерів версія статей блогу"""
+    version = blog_cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        blog_cache.add(VERSION_CACHE_KEY, version, None)
+        version = blog_cache.get(VERSION_CACHE_KEY, version)
+    return version
+
+
+def get_blog_index():
+    """Повертає актуальний індекс, перебудовуючи його якщо версія в кеші змінилась"""
+    global _index
+    version = get_blog_index_version()
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _lock:
+        if _index is None or _index.version != version:
+            _index = build_blog_index(version)
+        return _index
+
+
+def invalidate_blog_index():
+    """Інвалідує індекс у всіх воркерах (нова версія) та в поточному процесі; повертає нову версію"""
+    global _index
+    version = uuid.uuid4().hex
+    blog_cache.set(VERSION_CACHE_KEY, version, None)
+    _index = None
+    return version
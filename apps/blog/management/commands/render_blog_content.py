@@ -0,0 +1,40 @@
+"""
+Django management команда для попереднього рендерингу HTML статей блогу
+Використовується при деплої на Render (після migrate)
+Безпечна для багаторазового запуску (idempotent)
+
+Перераховує HTML лише для статей, у яких змінився контент або версія рендерера.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.blog.models import BlogPost
+
+
+class Command(BaseCommand):
+    help = 'Заповнює збережений HTML статей блогу (backfill для get_clean_content)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Перерендерити всі статті')
+        parser.add_argument('--batch-size', type=int, default=100, help='Розмір пакету для bulk_update')
+
+    def handle(self, *args, **options):
+        force = options['force']
+        batch_size = options['batch_size']
+
+        posts = BlogPost.objects.only('id', 'content', 'rendered_content', 'rendered_hash').order_by('id')
+        pending = []
+        updated = 0
+
+        for post in posts.iterator(chunk_size=batch_size):
+            if force:
+                post.rendered_hash = ''
+            if post.refresh_rendered_content():
+                pending.append(post)
+            if len(pending) >= batch_size:
+                updated += BlogPost.objects.bulk_update(pending, ['rendered_content', 'rendered_hash'])
+                pending = []
+
+        if pending:
+            updated += BlogPost.objects.bulk_update(pending, ['rendered_content', 'rendered_hash'])
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Оновлено HTML для статей: {updated}'))
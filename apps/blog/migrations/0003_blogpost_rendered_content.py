@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-17 15:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_alter_blogpost_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='rendered_content',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='HTML контенту'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='rendered_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=80, verbose_name='Хеш рендерингу'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-17 16:40
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+INDEX_NAME = 'blog_blogpost_search_gin'
+
+
+def create_search_index(apps, schema_editor):
+    """GIN індекс та початкове заповнення search_vector - лише для PostgreSQL"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from apps.blog.search import PostgresSearchBackend
+
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON blog_blogpost USING gin (search_vector)'
+    )
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    BlogPost.objects.update(search_vector=PostgresSearchBackend().build_vector())
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_blogpost_rendered_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,7 +1,10 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 
+from .rendering import content_hash, is_current, render_content
+
 
 class BlogPost(models.Model):
     title = models.CharField(max_length=200, verbose_name="Заголовок")
@@ -36,6 +39,13 @@ class BlogPost(models.Model):
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
     is_published = models.BooleanField(default=True, verbose_name="Опубліковано")
     
+    # Попередньо відрендерений HTML контенту (заповнюється в save та командою render_blog_content)
+    rendered_content = models.TextField(blank=True, default='', editable=False, verbose_name="HTML контенту")
+    rendered_hash = models.CharField(max_length=80, blank=True, default='', editable=False, verbose_name="Хеш рендерингу")
+    
+    # Повнотекстовий індекс для PostgreSQL (GIN індекс створюється міграцією лише на Postgres)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Стаття блогу"
@@ -57,6 +67,10 @@ class BlogPost(models.Model):
             self.og_title = self.title[:60]
         if not self.og_description:
             self.og_description = self.excerpt[:160]
+        
+        # Рендеримо HTML один раз при збереженні, а не на кожен перегляд
+        if self.refresh_rendered_content() and kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'rendered_content', 'rendered_hash'}
             
         super().save(*args, **kwargs)
     
@@ -78,97 +92,19 @@ class BlogPost(models.Model):
         else:
             return f"{self.reading_time} хвилин"
     
+    def refresh_rendered_content(self):
+        """Оновлює збережений HTML, якщо змінився контент або версія рендерера"""
+        digest = content_hash(self.content)
+        if digest == self.rendered_hash:
+            return False
+        self.rendered_content = render_content(self.content)
+        self.rendered_hash = digest
+        return True
+
     def get_clean_content(self):
-        """Повертає контент без зірочок та форматований для журнального стилю"""
-        import re
-        content = self.content
-        
-        # Прибираємо подвійні зірочки (жирний текст в markdown)
-        content = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', content)
-        
-        # Прибираємо одинарні зірочки
-        content = content.replace('*', '')
-        
-        # Конвертуємо markdown заголовки в HTML
-        content = re.sub(r'^### (.+)$', r'<h3>\1</h3>', content, flags=re.MULTILINE)
-        content = re.sub(r'^## (.+)$', r'<h2>\1</h2>', content, flags=re.MULTILINE)
-        content = re.sub(r'^# (.+)$', r'<h1>\1</h1>', content, flags=re.MULTILINE)
-        
-        # Конвертуємо параграфи
-        lines = content.split('\n')
-        formatted_lines = []
-        in_paragraph = False
-        in_blockquote = False
-        in_list = False
-        
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                if in_paragraph:
-                    formatted_lines.append('</p>')
-                    in_paragraph = False
-                if in_blockquote:
-                    formatted_lines.append('</blockquote>')
-                    in_blockquote = False
-                if in_list:
-                    formatted_lines.append('</ul>')
-                    in_list = False
-                formatted_lines.append('')
-            elif line.startswith('<h') or line.startswith('</h'):
-                if in_paragraph:
-                    formatted_lines.append('</p>')
-                    in_paragraph = False
-                if in_blockquote:
-                    formatted_lines.append('</blockquote>')
-                    in_blockquote = False
-                if in_list:
-                    formatted_lines.append('</ul>')
-                    in_list = False
-                formatted_lines.append(line)
-            elif line.startswith('>'):
-                # Цитата (blockquote)
-                if in_paragraph:
-                    formatted_lines.append('</p>')
-                    in_paragraph = False
-                if in_list:
-                    formatted_lines.append('</ul>')
-                    in_list = False
-                if not in_blockquote:
-                    formatted_lines.append('<blockquote>')
-                    in_blockquote = True
-                quote_text = line[1:].strip()
-                if quote_text:
-                    formatted_lines.append(f'<p>{quote_text}</p>')
-            elif line.startswith('-'):
-                if in_paragraph:
-                    formatted_lines.append('</p>')
-                    in_paragraph = False
-                if in_blockquote:
-                    formatted_lines.append('</blockquote>')
-                    in_blockquote = False
-                if not in_list:
-                    formatted_lines.append('<ul>')
-                    in_list = True
-                formatted_lines.append(f'<li>{line[1:].strip()}</li>')
-            else:
-                if in_blockquote:
-                    formatted_lines.append('</blockquote>')
-                    in_blockquote = False
-                if in_list:
-                    formatted_lines.append('</ul>')
-                    in_list = False
-                if not in_paragraph and not line.startswith('<'):
-                    formatted_lines.append('<p>')
-                    in_paragraph = True
-                formatted_lines.append(line)
-        
-        if in_paragraph:
-            formatted_lines.append('</p>')
-        if in_blockquote:
-            formatted_lines.append('</blockquote>')
-        if in_list:
-            formatted_lines.append('</ul>')
-        
-        content = '\n'.join(formatted_lines)
-        
-        return content
+        """Повертає готовий HTML контенту (збережений при save або backfill)"""
+        # Контент змінюється лише через save(), тож достатньо перевірити версію рендерера
+        if is_current(self.rendered_hash):
+            return self.rendered_content
+        # Запасний шлях для записів, які ще не пройшли backfill
+        return render_content(self.content)
@@ -0,0 +1,169 @@
+"""
+Рендеринг markdown-контенту статей у HTML для журнального стилю
+"""
+import hashlib
+
+# Збільшуйте при кожній зміні логіки рендерингу - це інвалідує збережений HTML
+RENDERER_VERSION = 1
+RENDERER_PREFIX = f'v{RENDERER_VERSION}:'
+
+
+def content_hash(content):
+    """Ключ збереженого HTML: версія рендерера + sha256 контенту"""
+    digest = hashlib.sha256((content or '').encode('utf-8')).hexdigest()
+    return f'{RENDERER_PREFIX}{digest}'
+
+
+def is_current(rendered_hash):
+    """Чи зроблено збережений HTML поточною версією рендерера (без хешування контенту)"""
+    return bool(rendered_hash) and rendered_hash.startswith(RENDERER_PREFIX)
+
+
+_HEADINGS = (('### ', 'h3'), ('## ', 'h2'), ('# ', 'h1'))
+
+# Скільки HTML-фрагментів збирати перед склеюванням у проміжний шматок
+_CHUNK_SIZE = 32
+
+
+def _iter_lines(content):
+    """
+    Inline-прохід по контенту: **жирний** → <strong>, решта зірочок прибирається.
+    Читає рядок один раз і віддає готові рядки по одному (без split та копій всього тексту).
+    """
+    parts = []
+    pos = 0
+    length = len(content)
+    find = content.find
+    closing = -1  # позиція закриваючих ** для відкритого <strong>
+
+    while True:
+        star = closing if closing != -1 else find('*', pos)
+        stop = length if star == -1 else star
+
+        # Текст до наступної зірочки (може містити кілька рядків)
+        newline = find('\n', pos, stop)
+        while newline != -1:
+            parts.append(content[pos:newline])
+            yield ''.join(parts)
+            parts.clear()
+            pos = newline + 1
+            newline = find('\n', pos, stop)
+        parts.append(content[pos:stop])
+
+        if closing != -1:
+            parts.append('</strong>')
+            pos = closing + 2
+            closing = -1
+            continue
+        if star == -1:
+            break
+
+        # **текст** без зірочок всередині - жирний (як і раніше, може охоплювати кілька рядків)
+        if content.startswith('**', star):
+            end = find('*', star + 2)
+            if end > star + 2 and content.startswith('**', end):
+                parts.append('<strong>')
+                closing = end
+                pos = star + 2
+                continue
+
+        # Одинарна зірочка - просто пропускаємо
+        pos = star + 1
+
+    yield ''.join(parts)
+
+
+def iter_html(content):
+    """Генератор HTML-рядків контенту (без роздільників між ними)"""
+    in_paragraph = False
+    in_blockquote = False
+    in_list = False
+
+    for line in _iter_lines(content or ''):
+        # Markdown заголовки (перевіряються до strip, як у ^### (.+)$)
+        for prefix, tag in _HEADINGS:
+            if line.startswith(prefix) and len(line) > len(prefix):
+                line = f'<{tag}>{line[len(prefix):]}</{tag}>'
+                break
+
+        line = line.strip()
+        if not line:
+            if in_paragraph:
+                yield '</p>'
+                in_paragraph = False
+            if in_blockquote:
+                yield '</blockquote>'
+                in_blockquote = False
+            if in_list:
+                yield '</ul>'
+                in_list = False
+            yield ''
+        elif line.startswith('<h') or line.startswith('</h'):
+            if in_paragraph:
+                yield '</p>'
+                in_paragraph = False
+            if in_blockquote:
+                yield '</blockquote>'
+                in_blockquote = False
+            if in_list:
+                yield '</ul>'
+                in_list = False
+            yield line
+        elif line.startswith('>'):
+            # Цитата (blockquote)
+            if in_paragraph:
+                yield '</p>'
+                in_paragraph = False
+            if in_list:
+                yield '</ul>'
+                in_list = False
+            if not in_blockquote:
+                yield '<blockquote>'
+                in_blockquote = True
+            quote_text = line[1:].strip()
+            if quote_text:
+                yield f'<p>{quote_text}</p>'
+        elif line.startswith('-'):
+            if in_paragraph:
+                yield '</p>'
+                in_paragraph = False
+            if in_blockquote:
+                yield '</blockquote>'
+                in_blockquote = False
+            if not in_list:
+                yield '<ul>'
+                in_list = True
+            yield f'<li>{line[1:].strip()}</li>'
+        else:
+            if in_blockquote:
+                yield '</blockquote>'
+                in_blockquote = False
+            if in_list:
+                yield '</ul>'
+                in_list = False
+            if not in_paragraph and not line.startswith('<'):
+                yield '<p>'
+                in_paragraph = True
+            yield line
+
+    if in_paragraph:
+        yield '</p>'
+    if in_blockquote:
+        yield '</blockquote>'
+    if in_list:
+        yield '</ul>'
+
+
+def render_content(content):
+    """Повертає контент без зірочок та форматований для журнального стилю"""
+    # Склеюємо фрагменти порціями, щоб не тримати в пам'яті сотні дрібних рядків
+    chunks = []
+    batch = []
+    for piece in iter_html(content):
+        batch.append(piece)
+        if len(batch) == _CHUNK_SIZE:
+            chunks.append('\n'.join(batch))
+            batch.clear()
+    if batch or not chunks:
+        chunks.append('\n'.join(batch))
+    return '\n'.join(chunks)
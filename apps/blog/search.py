@@ -0,0 +1,402 @@
+"""
+Повнотекстовий пошук по блогу з ранжуванням та підсвіченими фрагментами
+
+Два бекенди з однаковим інтерфейсом:
+- PostgresSearchBackend - SearchVector/GIN (продакшн, Render)
+- InMemorySearchBackend - інвертований індекс на Python зі стемінгом (SQLite, розробка)
+
+Обидва повертають ледачу послідовність для Paginator: статті та фрагменти
+вантажаться лише для поточної сторінки.
+"""
+import heapq
+import math
+import re
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import connection
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+
+from .models import BlogPost
+
+# ===== ТОКЕНІЗАЦІЯ ТА СТЕМІНГ =====
+
+TOKEN_RE = re.compile(r"[\w'’ʼ]+")
+APOSTROPHES_RE = re.compile(r"['’ʼ]")
+CYRILLIC_RE = re.compile(r'[а-яіїєґ]')
+
+STOP_WORDS = frozenset("""
+і й та а але або чи що як це ці цей ця той та ті до від для на в у з із зі за по при про не ні так же би б
+ви ми ти він вона воно вони я його її їх вам нам вас нас є бути був була було були все всі весь дуже
+the a an and or of to in on for is are be by with as at it this that from not
+""".split())
+
+# Закінчення української мови (довші перевіряються першими)
+UK_SUFFIXES = tuple(sorted("""
+ування ювання ання яння ення іння ість ості остей ами ями ові еві ого ому ими іми их іх ий ій ої ою ею
+ом ем ах ях ам ям ів їв ей ють ать ить ують ює ає ує ного ної них ним ній а я у ю і и е о ь й є ї
+""".split(), key=len, reverse=True))
+UK_REFLEXIVE = ('ся', 'сь')
+EN_SUFFIXES = ('ingly', 'edly', 'ing', 'ies', 'ied', 'ed', 'es', 'ly', 's')
+MIN_STEM = 3
+
+# Вага полів для ранжування
+FIELD_WEIGHTS = (('title', 3.0), ('keywords', 2.0), ('excerpt', 1.5), ('content', 1.0))
+
+
+@lru_cache(maxsize=100_000)
+def stem(word):
+    """Легкий стемер: відкидає типові закінчення (українська або англійська)"""
+    if CYRILLIC_RE.search(word):
+        for suffix in UK_REFLEXIVE:
+            if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+                word = word[:-len(suffix)]
+                break
+        suffixes = UK_SUFFIXES
+    else:
+        suffixes = EN_SUFFIXES
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    """Текст → список стемів (без стоп-слів)"""
+    terms = []
+    for word in TOKEN_RE.findall((text or '').lower()):
+        if "'" in word or '’' in word or 'ʼ' in word:
+            word = APOSTROPHES_RE.sub('', word)
+        if len(word) < 2 or word in STOP_WORDS:
+            continue
+        terms.append(stem(word))
+    return terms
+
+
+def _is_match(match, terms):
+    word = match.group().lower()
+    if "'" in word or '’' in word or 'ʼ' in word:
+        word = APOSTROPHES_RE.sub('', word)
+    return stem(word) in terms
+
+
+def _term_pattern(term):
+    """Регулярний вираз для стему з можливим апострофом між літерами (пам'ять → памят)"""
+    return "['’ʼ]?".join(re.escape(char) for char in term)
+
+
+def highlight(text, terms, width=200):
+    """Фрагмент тексту навколо першого збігу з <mark> навколо знайдених слів (HTML-safe)"""
+    text = re.sub(r'[*#>]+', '', text or '')
+    # Стеми - префікси слів, тож кандидатів шукаємо одним регулярним виразом, а не по кожному слову
+    candidates_re = re.compile(
+        r"(?<![\w'’ʼ])(?:%s)[\w'’ʼ]*" % '|'.join(_term_pattern(term) for term in sorted(terms, key=len, reverse=True)),
+        re.IGNORECASE,
+    ) if terms else None
+    matches = candidates_re.finditer(text) if candidates_re else iter(())
+    first = next((match for match in matches if _is_match(match, terms)), None)
+    if first is None:
+        return escape(text[:width].strip())
+
+    start = max(0, first.start() - width // 4)
+    end = min(len(text), start + width)
+    parts = ['…' if start else '']
+    pos = start
+    # Підсвічуємо лише слова всередині вікна фрагмента
+    for match in candidates_re.finditer(text, first.start(), end):
+        if match.end() > end:
+            break
+        if not _is_match(match, terms):
+            continue
+        parts.append(escape(text[pos:match.start()]))
+        parts.append(f'<mark>{escape(match.group())}</mark>')
+        pos = match.end()
+    parts.append(escape(text[pos:end]))
+    if end < len(text):
+        parts.append('…')
+    return ''.join(parts).strip()
+
+
+# ===== РЕЗУЛЬТАТИ =====
+
+class RankedResults:
+    """
+    Результати in-memory пошуку для Paginator: впорядковуються ліниво
+    (heap для перших сторінок, повне сортування лише для глибоких), статті
+    вантажаться однією вибіркою лише для зрізу.
+    """
+    full_sort_threshold = 200
+
+    def __init__(self, scores, terms):
+        self.scores = scores  # {post_id: score}
+        self.terms = terms
+        self._ordered = None
+
+    def __len__(self):
+        return len(self.scores)
+
+    def ranked(self, stop=None):
+        """[(post_id, score)] за спаданням релевантності (перші stop)"""
+        if self._ordered is None and stop is not None and stop <= self.full_sort_threshold:
+            return heapq.nlargest(stop, self.scores.items(), key=itemgetter(1))
+        if self._ordered is None:
+            self._ordered = sorted(self.scores.items(), key=itemgetter(1), reverse=True)
+        return self._ordered[:stop]
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        start, stop, _ = item.indices(len(self))
+        chunk = self.ranked(stop)[start:stop]
+        posts = BlogPost.objects.in_bulk([post_id for post_id, _ in chunk])
+        results = []
+        for post_id, score in chunk:
+            post = posts.get(post_id)
+            if post is None:
+                continue
+            post.search_score = score
+            post.search_snippet = highlight(post.content, self.terms)
+            results.append(post)
+        return results
+
+
+class QuerySetResults:
+    """Обгортка над анотованим queryset Postgres: екранує фрагменти SearchHeadline"""
+    START_SEL = '\x02'
+    STOP_SEL = '\x03'
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    def __len__(self):
+        return self.queryset.count()
+
+    def __getitem__(self, item):
+        posts = self.queryset[item]
+        if not isinstance(item, slice):
+            return self._finalize(posts)
+        return [self._finalize(post) for post in posts]
+
+    def _finalize(self, post):
+        post.search_snippet = (
+            escape(post.search_snippet or '')
+            .replace(self.START_SEL, '<mark>')
+            .replace(self.STOP_SEL, '</mark>')
+        )
+        return post
+
+
+# ===== БЕКЕНДИ =====
+
+class InMemorySearchBackend:
+    """Інвертований індекс з BM25 ранжуванням (для SQLite/розробки)"""
+    k1 = 1.2
+    b = 0.75
+    # Терміни, що є майже в кожній статті, не впливають на порядок - пропускаємо їх
+    # (якщо в запиті є інші слова)
+    common_term_ratio = 0.5
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = None
+        self._clear()
+
+    def _clear(self):
+        self.postings = defaultdict(dict)  # term -> {post_id: BM25-вага терміну в статті}
+        self.doc_terms = {}                # post_id -> terms
+        self.doc_length = {}               # post_id -> зважена довжина
+        self.total_length = 0.0
+
+    # --- побудова індексу ---
+
+    def rebuild(self, posts, version=None):
+        """Повна перебудова: спершу рахуємо середню довжину, потім нормовані ваги"""
+        documents = [(post.pk, *self._analyze(post)) for post in posts if post.is_published]
+        with self._lock:
+            self._clear()
+            self.total_length = sum(length for _, _, length in documents)
+            avg_length = self._average_length(len(documents))
+            for post_id, weights, length in documents:
+                self._store(post_id, weights, length, avg_length)
+            self.version = version
+
+    def ensure_fresh(self):
+        """Перебудовує індекс з БД, якщо статті змінились в іншому процесі"""
+        from .index import get_blog_index_version
+        version = get_blog_index_version()
+        if version != self.version:
+            posts = BlogPost.objects.filter(is_published=True).only(
+                'id', 'title', 'keywords', 'excerpt', 'content', 'is_published'
+            ).iterator()
+            self.rebuild(posts, version)
+
+    def update(self, post, version=None):
+        """Інкрементальне оновлення однієї статті (ваги нормуються по поточній середній довжині)"""
+        weights, length = self._analyze(post)
+        with self._lock:
+            self._remove(post.pk)
+            if post.is_published:
+                self.total_length += length
+                # Середня довжина - з урахуванням щойно доданої статті
+                self._store(post.pk, weights, length, self._average_length(len(self.doc_length) + 1))
+            if version is not None and self.version is not None:
+                self.version = version
+
+    def remove(self, post_id, version=None):
+        with self._lock:
+            self._remove(post_id)
+            if version is not None and self.version is not None:
+                self.version = version
+
+    def _analyze(self, post):
+        weights = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS:
+            for term in tokenize(getattr(post, field, '')):
+                weights[term] += weight
+        return weights, sum(weights.values())
+
+    def _average_length(self, doc_count):
+        return self.total_length / doc_count if doc_count and self.total_length else 1.0
+
+    def _store(self, post_id, weights, length, avg_length):
+        norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+        for term, tf in weights.items():
+            self.postings[term][post_id] = tf * (self.k1 + 1) / (tf + norm)
+        self.doc_terms[post_id] = tuple(weights)
+        self.doc_length[post_id] = length
+
+    def _remove(self, post_id):
+        terms = self.doc_terms.pop(post_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(post_id, None)
+                if not posting:
+                    del self.postings[term]
+        self.total_length -= self.doc_length.pop(post_id, 0.0)
+
+    # --- пошук ---
+
+    def rank(self, query):
+        """({post_id: score}, terms); якщо можливо - лише статті з усіма словами запиту"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            doc_count = len(self.doc_length)
+            postings = [self.postings[term] for term in terms if term in self.postings]
+            if not postings:
+                return {}, set(terms)
+            all_terms_found = len(postings) == len(terms)
+
+            rare = [posting for posting in postings if len(posting) <= doc_count * self.common_term_ratio]
+            if rare:
+                postings = rare
+            postings.sort(key=len)
+            weighted = [
+                (posting, math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5)))
+                for posting in postings
+            ]
+
+            # AND: починаємо з найкоротшого списку та звужуємо його рештою
+            first, idf = weighted[0]
+            scores = {post_id: idf * weight for post_id, weight in first.items()}
+            if all_terms_found:
+                for posting, idf in weighted[1:]:
+                    scores = {
+                        post_id: score + idf * posting[post_id]
+                        for post_id, score in scores.items() if post_id in posting
+                    }
+            if not scores or not all_terms_found:
+                # OR: статті хоча б з одним словом
+                scores = {}
+                for posting, idf in weighted:
+                    get = scores.get
+                    scores.update({post_id: get(post_id, 0.0) + idf * weight for post_id, weight in posting.items()})
+
+        return scores, set(terms)
+
+    def search(self, query):
+        self.ensure_fresh()
+        scores, terms = self.rank(query)
+        return RankedResults(scores, terms)
+
+
+class PostgresSearchBackend:
+    """SearchVector + GIN індекс; конфігурації з settings.BLOG_SEARCH_PG_CONFIGS"""
+
+    @property
+    def configs(self):
+        # 'simple' для української (вбудованої конфігурації немає), 'english' зі стемінгом
+        return getattr(settings, 'BLOG_SEARCH_PG_CONFIGS', ('simple', 'english'))
+
+    def build_vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        vector = None
+        for config in self.configs:
+            for field, weight in (('title', 'A'), ('keywords', 'B'), ('excerpt', 'C'), ('content', 'D')):
+                part = SearchVector(field, config=config, weight=weight)
+                vector = part if vector is None else vector + part
+        return vector
+
+    def build_query(self, query):
+        from django.contrib.postgres.search import SearchQuery
+
+        search_query = None
+        for config in self.configs:
+            part = SearchQuery(query, config=config, search_type='websearch')
+            search_query = part if search_query is None else search_query | part
+        return search_query
+
+    def update(self, post, version=None):
+        BlogPost.objects.filter(pk=post.pk).update(search_vector=self.build_vector())
+
+    def remove(self, post_id, version=None):
+        pass
+
+    def search(self, query):
+        from django.contrib.postgres.search import SearchHeadline, SearchRank
+
+        search_query = self.build_query(query)
+        queryset = (
+            BlogPost.objects.filter(is_published=True, search_vector=search_query)
+            .annotate(
+                search_score=SearchRank('search_vector', search_query),
+                search_snippet=SearchHeadline(
+                    'content', search_query, config=self.configs[0],
+                    start_sel=QuerySetResults.START_SEL, stop_sel=QuerySetResults.STOP_SEL,
+                    max_words=35, min_words=15,
+                ),
+            )
+            .order_by('-search_score', '-created_at')
+        )
+        return QuerySetResults(queryset)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_search_backend():
+    """Бекенд з settings.BLOG_SEARCH_BACKEND або за типом БД"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, 'BLOG_SEARCH_BACKEND', '')
+                if path:
+                    _backend = import_string(path)()
+                elif connection.vendor == 'postgresql':
+                    _backend = PostgresSearchBackend()
+                else:
+                    _backend = InMemorySearchBackend()
+    return _backend
+
+
+def search_posts(query):
+    return get_search_backend().search(query)
@@ -0,0 +1,44 @@
+"""
+Сигнали блогу: інвалідація in-process індексу та оновлення пошукового індексу
+"""
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .index import invalidate_blog_index
+from .models import BlogPost
+from .search import get_search_backend
+
+logger = logging.getLogger(__name__)
+
+
+# Версія змінюється після коміту: інакше інший процес може перебудувати індекси
+# (список, пошук, підказки) з рядків до коміту та закешувати їх під новою версією
+
+@receiver(post_save, sender=BlogPost)
+def blog_post_saved(sender, instance, **kwargs):
+    def apply():
+        version = invalidate_blog_index()
+        try:
+            get_search_backend().update(instance, version=version)
+        except Exception as e:
+            logger.error(f"Failed to update search index for post {instance.pk}: {e}")
+
+    transaction.on_commit(apply)
+
+
+@receiver(post_delete, sender=BlogPost)
+def blog_post_deleted(sender, instance, **kwargs):
+    # Після delete() у instance.pk вже None
+    post_id = instance.pk
+
+    def apply():
+        version = invalidate_blog_index()
+        try:
+            get_search_backend().remove(post_id, version=version)
+        except Exception as e:
+            logger.error(f"Failed to remove post {post_id} from search index: {e}")
+
+    transaction.on_commit(apply)
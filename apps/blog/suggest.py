@@ -0,0 +1,158 @@
+"""
+Підказки пошуку (search-as-you-type) по заголовках та ключових словах блогу
+
+Стиснене префіксне дерево (radix trie) будується з in-process індексу блогу
+(без окремих запитів у БД) та перебудовується, коли змінюється версія індексу.
+У кожному вузлі заздалегідь збережено топ-N завершень, тож відповідь на префікс -
+це прохід по кількох ребрах без обходу піддерева.
+"""
+import re
+import threading
+from urllib.parse import urlencode
+
+from django.urls import reverse
+
+from .index import get_blog_index
+
+MAX_SUGGESTIONS = 10
+TITLE_WEIGHT = 2.0
+KEYWORD_WEIGHT = 1.0
+
+SPACES_RE = re.compile(r'\s+')
+
+
+def normalize(text):
+    return SPACES_RE.sub(' ', (text or '').lower()).strip()
+
+
+class _Node:
+    __slots__ = ('edges', 'items', 'top')
+
+    def __init__(self):
+        self.edges = {}  # перша літера -> [мітка ребра, вузол]
+        self.items = []  # записи, ключ яких закінчується в цьому вузлі
+        self.top = ()    # топ-N записів піддерева
+
+
+class SuggestTrie:
+    """Radix trie: ключ → записи {'text', 'type', 'url'} з вагою"""
+
+    def __init__(self, limit=MAX_SUGGESTIONS):
+        self.root = _Node()
+        self.limit = limit
+
+    def insert(self, key, weight, item):
+        node = self.root
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None:
+                child = _Node()
+                node.edges[key[0]] = [key, child]
+                node = child
+                break
+            label, child = edge
+            common = _common_prefix_length(label, key)
+            if common < len(label):
+                # Розщеплюємо ребро на спільну частину та залишок
+                middle = _Node()
+                middle.edges[label[common]] = [label[common:], child]
+                edge[0], edge[1] = label[:common], middle
+                child = middle
+            node = child
+            key = key[common:]
+        node.items.append((weight, item))
+
+    def finalize(self):
+        """Рахує топ-N для кожного вузла (після вставки всіх ключів)"""
+        self._collect(self.root)
+
+    def _collect(self, node):
+        candidates = list(node.items)
+        for _, child in node.edges.values():
+            candidates.extend(self._collect(child))
+        top = []
+        seen = set()
+        for weight, item in sorted(candidates, key=lambda entry: entry[0], reverse=True):
+            if item['text'] in seen:
+                continue
+            seen.add(item['text'])
+            top.append((weight, item))
+            if len(top) == self.limit:
+                break
+        node.top = tuple(top)
+        return node.top
+
+    def complete(self, prefix, limit=MAX_SUGGESTIONS):
+        node = self.root
+        key = prefix
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None:
+                return []
+            label, child = edge
+            if key.startswith(label):
+                key = key[len(label):]
+            elif label.startswith(key):
+                key = ''
+            else:
+                return []
+            node = child
+        return [item for _, item in node.top[:limit]]
+
+
+def _common_prefix_length(left, right):
+    length = min(len(left), len(right))
+    for position in range(length):
+        if left[position] != right[position]:
+            return position
+    return length
+
+
+def build_suggest_trie(posts):
+    """Заголовки (повністю та з кожного слова) та ключові слова опублікованих статей"""
+    trie = SuggestTrie()
+    search_url = reverse('blog:blog_search')
+    total = len(posts)
+    for position, post in enumerate(posts):
+        # Новіші статті трохи вище серед однакових за типом
+        recency = (total - position) / (total + 1)
+        url = post.get_absolute_url()
+        title = normalize(post.title)
+        item = {'text': post.title, 'type': 'title', 'url': url}
+        words = title.split(' ')
+        for start in range(len(words)):
+            # Збіг з початком заголовка важливіший за збіг з середини
+            weight = TITLE_WEIGHT + recency - (0.5 if start else 0)
+            trie.insert(' '.join(words[start:]), weight, item)
+        for keyword in post.get_keywords_list():
+            if keyword:
+                trie.insert(
+                    normalize(keyword), KEYWORD_WEIGHT + recency,
+                    {'text': keyword, 'type': 'keyword', 'url': f'{search_url}?{urlencode({"q": keyword})}'},
+                )
+    trie.finalize()
+    return trie
+
+
+_trie = None
+_trie_version = None
+_lock = threading.Lock()
+
+
+def get_suggest_trie():
+    """Trie для поточної версії індексу блогу (перебудова лише після змін статей)"""
+    global _trie, _trie_version
+    index = get_blog_index()
+    if _trie is None or _trie_version != index.version:
+        with _lock:
+            if _trie is None or _trie_version != index.version:
+                _trie = build_suggest_trie(index.posts())
+                _trie_version = index.version
+    return _trie
+
+
+def suggest(prefix, limit=MAX_SUGGESTIONS):
+    prefix = normalize(prefix)
+    if not prefix:
+        return []
+    return get_suggest_trie().complete(prefix, min(max(limit, 1), MAX_SUGGESTIONS))
@@ -0,0 +1,171 @@
+"""
+Тести блогу: кількість запитів до БД на сторінках, інвалідація in-process індексу,
+підказки пошуку та еталонний HTML рендерера
+
+Еталони в golden/ зроблені попереднім (regex) рендерером для кожної статті з
+seed_initial_data; оновлюються лише свідомо, разом зі зміною RENDERER_VERSION.
+"""
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.core.testing import ISOLATED_SETTINGS
+
+from .index import get_blog_index, invalidate_blog_index
+from .models import BlogPost
+from .rendering import render_content
+
+GOLDEN_DIR = Path(__file__).resolve().parent / 'golden'
+
+
+def create_post(number, **fields):
+    defaults = {
+        'title': f'Стаття {number}',
+        'slug': f'post-{number}',
+        'excerpt': f'Короткий опис статті {number}',
+        'content': f'## Розділ {number}\n\nТекст статті з **виділенням** та [посиланням](https://example.com).',
+        'seo_title': f'Стаття {number}',
+        'seo_description': f'Опис статті {number}',
+        'keywords': 'django, python',
+        'category': 'web-development' if number % 2 else 'courses',
+    }
+    return BlogPost.objects.create(**{**defaults, **fields})
+
+
+@override_settings(**ISOLATED_SETTINGS)
+class BlogIndexTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_blog_index()
+
+
+class BlogPageQueriesTests(BlogIndexTestCase):
+    """Після прогріву індексу списки не ходять у БД, сторінка статті - один запит"""
+
+    def setUp(self):
+        super().setUp()
+        self.posts = [create_post(number) for number in range(12)]
+        self.draft = create_post(99, is_published=False)
+        invalidate_blog_index()
+
+    def assertQueriesAfterWarmup(self, count, url, data=None):
+        self.assertEqual(self.client.get(url, data).status_code, 200)
+        with self.assertNumQueries(count):
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_blog_list(self):
+        response = self.assertQueriesAfterWarmup(0, reverse('blog:blog_list'))
+        self.assertEqual(len(response.context['page_obj']), 9)
+        self.assertEqual(len(response.context['popular_posts']), 3)
+
+    def test_blog_list_second_page(self):
+        response = self.assertQueriesAfterWarmup(0, reverse('blog:blog_list'), {'page': 2})
+        self.assertEqual(len(response.context['page_obj']), 3)
+
+    def test_category_page(self):
+        response = self.assertQueriesAfterWarmup(0, reverse('blog:blog_list'), {'category': 'courses'})
+        self.assertTrue(response.context['page_obj'])
+        self.assertTrue(all(post.category == 'courses' for post in response.context['page_obj']))
+
+    def test_detail(self):
+        post = self.posts[3]
+        response = self.assertQueriesAfterWarmup(1, post.get_absolute_url())
+        self.assertEqual(response.context['post'], post)
+        related = response.context['related_posts']
+        self.assertTrue(related)
+        self.assertTrue(all(item.category == post.category and item.pk != post.pk for item in related))
+
+    def test_empty_search_lists_published_posts(self):
+        for query in ({}, {'q': ''}, {'q': '   '}):
+            with self.subTest(query=query):
+                response = self.assertQueriesAfterWarmup(0, reverse('blog:blog_search'), query)
+                page = response.context['page_obj']
+                self.assertEqual(page.paginator.count, len(self.posts))
+                self.assertEqual(list(page), sorted(self.posts, key=lambda post: post.created_at, reverse=True)[:9])
+
+    def test_unknown_and_draft_slugs_404_without_queries(self):
+        self.client.get(reverse('blog:blog_list'))
+        for slug in ('missing-post', self.draft.slug):
+            with self.subTest(slug=slug), self.assertNumQueries(0):
+                response = self.client.get(reverse('blog:blog_detail', kwargs={'slug': slug}))
+            self.assertEqual(response.status_code, 404)
+
+
+class BlogIndexInvalidationTests(BlogIndexTestCase):
+    def test_save_invalidates_index_after_commit(self):
+        post = create_post(1)
+        version = get_blog_index().version
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.title = 'Оновлена стаття'
+            post.save()
+            # До коміту інші процеси не повинні бачити нову версію
+            self.assertEqual(get_blog_index().version, version)
+
+        index = get_blog_index()
+        self.assertNotEqual(index.version, version)
+        self.assertEqual(index.get(post.slug).title, 'Оновлена стаття')
+
+    def test_delete_invalidates_index_after_commit(self):
+        post = create_post(1)
+        self.assertIsNotNone(get_blog_index().get(post.slug))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+            self.assertIsNotNone(get_blog_index().get('post-1'))
+
+        self.assertIsNone(get_blog_index().get('post-1'))
+
+
+class BlogSuggestTests(BlogIndexTestCase):
+    def setUp(self):
+        super().setUp()
+        create_post(1, title='Django та PostgreSQL', keywords='бази даних, orm')
+        create_post(2, title='Django REST Framework')
+        create_post(3, title='Чернетка про Django', is_published=False)
+        self.url = reverse('blog:blog_suggest')
+
+    def suggestions(self, query, **params):
+        response = self.client.get(self.url, {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item['text'] for item in response.json()['suggestions']]
+
+    def test_prefix_matches_published_titles(self):
+        self.assertEqual(sorted(self.suggestions('DJAN')), ['Django REST Framework', 'Django та PostgreSQL', 'django'])
+        self.assertEqual(self.suggestions('django  re'), ['Django REST Framework'])
+        self.assertEqual(self.suggestions('orm'), ['orm'])
+        self.assertEqual(self.suggestions('чернетка'), [])
+        self.assertEqual(self.suggestions(''), [])
+        self.assertEqual(len(self.suggestions('d', limit=1)), 1)
+
+    def test_no_queries_after_warmup(self):
+        self.suggestions('dj')
+        with self.assertNumQueries(0):
+            self.suggestions('django')
+
+
+@override_settings(**ISOLATED_SETTINGS)
+class RenderingGoldenTests(TestCase):
+    """HTML кожної статті з seed_initial_data побайтово збігається з еталоном"""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_initial_data', stdout=StringIO())
+
+    def test_every_seeded_post_has_golden_html(self):
+        slugs = BlogPost.objects.values_list('slug', flat=True)
+        self.assertEqual(sorted(path.stem for path in GOLDEN_DIR.glob('*.html')), sorted(slugs))
+
+    def test_seeded_posts_render_byte_identical(self):
+        for post in BlogPost.objects.all():
+            with self.subTest(slug=post.slug):
+                golden = (GOLDEN_DIR / f'{post.slug}.html').read_bytes()
+                self.assertEqual(render_content(post.content).encode('utf-8'), golden)
+                # Збережений при save() HTML - той самий
+                self.assertEqual(post.rendered_content.encode('utf-8'), golden)
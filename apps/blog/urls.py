@@ -6,5 +6,6 @@ app_name = 'blog'
 urlpatterns = [
     path('', views.blog_list, name='blog_list'),
     path('search/', views.blog_search, name='blog_search'),
+    path('search/suggest/', views.blog_suggest, name='blog_suggest'),
     re_path(r'^(?P<slug>[-\w\u0400-\u04FF.]+)/$', views.BlogDetailView.as_view(), name='blog_detail'),
 ] 
\ No newline at end of file
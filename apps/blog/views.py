@@ -1,17 +1,35 @@
 from django.shortcuts import render
 from django.core.paginator import Paginator
+from django.http import Http404, JsonResponse
+from django.utils.decorators import method_decorator
 from django.views.generic import DetailView
-from django.db.models import Q
+from apps.core.conditional import build_etag, conditional_page
+from .index import get_blog_index
 from .models import BlogPost
+from .search import search_posts
+from .suggest import MAX_SUGGESTIONS, suggest
+import logging
 
+logger = logging.getLogger(__name__)
 
+
+def blog_etag(request, *args, **kwargs):
+    """Будь-яка зміна статей змінює версію індексу, а отже і ETag"""
+    return build_etag(request, 'blog', get_blog_index().version)
+
+
+def blog_last_modified(request, *args, **kwargs):
+    return get_blog_index().last_modified
+
+
+@conditional_page(etag_func=blog_etag, last_modified_func=blog_last_modified)
 def blog_list(request):
     """Список статей блогу з фільтрацією"""
     try:
-        posts = BlogPost.objects.filter(is_published=True)
+        # Списки беремо з in-process індексу - без COUNT та окремих запитів
+        index = get_blog_index()
         category = request.GET.get('category')
-        if category:
-            posts = posts.filter(category=category)
+        posts = index.posts(category)
         
         # Пагінація
         paginator = Paginator(posts, 9)
@@ -19,9 +37,7 @@ def blog_list(request):
         page_obj = paginator.get_page(page_number)
         
         # Популярні статті
-        popular_posts = BlogPost.objects.filter(
-            is_published=True
-        ).order_by('-created_at')[:3]
+        popular_posts = index.popular(3)
         
     except Exception:
         # Fallback якщо таблиці не існують
@@ -42,6 +58,7 @@ def blog_list(request):
     return render(request, 'pages/blog.html', context)
 
 
+@method_decorator(conditional_page(etag_func=blog_etag, last_modified_func=blog_last_modified), name='dispatch')
 class BlogDetailView(DetailView):
     model = BlogPost
     template_name = 'pages/blog_detail.html'
@@ -53,9 +70,19 @@ class BlogDetailView(DetailView):
         except Exception:
             return BlogPost.objects.none()
     
+    def get_object(self, queryset=None):
+        # Неіснуючі та неопубліковані статті відсікаємо по індексу, без запиту в БД
+        try:
+            index = get_blog_index()
+        except Exception:
+            index = None
+        if index is not None and index.get(self.kwargs.get(self.slug_url_kwarg)) is None:
+            raise Http404("Статтю не знайдено")
+        return super().get_object(queryset)
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        post = self.get_object()
+        post = self.object
         
         # SEO мета-дані
         context['page_title'] = post.meta_title or post.title
@@ -65,29 +92,23 @@ class BlogDetailView(DetailView):
         context['keywords'] = post.keywords
         
         # Пов'язані статті
-        related_posts = BlogPost.objects.filter(
-            category=post.category,
-            is_published=True
-        ).exclude(id=post.id)[:3]
-        context['related_posts'] = related_posts
+        try:
+            context['related_posts'] = get_blog_index().related(post, 3)
+        except Exception:
+            context['related_posts'] = []
         
         return context
 
 
 def blog_search(request):
-    """Пошук по блогу"""
-    query = request.GET.get('q', '')
+    """Пошук по блогу (ранжовані результати з підсвіченими фрагментами)"""
+    query = request.GET.get('q', '').strip()
     try:
-        posts = BlogPost.objects.filter(is_published=True)
-        
-        if query:
-            posts = posts.filter(
-                Q(title__icontains=query) |
-                Q(content__icontains=query) |
-                Q(keywords__icontains=query)
-            )
-    except Exception:
-        posts = BlogPost.objects.none()
+        # Порожній запит - усі опубліковані статті, як і раніше (з in-process індексу)
+        posts = search_posts(query) if query else get_blog_index().posts()
+    except Exception as e:
+        logger.error(f"Blog search failed for '{query}': {e}")
+        posts = []
     
     paginator = Paginator(posts, 9)
     page_number = request.GET.get('page')
@@ -103,3 +124,23 @@ def blog_search(request):
     }
     
     return render(request, 'pages/blog_search.html', context)
+
+
+def blog_suggest(request):
+    """JSON підказки для пошуку по префіксу (з пам'яті, без запитів у БД)"""
+    query = request.GET.get('q', '')[:100]
+    try:
+        limit = int(request.GET.get('limit', MAX_SUGGESTIONS))
+    except ValueError:
+        limit = MAX_SUGGESTIONS
+    
+    try:
+        suggestions = suggest(query, limit)
+    except Exception as e:
+        logger.error(f"Blog suggest failed for '{query}': {e}")
+        suggestions = []
+    
+    response = JsonResponse({'query': query, 'suggestions': suggestions})
+    # Підказки однакові для всіх - браузер може перевикористати їх для повторних префіксів
+    response['Cache-Control'] = 'public, max-age=60'
+    return response
@@ -0,0 +1,62 @@
+import csv
+import json
+
+from django.contrib import admin
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import EmailOutbox, FormSubmission
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'status', 'attempts', 'created_at', 'sent_at', 'next_attempt_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'body']
+    readonly_fields = ['created_at', 'sent_at', 'last_error']
+
+    actions = ['retry_now']
+
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(status='pending', next_attempt_at=timezone.now())
+        self.message_user(request, f'{updated} листів повернуто в чергу.')
+    retry_now.short_description = "Надіслати повторно зараз"
+
+
+class Echo:
+    """Псевдо-файл для потокового csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+@admin.register(FormSubmission)
+class FormSubmissionAdmin(admin.ModelAdmin):
+    list_display = ['form_type', 'name', 'phone', 'email', 'created_at']
+    list_filter = ['form_type', 'created_at']
+    search_fields = ['name', 'phone', 'email']
+    readonly_fields = ['form_type', 'name', 'phone', 'email', 'payload', 'created_at']
+    date_hierarchy = 'created_at'
+    # COUNT(*) по всій таблиці на мільйонах рядків - лише для відфільтрованого списку
+    show_full_result_count = False
+
+    actions = ['export_csv']
+
+    def export_csv(self, request, queryset):
+        """Потоковий CSV: рядки читаються чанками, відповідь не збирається в пам'яті"""
+        writer = csv.writer(Echo())
+        columns = ['created_at', 'form_type', 'name', 'phone', 'email', 'payload']
+
+        def rows():
+            yield writer.writerow(columns)
+            for values in queryset.order_by('-created_at').values_list(*columns).iterator(chunk_size=2000):
+                created_at, *rest, payload = values
+                yield writer.writerow([
+                    timezone.localtime(created_at).strftime('%d.%m.%Y %H:%M'), *rest,
+                    json.dumps(payload, ensure_ascii=False),
+                ])
+
+        response = StreamingHttpResponse(rows(), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="form-submissions-{timezone.now():%Y%m%d}.csv"'
+        return response
+    export_csv.short_description = "Експортувати в CSV"
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
+
+    def ready(self):
+        # Перевірки налаштувань статики для продакшн (core.E001 / core.E002 / core.W001)
+        from . import checks  # noqa: F401
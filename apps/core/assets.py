@@ -0,0 +1,354 @@
+"""
+Бандли CSS/JS: склеювання, мініфікація та критичний CSS для inline
+
+build_assets (у build.sh перед collectstatic) збирає BUNDLES у ASSET_BUNDLES_DIR,
+звідки collectstatic хешує й стискає їх як звичайну статику. Шаблонні теги
+{% css_bundle %} / {% js_bundle %} (apps.core.templatetags.assets) віддають
+бандл з inline критичним CSS або, якщо бандли вимкнено (DEBUG), окремі файли.
+
+Критичний CSS - правила, селектори яких стосуються розмітки над згином:
+шаблони з 'above_fold' до першого </section> контенту (hero) або повністю для компонентів.
+"""
+import posixpath
+import re
+
+from django.conf import settings
+
+BUNDLE_PREFIX = 'bundles'
+
+BUNDLES = {
+    'base': {
+        'css': [
+            'css/core/reset.css',
+            'css/core/variables.css',
+            'css/core/z-index-system.css',
+            'css/core/typography.css',
+            'css/core/layout.css',
+            'css/core/animations.css',
+            'css/core/performance.css',
+            'css/components/navigation.css',
+            'css/components/buttons.css',
+            'css/components/forms.css',
+            'css/components/modals.css',
+            'css/components/footer.css',
+            'css/components/hero-parallax.css',
+            'css/components/mobile-optimizations.css',
+        ],
+        'js': ['js/core/utils.js', 'js/mobile-core.js', 'js/video-system.js', 'js/base.js'],
+        # Меню та модалки є в DOM з першого кадру - їм потрібні правила, що їх ховають
+        'above_fold': ['base.html', 'components/header.html', 'components/burger_menu.html',
+                       'components/modals.html'],
+    },
+    'home': {'css': ['css/home.css'], 'js': ['js/home.js'], 'above_fold': ['pages/home.html']},
+    'blog': {
+        'css': ['css/blog.css'],
+        'js': ['js/blog.js'],
+        'above_fold': ['pages/blog.html', 'pages/blog_detail.html', 'pages/blog_search.html'],
+    },
+    'events': {'css': ['css/events.css'], 'js': ['js/events.js'], 'above_fold': ['pages/events.html']},
+    'calculator': {'css': ['css/calculator.css'], 'js': ['js/calculator.js'], 'above_fold': ['pages/calculator.html']},
+    'contacts': {'css': ['css/contacts.css'], 'js': ['js/contacts.js'], 'above_fold': ['pages/contacts.html']},
+    'developer': {'css': ['css/developer.css'], 'js': ['js/developer.js'], 'above_fold': ['pages/developer.html']},
+    'portfolio': {'css': ['css/portfolio.css'], 'js': ['js/portfolio.js'], 'above_fold': ['pages/portfolio.html']},
+    'payment': {
+        'css': ['payment/css/payment.css'],
+        'js': [],
+        'above_fold': ['payment/payment_page.html', 'payment/payment_success.html',
+                       'payment/payment_failure.html', 'payment/link_inactive.html'],
+    },
+}
+
+CONTENT_BLOCK = '{% block content %}'
+FOLD_MARKER = '</section>'
+NESTED_AT_RULES = ('@media', '@supports', '@container', '@layer', '@document')
+
+
+# Бандл зі спільним CSS: його критичний CSS покриває hero всіх сторінок
+SHARED_BUNDLE = 'base'
+
+
+def above_fold_templates(name):
+    if name == SHARED_BUNDLE:
+        return [template for bundle in BUNDLES.values() for template in bundle['above_fold']]
+    return BUNDLES[name]['above_fold']
+
+
+def bundle_path(name, kind):
+    return f'{BUNDLE_PREFIX}/{name}.{kind}'
+
+
+def critical_path(name):
+    return f'{BUNDLE_PREFIX}/critical/{name}.css'
+
+
+def bundles_enabled():
+    return getattr(settings, 'ASSET_BUNDLES', False)
+
+
+# === CSS ===
+
+def _scan_string(text, i):
+    """Індекс після рядка, що починається в text[i] (лапки ' " `), з урахуванням екранування"""
+    quote = text[i]
+    i += 1
+    while i < len(text):
+        if text[i] == '\\':
+            i += 2
+            continue
+        if text[i] == quote:
+            return i + 1
+        i += 1
+    return i
+
+
+def _strip_css_comments(text):
+    out, i, start = [], 0, 0
+    while i < len(text):
+        char = text[i]
+        if char in '"\'':
+            i = _scan_string(text, i)
+        elif text.startswith('/*', i):
+            out.append(text[start:i])
+            end = text.find('*/', i + 2)
+            i = start = len(text) if end == -1 else end + 2
+        else:
+            i += 1
+    out.append(text[start:])
+    return ''.join(out)
+
+
+def _parse_css(text, i=0):
+    """
+    Дерево правил [(prelude, body)]: body - рядок декларацій, список вкладених
+    правил (@media, @supports, ...) або None для @import/@charset. Повертає (nodes, index)
+    """
+    nodes, start = [], i
+    while i < len(text):
+        char = text[i]
+        if char in '"\'':
+            i = _scan_string(text, i)
+        elif char == ';' and text[start:i].strip().startswith('@'):
+            nodes.append((text[start:i].strip(), None))
+            i = start = i + 1
+        elif char == '{':
+            prelude = text[start:i].strip()
+            if prelude.startswith(NESTED_AT_RULES):
+                body, i = _parse_css(text, i + 1)
+            else:
+                body_start, depth = i + 1, 1
+                i += 1
+                while i < len(text) and depth:
+                    if text[i] in '"\'':
+                        i = _scan_string(text, i)
+                        continue
+                    depth += {'{': 1, '}': -1}.get(text[i], 0)
+                    i += 1
+                body = text[body_start:i - 1]
+            nodes.append((prelude, body))
+            start = i
+        elif char == '}':
+            return nodes, i + 1
+        else:
+            i += 1
+    return nodes, i
+
+
+def _compact(text, punctuation):
+    """Згортає пробіли (поза рядками) і прибирає їх біля знаків з punctuation"""
+    out, i = [], 0
+    while i < len(text):
+        char = text[i]
+        if char in '"\'':
+            end = _scan_string(text, i)
+            out.append(text[i:end])
+            i = end
+        elif char.isspace():
+            while i < len(text) and text[i].isspace():
+                i += 1
+            if out and out[-1][-1] not in punctuation and i < len(text) and text[i] not in punctuation:
+                out.append(' ')
+        else:
+            out.append(char)
+            i += 1
+    return ''.join(out)
+
+
+def _serialize(nodes):
+    out = []
+    for prelude, body in nodes:
+        head = _compact(prelude, ',>')
+        if body is None:
+            out.append(f'{head};')
+        elif isinstance(body, list):
+            out.append(f'{head}{{{_serialize(body)}}}')
+        else:
+            declarations = _compact(body, ';:{},').replace(';}', '}').rstrip(';')
+            if declarations:
+                out.append(f'{head}{{{declarations}}}')
+    return ''.join(out)
+
+
+def minify_css(text):
+    nodes, _ = _parse_css(_strip_css_comments(text))
+    return _serialize(nodes)
+
+
+_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def rebase_css_urls(text, source_name):
+    """Відносні url() файлу source_name -> абсолютні /static/... (працюють і в бандлі, і inline)"""
+    def replace(match):
+        url = match.group(2).strip()
+        if url.startswith(('/', 'data:', 'http:', 'https:', '#')):
+            return match.group(0)
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(source_name), url))
+        return f"url('{settings.STATIC_URL}{resolved}')"
+    return _URL.sub(replace, text)
+
+
+# Одинарні лапки - аргументи шаблонних тегів ({% responsive_video ... class='video-background' %})
+_CLASS_ATTR = re.compile(r'\bclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_ID_ATTR = re.compile(r'\bid\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_TEMPLATE_SYNTAX = re.compile(r'{%.*?%}|{{.*?}}', re.S)
+_SIMPLE_SELECTOR = re.compile(r'([.#])(-?[_a-zA-Z][\w-]*)')
+
+
+def above_fold_names(html):
+    """Класи (.x) та id (#x) з розмітки: у сторінках - до першого </section> контенту, компоненти - повністю"""
+    content = html.find(CONTENT_BLOCK)
+    fold = html.find(FOLD_MARKER, max(content, 0))
+    if content != -1 and fold != -1:
+        html = html[:fold]
+    names = set()
+    for values in _CLASS_ATTR.findall(html):
+        names.update(f'.{name}' for name in _TEMPLATE_SYNTAX.sub(' ', ''.join(values)).split())
+    for values in _ID_ATTR.findall(html):
+        names.update(f'#{name}' for name in _TEMPLATE_SYNTAX.sub(' ', ''.join(values)).split())
+    return names
+
+
+def _split_selectors(prelude):
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and not depth:
+            parts.append(prelude[start:i].strip())
+            start = i + 1
+    parts.append(prelude[start:].strip())
+    return parts
+
+
+def _selector_visible(selector, names):
+    # Атрибути та :not(...) не додають вимог до розмітки
+    selector = re.sub(r'\[[^\]]*\]|:not\([^)]*\)', '', selector)
+    return all(kind + name in names for kind, name in _SIMPLE_SELECTOR.findall(selector))
+
+
+def _critical_nodes(nodes, names):
+    out = []
+    for prelude, body in nodes:
+        if body is None:
+            continue
+        if isinstance(body, list):
+            inner = _critical_nodes(body, names)
+            if inner:
+                out.append((prelude, inner))
+        elif prelude.startswith('@font-face'):
+            out.append((prelude, body))
+        elif not prelude.startswith('@'):
+            selectors = [s for s in _split_selectors(prelude) if _selector_visible(s, names)]
+            if selectors:
+                out.append((', '.join(selectors), body))
+    return out
+
+
+def critical_css(text, names):
+    """Мініфікований CSS лише з правил для елементів над згином (+ @keyframes, які вони використовують)"""
+    nodes, _ = _parse_css(_strip_css_comments(text))
+    critical = _critical_nodes(nodes, names)
+    used = _serialize(critical)
+    for prelude, body in nodes:
+        if prelude.startswith(('@keyframes', '@-webkit-keyframes')):
+            name = prelude.split(None, 1)[-1].strip()
+            if re.search(rf'\b{re.escape(name)}\b', used):
+                critical.append((prelude, body))
+    return _serialize(critical)
+
+
+# === JS ===
+
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%~^<>')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw',
+                   'yield', 'await'}
+
+
+def _regex_allowed(out):
+    """Чи може '/' тут почати regex-літерал (а не ділення) - за попереднім значущим токеном"""
+    code = ''.join(out[-64:]).rstrip()
+    if not code or code[-1] in _REGEX_PRECEDERS:
+        return True
+    word = re.search(r'[\w$]+$', code)
+    return bool(word) and word.group(0) in _REGEX_KEYWORDS
+
+
+def _scan_regex(text, i):
+    i += 1
+    in_class = False
+    while i < len(text) and text[i] != '\n':
+        char = text[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < len(text) and (text[i].isalnum() or text[i] == '_'):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def minify_js(text):
+    """
+    Консервативна мініфікація: прибирає коментарі, відступи та порожні рядки.
+    Переноси рядків залишаються (ASI), рядки, шаблони та regex копіюються як є
+    """
+    out, i = [], 0
+    while i < len(text):
+        char = text[i]
+        if char in '"\'`':
+            end = _scan_string(text, i)
+            out.append(text[i:end])
+            i = end
+        elif text.startswith('//', i):
+            end = text.find('\n', i)
+            i = len(text) if end == -1 else end
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = len(text) if end == -1 else end + 2
+            out.append(' ')
+        elif char == '/' and _regex_allowed(out):
+            end = _scan_regex(text, i)
+            out.append(text[i:end])
+            i = end
+        elif char.isspace():
+            start = i
+            while i < len(text) and text[i].isspace():
+                i += 1
+            newline = '\n' in text[start:i]
+            while out and out[-1] in (' ', '\n'):
+                newline = out.pop() == '\n' or newline
+            if out and i < len(text):
+                out.append('\n' if newline else ' ')
+        else:
+            out.append(char)
+            i += 1
+    return ''.join(out).strip()
@@ -0,0 +1,98 @@
+"""
+Спільний кеш сайту: простори імен по додатках та захист від stampede
+
+Бекенд задається в settings (REDIS_URL / CACHE_BACKEND): Redis, файли на диску
+хоста або таблиця в БД - усі спільні для воркерів. AppCache додає до ключів
+префікс додатку, get_or_compute віддає застаріле значення, поки лише один
+процес (власник замка) перераховує нове.
+"""
+import time
+import uuid
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from . import metrics
+
+DEFAULT_STALE_TTL = 60
+DEFAULT_LOCK_TIMEOUT = 10
+DEFAULT_WAIT_TIMEOUT = 0.5  # секунд: далі запит рахує сам, а не тримає воркер у sleep
+LOCK_POLL_INTERVAL = 0.05
+
+
+class AppCache:
+    """Кеш з простором імен: AppCache('blog').get('index:version') читає ключ 'blog:index:version'"""
+
+    def __init__(self, namespace, alias=DEFAULT_CACHE_ALIAS):
+        self.namespace = namespace
+        self.alias = alias
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def key(self, key):
+        return f'{self.namespace}:{key}'
+
+    def get(self, key, default=None):
+        return self.backend.get(self.key(key), default)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self.backend.set(self.key(key), value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT):
+        return self.backend.add(self.key(key), value, timeout)
+
+    def delete(self, key):
+        return self.backend.delete(self.key(key))
+
+    def delete_many(self, keys):
+        self.backend.delete_many([self.key(key) for key in keys])
+
+    def get_or_compute(self, key, compute, timeout, stale_ttl=DEFAULT_STALE_TTL, lock_timeout=DEFAULT_LOCK_TIMEOUT,
+                       wait_timeout=DEFAULT_WAIT_TIMEOUT):
+        """
+        Значення з кешу або compute() під замком (None не кешується).
+        Після timeout ще stale_ttl секунд віддається старе значення, поки власник замка
+        перераховує; без значення решта чекає на власника не довше wait_timeout і
+        далі рахує без замка. lock_timeout - час життя самого замка.
+        На файловому кеші add не атомарний - зрідка можливий зайвий перерахунок.
+        """
+        backend = self.backend
+        full_key = self.key(key)
+        lock_key = f'{full_key}:lock'
+        token = uuid.uuid4().hex
+
+        entry = backend.get(full_key)
+        if entry is not None:
+            value, fresh_until = entry
+            if time.time() < fresh_until:
+                return value
+            if not backend.add(lock_key, token, lock_timeout):
+                metrics.incr('cache.stale_served')
+                return value
+            metrics.incr('cache.stale_refresh')
+            return self._compute(backend, full_key, lock_key, token, compute, timeout, stale_ttl)
+
+        deadline = time.monotonic() + min(wait_timeout, lock_timeout)
+        while not backend.add(lock_key, token, lock_timeout):
+            if time.monotonic() >= deadline:
+                # Власник замка рахує довго або впав - рахуємо без замка
+                metrics.incr('cache.wait_expired')
+                token = None
+                break
+            time.sleep(LOCK_POLL_INTERVAL)
+            entry = backend.get(full_key)
+            if entry is not None:
+                return entry[0]
+        return self._compute(backend, full_key, lock_key, token, compute, timeout, stale_ttl)
+
+    def _compute(self, backend, full_key, lock_key, token, compute, timeout, stale_ttl):
+        try:
+            value = compute()
+            if value is not None:
+                backend.set(full_key, (value, time.time() + timeout), timeout + stale_ttl)
+            return value
+        finally:
+            if token and backend.get(lock_key) == token:
+                backend.delete(lock_key)
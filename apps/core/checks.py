@@ -0,0 +1,38 @@
+"""
+Системні перевірки налаштувань продакшн
+
+Тег staticfiles - перевірки запускаються і в collectstatic, тож build.sh
+падає ще до деплою, якщо WhiteNoise знову шукає файли на кожен запит.
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+HASHED_STORAGE = 'apps.core.storage.HashedStaticFilesStorage'
+
+
+@register(Tags.staticfiles)
+def check_static_serving(app_configs, **kwargs):
+    if settings.DEBUG:
+        return []
+
+    errors = []
+    if getattr(settings, 'WHITENOISE_AUTOREFRESH', False):
+        errors.append(Error(
+            'WHITENOISE_AUTOREFRESH увімкнено в продакшн: WhiteNoise сканує файлову систему на кожен запит.',
+            hint='Встановіть WHITENOISE_AUTOREFRESH = False і збирайте статику через collectstatic.',
+            id='core.E001',
+        ))
+    if getattr(settings, 'WHITENOISE_USE_FINDERS', False):
+        errors.append(Error(
+            'WHITENOISE_USE_FINDERS увімкнено в продакшн: статика віддається повз хешований маніфест.',
+            hint='Встановіть WHITENOISE_USE_FINDERS = False.',
+            id='core.E002',
+        ))
+    backend = settings.STORAGES.get('staticfiles', {}).get('BACKEND')
+    if backend != HASHED_STORAGE:
+        errors.append(Warning(
+            f'Сховище статики {backend} не хешує імена файлів - immutable-кешування неможливе.',
+            hint=f"STORAGES['staticfiles'] = {{'BACKEND': '{HASHED_STORAGE}'}}",
+            id='core.W001',
+        ))
+    return errors
@@ -0,0 +1,81 @@
+"""
+Умовні GET-запити для HTML-сторінок (ETag / Last-Modified)
+
+Валідатори рахуються з дешевих джерел (хеш збірки, версія індексу блогу,
+агрегат updated_at подій) ще до виклику view, тож на If-None-Match /
+If-Modified-Since відповідь 304 віддається без рендерингу шаблонів.
+Cache-Control для таких відповідей виставляє CacheHeadersMiddleware.
+"""
+import hashlib
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.utils import translation
+from django.views.decorators.http import condition
+
+logger = logging.getLogger(__name__)
+
+
+def weak_etag(*parts):
+    """Слабкий ETag з частин (сторінка еквівалентна, а не побайтово однакова)"""
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'W/"{digest}"'
+
+
+def request_variant(request):
+    """Що ще впливає на HTML: мова та аудиторія (анонім / staff / конкретний користувач)"""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        audience = 'anon'
+    elif user.is_staff:
+        audience = 'staff'
+    else:
+        audience = f'user-{user.pk}'
+    return translation.get_language() or settings.LANGUAGE_CODE, audience
+
+
+def build_etag(request, *parts):
+    """ETag сторінки: збірка (шаблони, статика) + мова/аудиторія + власні частини"""
+    return weak_etag(getattr(settings, 'BUILD_HASH', 'dev'), *request_variant(request), *parts)
+
+
+def _safe(func):
+    # Помилка у валідаторі (наприклад, таблиць ще немає) - просто віддаємо повну сторінку
+    if func is None:
+        return None
+
+    @wraps(func)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return func(request, *args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Conditional GET validator {func.__name__} failed: {e}")
+            return None
+    return wrapper
+
+
+def conditional_page(etag_func=None, last_modified_func=None):
+    """
+    Декоратор view: django condition() з безпечними валідаторами; ETag і
+    Last-Modified лишаються лише на 200 (та 304 від самого condition).
+    etag_func(request, *args, **kwargs) -> рядок (зазвичай build_etag(...)),
+    last_modified_func(...) -> datetime або None
+    """
+    conditional = condition(etag_func=_safe(etag_func), last_modified_func=_safe(last_modified_func))
+
+    def decorator(view):
+        conditional_view = conditional(view)
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            # Валідатори описують саму сторінку: 404, редирект чи помилка не мають
+            # отримати її ETag, інакше клієнт потім повторно використає їх через 304
+            if response.status_code not in (200, 304):
+                for header in ('ETag', 'Last-Modified'):
+                    if response.has_header(header):
+                        del response[header]
+            return response
+        return inner
+    return decorator
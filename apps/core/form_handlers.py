@@ -4,8 +4,9 @@
 import re
 from django.http import JsonResponse
 from django.utils import timezone
-from django.core.mail import send_mail
 from django.conf import settings
+from .mail import queue_email
+from .submissions import record_submission
 import logging
 
 logger = logging.getLogger(__name__)
@@ -54,7 +55,7 @@ def create_form_data(form_type, name, phone, request, **extra_fields):
 
 
 def send_form_email(form_data):
-    """Відправка email з даними форми"""
+    """Відправка email з даними форми (через чергу apps.core.mail)"""
     try:
         subject = f"[PrometeyLabs] {form_data['type']}"
         
@@ -87,15 +88,9 @@ Email: {form_data.get('email', 'Не вказано')}
         
         message_body += f"\n=== ДОДАТКОВА ІНФОРМАЦІЯ ===\nIP: {form_data.get('ip', 'Невідомо')}\nUser Agent: {form_data.get('user_agent', 'Невідомо')}"
         
-        send_mail(
-            subject=subject,
-            message=message_body,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[settings.CONTACT_EMAIL],
-            fail_silently=False,
-        )
+        queue_email(subject, message_body, [settings.CONTACT_EMAIL])
         
-        logger.info(f"Email sent successfully for form type: {form_data['type']}")
+        logger.info(f"Email queued for form type: {form_data['type']}")
         return True
         
     except Exception as e:
@@ -104,9 +99,9 @@ Email: {form_data.get('email', 'Не вказано')}
 
 
 def save_form_submission(form_type, form_data):
-    """Збереження даних форми в БД (placeholder)"""
+    """Збереження даних форми в БД (пачками через apps.core.submissions)"""
     try:
-        # TODO: Реалізувати збереження в БД коли будуть створені моделі
+        record_submission(form_type, form_data)
         logger.info(f"Form data saved: {form_type} - {form_data['name']}")
         return True
     except Exception as e:
@@ -187,7 +182,7 @@ def get_answer_text(question, answer):
 
 
 def send_test_result_email(test_data, estimated_price):
-    """Відправка email з результатом тесту"""
+    """Відправка email з результатом тесту (через чергу apps.core.mail)"""
     try:
         name = test_data['name']
         phone = test_data['phone']
@@ -218,13 +213,8 @@ def send_test_result_email(test_data, estimated_price):
 Email: info@prometeylabs.com
 """
             
-            send_mail(
-                subject=client_subject,
-                message=client_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[test_data['email']],
-                fail_silently=True,
-            )
+            # Невдалий лист клієнту не повинен зривати лист команді
+            queue_email(client_subject, client_message, [test_data['email']], fail_silently=True)
         
         # Email для команди
         admin_subject = f"[PrometeyLabs] Новий розрахунок проекту - {estimated_price} грн"
@@ -245,15 +235,9 @@ Email: {test_data.get('email', 'Не вказано')}
 Дата: {timezone.now().strftime('%d.%m.%Y %H:%M')}
 """
         
-        send_mail(
-            subject=admin_subject,
-            message=admin_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[settings.CONTACT_EMAIL],
-            fail_silently=False,
-        )
+        queue_email(admin_subject, admin_message, [settings.CONTACT_EMAIL])
         
-        logger.info(f"Test result emails sent for {name}")
+        logger.info(f"Test result emails queued for {name}")
         return True
         
     except Exception as e:
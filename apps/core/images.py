@@ -0,0 +1,240 @@
+"""
+Адаптивні зображення: WebP/AVIF похідні кількох ширин та розмиті LQIP-заглушки
+
+Статика: build_images (у build.sh перед build_assets і collectstatic) пише похідні
+в STATIC_BUILD_DIR поруч з відносним шляхом джерела та маніфест responsive-images.json,
+collectstatic хешує їх як звичайну статику.
+Медіа: responsive_images(Model, 'field') у AppConfig.ready() - після збереження
+моделі фоновий потік процесу генерує похідні завантаженого файлу в тому ж сховищі
+та sidecar '<файл>.responsive.json' з метаданими.
+
+Метадані зображення: {'width', 'height', 'alpha', 'lqip', 'variants': {'webp': [[ширина, ім'я], ...]},
+'bytes': {'source', 'webp', ...}} - їх читає тег {% responsive_image %}.
+AVIF - лише якщо Pillow вміє його писати (Pillow >= 11.2 або pillow-avif-plugin).
+"""
+import base64
+import hashlib
+import io
+import json
+import logging
+import mimetypes
+import os
+import queue
+import re
+import threading
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_save
+from PIL import Image, ImageFilter, ImageOps
+
+from .cache import AppCache
+
+try:
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+MIN_SOURCE_BYTES = 20 * 1024  # favicon-и та дрібні іконки не чіпаємо
+DEFAULT_WIDTHS = (480, 960, 1440)
+QUALITY = {'avif': 50, 'webp': 80}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+LQIP_WIDTH = 24
+STATIC_MANIFEST = 'responsive-images.json'
+SIDECAR_SUFFIX = '.responsive.json'
+MEDIA_CACHE_TIMEOUT = 3600
+MEDIA_MISS_TIMEOUT = 60  # ще не оброблене завантаження - перевіряємо знову через хвилину
+
+image_store = AppCache('images')
+
+
+def output_formats():
+    """Формати похідних від найкращого стиснення; у <picture> браузер бере перший підтримуваний"""
+    Image.init()
+    return [fmt for fmt in ('avif', 'webp') if fmt.upper() in Image.SAVE]
+
+
+def image_widths():
+    return tuple(getattr(settings, 'RESPONSIVE_IMAGE_WIDTHS', DEFAULT_WIDTHS))
+
+
+def variant_name(name, width, fmt):
+    return f'{os.path.splitext(name)[0]}-{width}w.{fmt}'
+
+
+def is_source_image(name, size):
+    return name.lower().endswith(SOURCE_EXTENSIONS) and size >= MIN_SOURCE_BYTES
+
+
+def source_hash(data):
+    return hashlib.md5(data).hexdigest()[:12]
+
+
+def _encode(image, fmt, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt.upper(), **options)
+    return buffer.getvalue()
+
+
+def process_image(name, data, save):
+    """
+    Генерує похідні зображення name (байти data); save(ім'я, байти) пише їх у сховище.
+    Ширини - з RESPONSIVE_IMAGE_WIDTHS менші за оригінал плюс сам оригінал (не ширше
+    за найбільшу). Повертає метадані (див. docstring модуля)
+    """
+    with Image.open(io.BytesIO(data)) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+    alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if alpha else 'RGB')
+    width, height = image.size
+
+    widths = image_widths()
+    targets = sorted({w for w in widths if w < width} | {min(width, max(widths))})
+    meta = {
+        'width': width, 'height': height, 'alpha': alpha, 'hash': source_hash(data),
+        'variants': {}, 'bytes': {'source': len(data)},
+    }
+    resized = {w: image if w == width else image.resize((w, round(height * w / width)), Image.LANCZOS)
+               for w in targets}
+    for fmt in output_formats():
+        meta['variants'][fmt] = []
+        for w in targets:
+            encoded = _encode(resized[w], fmt, quality=QUALITY[fmt], **({'method': 4} if fmt == 'webp' else {}))
+            save(variant_name(name, w, fmt), encoded)
+            meta['variants'][fmt].append([w, variant_name(name, w, fmt)])
+        # Скільки байтів віддається на найбільшому екрані замість оригіналу
+        meta['bytes'][fmt] = len(encoded)
+
+    tiny = image.resize((LQIP_WIDTH, max(1, round(height * LQIP_WIDTH / width))), Image.BILINEAR)
+    lqip = _encode(tiny.filter(ImageFilter.GaussianBlur(1)), 'webp', quality=30)
+    meta['lqip'] = 'data:image/webp;base64,' + base64.b64encode(lqip).decode('ascii')
+    return meta
+
+
+# === Статика ===
+
+_static_manifest = None
+
+
+def static_image(name):
+    """Метадані статичного зображення з маніфесту (читається один раз на процес)"""
+    global _static_manifest
+    if _static_manifest is None:
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        try:
+            with staticfiles_storage.open(STATIC_MANIFEST) as f:
+                _static_manifest = json.loads(f.read().decode('utf-8'))
+        except (OSError, ValueError):
+            _static_manifest = {}
+    return _static_manifest.get(name)
+
+
+_BACKGROUND = re.compile(
+    r'(?P<prop>background(?:-image)?)\s*:'
+    r'(?P<value>[^;{}]*?(?P<call>url\(\s*[\'"]?(?P<url>[^\'")]+)[\'"]?\s*\))[^;{}]*)'
+)
+
+
+def image_set_css(text, manifest):
+    """
+    background з url() статичного зображення з маніфесту отримує другу декларацію
+    з image-set() найбільшої похідної; браузери без image-set()/type() лишаються на першій
+    """
+    def replace(match):
+        url = match.group('url').strip()
+        meta = manifest.get(url[len(settings.STATIC_URL):]) if url.startswith(settings.STATIC_URL) else None
+        if not meta or not meta['variants']:
+            return match.group(0)
+        candidates = [f'url("{settings.STATIC_URL}{variants[-1][1]}") type("{MIME_TYPES[fmt]}")'
+                      for fmt, variants in meta['variants'].items()]
+        candidates.append(f'url("{url}") type("{mimetypes.guess_type(url)[0]}")')
+        value = match.group('value').replace(match.group('call'), f'image-set({", ".join(candidates)})')
+        return f"{match.group(0)};{match.group('prop')}:{value}"
+    return _BACKGROUND.sub(replace, text)
+
+
+# === Медіа ===
+
+def media_image(name):
+    """Метадані завантаженого зображення: кеш або sidecar JSON у сховищі"""
+    meta = image_store.get(name)
+    if meta is None:
+        try:
+            with default_storage.open(name + SIDECAR_SUFFIX) as f:
+                meta = json.loads(f.read().decode('utf-8'))
+        except (OSError, ValueError):
+            meta = {}
+        image_store.set(name, meta, MEDIA_CACHE_TIMEOUT if meta else MEDIA_MISS_TIMEOUT)
+    return meta or None
+
+
+def _overwrite(storage, name, data):
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(data))
+
+
+def process_media_image(name, storage=default_storage, force=False):
+    """Похідні та sidecar для завантаженого файлу; повертає метадані або None, якщо вже оброблено"""
+    sidecar = name + SIDECAR_SUFFIX
+    if not force and storage.exists(sidecar):
+        return None
+    with storage.open(name) as f:
+        data = f.read()
+    meta = process_image(name, data, lambda variant, content: _overwrite(storage, variant, content))
+    _overwrite(storage, sidecar, json.dumps(meta).encode('utf-8'))
+    image_store.set(name, meta, MEDIA_CACHE_TIMEOUT)
+    logger.info(f"Responsive variants generated for {name}: {meta['bytes']}")
+    return meta
+
+
+class ImageWorker(threading.Thread):
+    """Фонова генерація похідних завантажених зображень у межах процесу"""
+
+    def __init__(self):
+        super().__init__(name='responsive-images', daemon=True)
+        self.queue = queue.Queue()
+
+    def run(self):
+        while True:
+            name = self.queue.get()
+            try:
+                process_media_image(name)
+            except Exception as e:
+                logger.error(f"Failed to generate responsive variants for {name}: {e}")
+
+
+_worker = None
+_worker_pid = None
+_worker_lock = threading.Lock()
+
+
+def schedule_media_image(name):
+    """Ставить файл у чергу фонового потоку цього процесу (запускає потік за потреби)"""
+    global _worker, _worker_pid
+    with _worker_lock:
+        # Після fork потоки батьківського процесу не успадковуються
+        if _worker is None or _worker_pid != os.getpid() or not _worker.is_alive():
+            _worker = ImageWorker()
+            _worker_pid = os.getpid()
+            _worker.start()
+    _worker.queue.put(name)
+
+
+def responsive_images(model, *fields):
+    """Після збереження model генерує похідні для непорожніх ImageField з fields (після коміту, у фоні)"""
+    def on_save(sender, instance, **kwargs):
+        for field in fields:
+            file = getattr(instance, field)
+            if file and file.name.lower().endswith(SOURCE_EXTENSIONS):
+                transaction.on_commit(lambda name=file.name: schedule_media_image(name))
+
+    post_save.connect(on_save, sender=model, weak=False,
+                      dispatch_uid=f'responsive_images:{model._meta.label_lower}')
@@ -0,0 +1,215 @@
+"""
+Відправка листів поза запитом через чергу EmailOutbox
+
+queue_email() лише записує лист у БД (один INSERT), а відправник забирає
+пачки листів, надсилає їх через одне постійне SMTP-з'єднання
+(get_connection().send_messages) та повторює невдалі спроби з backoff.
+
+Режим задається settings.EMAIL_OUTBOX_MODE:
+  'thread' - фоновий потік у кожному веб-процесі (за замовчуванням)
+  'worker' - лише черга, відправляє python manage.py send_outbox_emails --loop
+  'sync'   - відправка одразу в запиті (без черги)
+"""
+import logging
+import os
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 30  # секунд: 30, 60, 120, ... до BACKOFF_MAX
+BACKOFF_MAX = 3600
+# Оренда пачки: листи, взяті процесом, що впав, повертаються в чергу після її завершення.
+# Розмір - найгірший час відправки всієї пачки (get_lease), щоб оренда не спливла
+# посеред відправки і той самий лист не забрав інший процес
+MIN_LEASE = timedelta(minutes=5)
+DEFAULT_SEND_TIMEOUT = 60  # секунд на SMTP-операцію, якщо EMAIL_TIMEOUT не задано
+SMTP_CALLS_PER_MESSAGE = 4  # open + send, і ще раз після перепідключення (_send_with_reconnect)
+POLL_INTERVAL = 30
+IDLE_CLOSE_AFTER = 60  # закриваємо SMTP-з'єднання після хвилини без листів
+
+
+def get_outbox_mode():
+    return getattr(settings, 'EMAIL_OUTBOX_MODE', 'thread')
+
+
+def queue_email(subject, body, recipients, from_email=None, fail_silently=False):
+    """
+    Ставить лист у чергу (або надсилає одразу в режимі 'sync').
+    fail_silently діє лише в режимі 'sync' - як у send_mail: помилка SMTP не кидається
+    """
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    recipients = [recipient for recipient in recipients if recipient]
+    mode = get_outbox_mode()
+    if mode == 'sync':
+        return send_mail(subject, body, from_email, recipients, fail_silently=fail_silently)
+
+    EmailOutbox.objects.create(
+        subject=subject[:255], body=body, from_email=from_email,
+        recipients=recipients, next_attempt_at=timezone.now(),
+    )
+    if mode == 'thread':
+        transaction.on_commit(wake_sender)
+    return 1
+
+
+def get_message_budget():
+    """Найдовша відправка одного листа з урахуванням перепідключення"""
+    timeout = getattr(settings, 'EMAIL_TIMEOUT', None) or DEFAULT_SEND_TIMEOUT
+    return timedelta(seconds=timeout * SMTP_CALLS_PER_MESSAGE)
+
+
+def get_lease(batch_size=BATCH_SIZE):
+    return max(MIN_LEASE, get_message_budget() * batch_size)
+
+
+def claim_due_emails(batch_size=BATCH_SIZE):
+    """Забирає пачку листів, час яких настав, продовжуючи їм оренду на get_lease(batch_size)"""
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if emails:
+            EmailOutbox.objects.filter(pk__in=[email.pk for email in emails]).update(next_attempt_at=now + get_lease(batch_size))
+    return emails
+
+
+def send_due_emails(connection, batch_size=BATCH_SIZE):
+    """
+    Надсилає одну пачку через постійне з'єднання.
+    Повертає (надіслано, невдалих); (0, 0) - черга порожня
+    """
+    lease_until = timezone.now() + get_lease(batch_size)
+    emails = claim_due_emails(batch_size)
+    if not emails:
+        return 0, 0
+    message_budget = get_message_budget()
+
+    messages = [
+        EmailMessage(email.subject, email.body, email.from_email, email.recipients, connection=connection)
+        for email in emails
+    ]
+    # Одне з'єднання на всю пачку; send_messages викликається поштучно, щоб знати
+    # точний результат кожного листа (збій посеред пачки не має дублювати вже надіслані)
+    sent, failed, released = [], [], []
+    for index, (email, message) in enumerate(zip(emails, messages)):
+        if timezone.now() + message_budget > lease_until:
+            # Сервер відповідав довше за оцінку - решту повертаємо в чергу до завершення оренди
+            released = emails[index:]
+            break
+        try:
+            _send_with_reconnect(connection, message)
+            sent.append(email)
+        except Exception as error:
+            failed.append((email, error))
+
+    now = timezone.now()
+    if sent:
+        EmailOutbox.objects.filter(pk__in=[email.pk for email in sent]).update(
+            status='sent', sent_at=now, attempts=F('attempts') + 1, last_error='',
+        )
+    if released:
+        EmailOutbox.objects.filter(pk__in=[email.pk for email in released]).update(next_attempt_at=now)
+    for email, error in failed:
+        attempts = email.attempts + 1
+        delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+        EmailOutbox.objects.filter(pk=email.pk).update(
+            attempts=attempts,
+            status='failed' if attempts >= MAX_ATTEMPTS else 'pending',
+            next_attempt_at=now + timedelta(seconds=delay),
+            last_error=str(error)[:1000],
+        )
+        logger.error(f"Failed to send email {email.pk} (attempt {attempts}): {error}")
+
+    logger.info(f"Outbox: sent {len(sent)}, failed {len(failed)}")
+    return len(sent), len(failed)
+
+
+def _send_with_reconnect(connection, message):
+    """Відправка через постійне з'єднання; якщо сервер закрив його за простій - одна спроба з новим"""
+    try:
+        connection.open()
+        connection.send_messages([message])
+    except Exception:
+        connection.close()
+        try:
+            connection.open()
+            connection.send_messages([message])
+        except Exception:
+            connection.close()
+            raise
+
+
+def drain_outbox(connection, batch_size=BATCH_SIZE):
+    """Надсилає всі листи, час яких настав. Повертає (надіслано, невдалих)"""
+    total_sent = total_failed = 0
+    while True:
+        sent, failed = send_due_emails(connection, batch_size)
+        if not sent and not failed:
+            return total_sent, total_failed
+        total_sent += sent
+        total_failed += failed
+        if not sent:
+            # Вся пачка впала - далі лише повтори за backoff
+            return total_sent, total_failed
+
+
+class OutboxSender(threading.Thread):
+    """Фоновий відправник у межах процесу: прокидається після коміту нового листа або раз на POLL_INTERVAL"""
+
+    def __init__(self):
+        super().__init__(name='email-outbox-sender', daemon=True)
+        self.wake_event = threading.Event()
+        self.wake_event.set()  # перший прохід підбирає листи, що лишились з минулого запуску
+
+    def run(self):
+        connection = get_connection()
+        idle_since = None
+        while True:
+            self.wake_event.wait(POLL_INTERVAL)
+            self.wake_event.clear()
+            try:
+                sent, failed = drain_outbox(connection)
+            except Exception as e:
+                logger.error(f"Outbox sender error: {e}")
+                sent = failed = 0
+            finally:
+                close_old_connections()
+
+            if sent or failed:
+                idle_since = None
+            elif idle_since is None:
+                idle_since = timezone.now()
+            elif (timezone.now() - idle_since).total_seconds() >= IDLE_CLOSE_AFTER:
+                connection.close()
+
+
+_sender = None
+_sender_pid = None
+_sender_lock = threading.Lock()
+
+
+def wake_sender():
+    """Будить (або запускає) фоновий відправник цього процесу"""
+    global _sender, _sender_pid
+    with _sender_lock:
+        # Після fork потоки батьківського процесу не успадковуються
+        if _sender is None or _sender_pid != os.getpid() or not _sender.is_alive():
+            _sender = OutboxSender()
+            _sender_pid = os.getpid()
+            _sender.start()
+            return
+    _sender.wake_event.set()
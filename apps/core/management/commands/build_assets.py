@@ -0,0 +1,65 @@
+"""
+Django management команда для збирання CSS/JS бандлів (apps.core.assets.BUNDLES)
+Запускається в build.sh перед collectstatic: бандли пишуться в ASSET_BUNDLES_DIR,
+а collectstatic хешує та стискає їх разом з рештою статики.
+
+Для кожного бандла: склеєний і мініфікований CSS (url() переписані на /static/...,
+фонові зображення з похідними build_images - з image-set()),
+критичний CSS для inline та склеєний і мініфікований JS.
+"""
+import json
+import shutil
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import get_template
+
+from apps.core import assets, images
+
+
+class Command(BaseCommand):
+    help = 'Збирає CSS/JS бандли та критичний CSS у ASSET_BUNDLES_DIR (перед collectstatic)'
+
+    def handle(self, *args, **options):
+        output_dir = settings.ASSET_BUNDLES_DIR
+        shutil.rmtree(output_dir, ignore_errors=True)
+        (output_dir / 'critical').mkdir(parents=True)
+
+        # Фонові зображення з WebP/AVIF похідними (build_images) отримують image-set()
+        manifest_path = settings.STATIC_BUILD_DIR / images.STATIC_MANIFEST
+        image_manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+        for name, bundle in assets.BUNDLES.items():
+            css = ''.join(assets.rebase_css_urls(self._read(path), path) for path in bundle['css'])
+            css = images.image_set_css(css, image_manifest)
+            names = set()
+            for template in assets.above_fold_templates(name):
+                names |= assets.above_fold_names(get_template(template).template.source)
+
+            minified_css = assets.minify_css(css)
+            critical = assets.critical_css(css, names)
+            # ';' між файлами - на випадок файлу без крапки з комою в кінці
+            minified_js = assets.minify_js(';\n'.join(self._read(path) for path in bundle['js']))
+
+            (output_dir / f'{name}.css').write_text(minified_css, encoding='utf-8')
+            (output_dir / 'critical' / f'{name}.css').write_text(critical, encoding='utf-8')
+            if bundle['js']:
+                (output_dir / f'{name}.js').write_text(minified_js, encoding='utf-8')
+
+            if options['verbosity']:
+                self.stdout.write(
+                    f'   {name}: CSS {len(bundle["css"])} файлів -> {len(minified_css) / 1024:.1f} КБ '
+                    f'(критичний {len(critical) / 1024:.1f} КБ), JS {len(bundle["js"])} файлів -> '
+                    f'{len(minified_js) / 1024:.1f} КБ'
+                )
+
+        if options['verbosity']:
+            self.stdout.write(self.style.SUCCESS(f'✅ Бандли зібрано в {output_dir}'))
+
+    def _read(self, path):
+        source = finders.find(path)
+        if not source:
+            raise CommandError(f'Файл бандла не знайдено: {path}')
+        with open(source, encoding='utf-8') as f:
+            return f.read()
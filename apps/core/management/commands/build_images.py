@@ -0,0 +1,96 @@
+"""
+Django management команда для генерації адаптивних зображень (apps.core.images)
+Запускається в build.sh перед build_assets і collectstatic: WebP/AVIF похідні
+статичних PNG/JPEG пишуться в STATIC_BUILD_DIR разом з маніфестом, далі
+collectstatic хешує їх як звичайну статику.
+
+Незмінені джерела (той самий хеш вмісту) не перекодовуються.
+--media догенеровує похідні для вже завантажених зображень блогу та подій.
+Наприкінці - звіт про зекономлені байти.
+"""
+import json
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import FileSystemFinder
+from django.core.management.base import BaseCommand
+
+from apps.core import images
+
+
+class Command(BaseCommand):
+    help = 'WebP/AVIF похідні та LQIP для статичних зображень (і --media для завантажених)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Перекодувати всі зображення')
+        parser.add_argument('--media', action='store_true',
+                            help='Також обробити завантажені BlogPost.featured_image / Event.image')
+
+    def handle(self, *args, **options):
+        output_dir = settings.STATIC_BUILD_DIR
+        manifest_path = output_dir / images.STATIC_MANIFEST
+        previous = {} if options['force'] or not manifest_path.exists() else json.loads(manifest_path.read_text())
+
+        manifest, report = {}, []
+        for name, storage in FileSystemFinder().list([]):
+            path = storage.path(name)
+            name = name.replace('\\', '/')
+            with open(path, 'rb') as f:
+                data = f.read()
+            if not images.is_source_image(name, len(data)):
+                continue
+
+            meta = previous.get(name)
+            if not meta or meta['hash'] != images.source_hash(data) or not self._variants_exist(output_dir, meta):
+                meta = images.process_image(name, data, lambda variant, content: self._save(output_dir, variant, content))
+            manifest[name] = meta
+            report.append((name, meta['bytes']))
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+
+        if options['media']:
+            report.extend(self._process_media(options['force']))
+        self._report(report)
+
+    def _variants_exist(self, output_dir, meta):
+        return all((output_dir / name).exists() for variants in meta['variants'].values() for _, name in variants)
+
+    def _save(self, output_dir, name, content):
+        path = output_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    def _process_media(self, force):
+        from apps.blog.models import BlogPost
+        from apps.events.models import Event
+
+        report = []
+        files = [post.featured_image for post in BlogPost.objects.exclude(featured_image='').only('featured_image')]
+        files += [event.image for event in Event.objects.exclude(image='').only('image')]
+        for file in files:
+            if not file.name.lower().endswith(images.SOURCE_EXTENSIONS):
+                continue
+            try:
+                meta = images.process_media_image(file.name, file.storage, force=force) or images.media_image(file.name)
+            except OSError as e:
+                self.stderr.write(f'   {file.name}: {e}')
+                continue
+            if meta:
+                report.append((file.name, meta['bytes']))
+        return report
+
+    def _report(self, report):
+        total_source = total_best = 0
+        for name, sizes in sorted(report):
+            best = min(size for fmt, size in sizes.items() if fmt != 'source') if len(sizes) > 1 else sizes['source']
+            total_source += sizes['source']
+            total_best += best
+            formats = ', '.join(f'{fmt} {size / 1024:.0f} КБ' for fmt, size in sizes.items() if fmt != 'source')
+            self.stdout.write(f'   {name}: {sizes["source"] / 1024:.0f} КБ -> {formats}')
+
+        saved = total_source - total_best
+        percent = 100 * saved / total_source if total_source else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {len(report)} зображень: {total_source / 1024 / 1024:.1f} МБ -> {total_best / 1024 / 1024:.1f} МБ '
+            f'на найбільшій ширині, зекономлено {saved / 1024 / 1024:.1f} МБ ({percent:.0f}%)'
+        ))
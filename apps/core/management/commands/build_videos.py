@@ -0,0 +1,78 @@
+"""
+Django management команда для драбини відео (apps.core.videos)
+Запускається в build.sh перед collectstatic: H.264 сходинки 480p/720p/1080p з
+faststart, постери JPEG/WebP та маніфест responsive-videos.json у STATIC_BUILD_DIR.
+
+Незмінені джерела (той самий хеш вмісту) не перекодовуються. Без ffmpeg команда
+лише попереджає - тег {% responsive_video %} тоді віддає оригінальні файли.
+Наприкінці - звіт про байти та faststart джерел.
+"""
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import FileSystemFinder
+from django.core.management.base import BaseCommand
+
+from apps.core import videos
+
+
+class Command(BaseCommand):
+    help = 'Драбина бітрейтів H.264 (faststart), постери JPEG/WebP та маніфест для static/videos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Перекодувати всі відео')
+
+    def handle(self, *args, **options):
+        ffmpeg = videos.ffmpeg_binary()
+        if not ffmpeg:
+            self.stderr.write(self.style.WARNING(
+                '⚠️  ffmpeg не знайдено (FFMPEG_BINARY, PATH, imageio-ffmpeg) - відео віддаються як є'
+            ))
+            return
+
+        output_dir = settings.STATIC_BUILD_DIR
+        manifest_path = output_dir / videos.STATIC_MANIFEST
+        previous = {} if options['force'] or not manifest_path.exists() else json.loads(manifest_path.read_text())
+
+        manifest = {}
+        for name, storage in FileSystemFinder().list([]):
+            if Path(storage.location) == output_dir:
+                continue  # власні сходинки з попередньої збірки - не джерела
+            name = name.replace('\\', '/')
+            if not name.startswith('videos/') or not name.lower().endswith(videos.SOURCE_EXTENSIONS):
+                continue
+            path = storage.path(name)
+            meta = previous.get(name)
+            if not meta or meta['hash'] != videos.source_hash(path) or not videos.renditions_exist(output_dir, meta):
+                if options['verbosity']:
+                    self.stdout.write(f'   🎬 {name}...')
+                try:
+                    meta = videos.process_video(ffmpeg, name, path, output_dir)
+                except (OSError, videos.FFmpegError) as e:
+                    self.stderr.write(f'   {name}: {e}')
+                    continue
+            manifest[name] = meta
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+        self._report(manifest)
+
+    def _report(self, manifest):
+        total_source = total_largest = total_smallest = 0
+        for name, meta in sorted(manifest.items()):
+            sizes = meta['bytes']
+            renditions = ', '.join(f'{side}p {sizes[f"{side}p"] / 1024:.0f} КБ' for side, _ in meta['renditions'])
+            faststart = '' if meta['faststart'] else ' (джерело без faststart)'
+            self.stdout.write(f'   {name} {meta["width"]}x{meta["height"]}: '
+                              f'{sizes["source"] / 1024:.0f} КБ -> {renditions}{faststart}')
+            total_source += sizes['source']
+            total_largest += sizes[f'{meta["renditions"][0][0]}p']
+            total_smallest += sizes[f'{meta["renditions"][-1][0]}p']
+
+        percent = 100 * (total_source - total_largest) / total_source if total_source else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {len(manifest)} відео: {total_source / 1024 / 1024:.1f} МБ -> '
+            f'{total_largest / 1024 / 1024:.1f} МБ на найбільшій сходинці ({percent:.0f}% менше), '
+            f'{total_smallest / 1024 / 1024:.1f} МБ на найменшій'
+        ))
@@ -0,0 +1,42 @@
+"""
+Django management команда - відправник черги листів (EmailOutbox)
+
+Разовий запуск надсилає всі листи, час яких настав; з --loop працює як
+окремий воркер (EMAIL_OUTBOX_MODE=worker) з одним постійним SMTP-з'єднанням.
+"""
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from apps.core.mail import BATCH_SIZE, IDLE_CLOSE_AFTER, drain_outbox
+
+
+class Command(BaseCommand):
+    help = 'Надсилає листи з черги EmailOutbox пачками через одне SMTP-з\'єднання'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Листів за одну пачку')
+        parser.add_argument('--loop', action='store_true', help='Працювати постійно')
+        parser.add_argument('--interval', type=float, default=3, help='Пауза між перевірками черги, с')
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        total_sent = total_failed = 0
+        idle_since = time.monotonic()
+        try:
+            while True:
+                sent, failed = drain_outbox(connection, options['batch_size'])
+                total_sent += sent
+                total_failed += failed
+                if not options['loop']:
+                    break
+                if sent or failed:
+                    idle_since = time.monotonic()
+                elif time.monotonic() - idle_since >= IDLE_CLOSE_AFTER:
+                    connection.close()
+                time.sleep(options['interval'])
+        finally:
+            connection.close()
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Надіслано: {total_sent}, невдалих спроб: {total_failed}'))
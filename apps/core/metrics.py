@@ -0,0 +1,68 @@
+"""
+Легкі метрики в межах процесу (лічильники) з хуками для зовнішніх систем
+
+Хуки - функції виду hook(name, value), задаються в settings.METRICS_HOOKS
+(dotted path) або через register_hook. Помилки хуків не впливають на запит.
+"""
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_counters = Counter()
+_lock = threading.Lock()
+_hooks = []
+_settings_hooks = None
+
+
+def register_hook(hook):
+    """Реєструє додатковий хук для всіх метрик"""
+    _hooks.append(hook)
+
+
+def _get_hooks():
+    global _settings_hooks
+    if _settings_hooks is None:
+        _settings_hooks = [import_string(path) for path in getattr(settings, 'METRICS_HOOKS', [])]
+    return _settings_hooks + _hooks
+
+
+def incr(name, value=1):
+    """Збільшує лічильник та передає подію в хуки"""
+    with _lock:
+        _counters[name] += value
+    for hook in _get_hooks():
+        try:
+            hook(name, value)
+        except Exception as e:
+            logger.warning(f"Metrics hook failed for {name}: {e}")
+
+
+def get_counters(prefix=''):
+    """Знімок лічильників (опційно лише з певним префіксом)"""
+    with _lock:
+        return {name: value for name, value in _counters.items() if name.startswith(prefix)}
+
+
+def hit_rate(prefix):
+    """Частка влучань для пари лічильників <prefix>.hit / <prefix>.miss (None якщо даних немає)"""
+    with _lock:
+        hits = _counters[f'{prefix}.hit']
+        misses = _counters[f'{prefix}.miss']
+    total = hits + misses
+    return hits / total if total else None
+
+
+def reset():
+    """Скидає всі лічильники (для бенчмарків та налагодження)"""
+    with _lock:
+        _counters.clear()
+
+
+def log_hook(name, value):
+    """Приклад хука: пише метрику в лог на рівні DEBUG"""
+    logger.debug(f"metric {name} +{value}")
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-17 16:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255, verbose_name='Тема')),
+                ('body', models.TextField(verbose_name='Текст листа')),
+                ('from_email', models.CharField(max_length=255, verbose_name='Відправник')),
+                ('recipients', models.JSONField(default=list, verbose_name='Отримувачі')),
+                ('status', models.CharField(choices=[('pending', 'В черзі'), ('sent', 'Надіслано'), ('failed', 'Не вдалося надіслати')], default='pending', max_length=20, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Спроб')),
+                ('next_attempt_at', models.DateTimeField(verbose_name='Наступна спроба')),
+                ('last_error', models.TextField(blank=True, verbose_name='Остання помилка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Створено')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Надіслано')),
+            ],
+            options={
+                'verbose_name': 'Лист у черзі',
+                'verbose_name_plural': 'Черга листів',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='core_outbox_due')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-17 16:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FormSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('form_type', models.CharField(max_length=50, verbose_name='Тип форми')),
+                ('name', models.CharField(blank=True, max_length=100, verbose_name="Ім'я")),
+                ('phone', models.CharField(blank=True, max_length=30, verbose_name='Телефон')),
+                ('email', models.CharField(blank=True, max_length=254, verbose_name='Email')),
+                ('payload', models.JSONField(default=dict, verbose_name='Дані форми')),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Створено')),
+            ],
+            options={
+                'verbose_name': 'Заявка з форми',
+                'verbose_name_plural': 'Заявки з форм',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['form_type', 'created_at'], name='core_submission_type_created')],
+            },
+        ),
+    ]
@@ -1,8 +1,22 @@
 """
 Міксини та базові класи для оптимізації коду views
 """
+import hashlib
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils import timezone, translation
 from django.views.generic import TemplateView
-from django.utils import timezone
+
+from . import metrics
+from .cache import AppCache
+from .conditional import build_etag, conditional_page
+
+# Замість справжнього CSRF токена в кешованому HTML; підставляється при кожній відповіді
+CSRF_PLACEHOLDER = 'csrfplaceholder0000000000000000000000000000000000000000000000000'
+
+page_cache_store = AppCache('page')
 
 
 class BasePageView(TemplateView):
@@ -11,6 +25,10 @@ class BasePageView(TemplateView):
     meta_description = ""
     og_title = ""
     keywords = ""
+    # Opt-in кешування відрендереної сторінки (для сторінок з постійним контекстом)
+    page_cache = False
+    # GET-параметри, що входять у ключ кешу; з будь-якими іншими сторінка рендериться без кешу
+    page_cache_params = ()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -21,4 +39,70 @@ class BasePageView(TemplateView):
             'keywords': self.keywords,
             'current_year': timezone.now().year,
         })
+        if getattr(self, '_rendering_for_cache', False):
+            context['csrf_token'] = CSRF_PLACEHOLDER
         return context
+
+    def dispatch(self, request, *args, **kwargs):
+        # Сторінки з постійним контекстом змінюються лише з деплоєм - 304 без рендерингу
+        if self.page_cache:
+            return conditional_page(etag_func=self.get_page_etag)(super().dispatch)(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_page_etag(self, request, *args, **kwargs):
+        return build_etag(request, self.__class__.__name__, timezone.now().year)
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_page_cache_enabled(request):
+            return super().get(request, *args, **kwargs)
+
+        rendered = {}
+
+        def render_page():
+            metrics.incr('page_cache.miss')
+            self._rendering_for_cache = True
+            response = super(BasePageView, self).get(request, *args, **kwargs)
+            response.render()
+            rendered['response'] = response
+            if response.status_code != 200:
+                return None
+            return response.content.decode(response.charset)
+
+        # Один воркер рендерить прострочену сторінку, решта тим часом віддають попередню версію
+        content = page_cache_store.get_or_compute(
+            self.get_page_cache_key(request), render_page, getattr(settings, 'PAGE_CACHE_TIMEOUT', 600)
+        )
+        if content is None:
+            return rendered['response']
+        if rendered:
+            cache_status = 'MISS'
+        else:
+            metrics.incr('page_cache.hit')
+            cache_status = 'HIT'
+
+        # CSRF токен унікальний для відвідувача, тому підставляємо його після кешу
+        response = HttpResponse(content.replace(CSRF_PLACEHOLDER, get_token(request)))
+        response['X-Page-Cache'] = cache_status
+        return response
+
+    def is_page_cache_enabled(self, request):
+        if not (self.page_cache and getattr(settings, 'PAGE_CACHE_ENABLED', False)
+                and request.method in ('GET', 'HEAD')):
+            return False
+        # Довільні параметри (utm_*, ?x=<випадкове>) інакше плодять записи в кеші без обмежень,
+        # а шаблон виводить повний URL (og:url), тож ігнорувати їх у ключі теж не можна
+        if set(request.GET) - set(self.page_cache_params):
+            metrics.incr('page_cache.bypass')
+            return False
+        return True
+
+    def get_page_cache_key(self, request):
+        """Ключ: збірка + сторінка + URL з дозволеними параметрами + мова + анонім/staff + рік (для current_year у футері)"""
+        audience = 'staff' if request.user.is_staff else 'anon'
+        query = sorted((param, request.GET.getlist(param)) for param in self.page_cache_params if param in request.GET)
+        url = f'{request.build_absolute_uri(request.path)}?{query}'
+        url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
+        return ':'.join([
+            getattr(settings, 'BUILD_HASH', 'dev'), self.__class__.__name__, url_hash,
+            translation.get_language() or settings.LANGUAGE_CODE, audience, str(timezone.now().year),
+        ])
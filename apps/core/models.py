@@ -1,3 +1,52 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class EmailOutbox(models.Model):
+    """Черга вихідних листів (apps.core.mail) - відправка поза запитом з повторами"""
+    STATUS_CHOICES = [
+        ('pending', 'В черзі'),
+        ('sent', 'Надіслано'),
+        ('failed', 'Не вдалося надіслати'),
+    ]
+
+    subject = models.CharField(max_length=255, verbose_name="Тема")
+    body = models.TextField(verbose_name="Текст листа")
+    from_email = models.CharField(max_length=255, verbose_name="Відправник")
+    recipients = models.JSONField(default=list, verbose_name="Отримувачі")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Статус")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Спроб")
+    next_attempt_at = models.DateTimeField(verbose_name="Наступна спроба")
+    last_error = models.TextField(blank=True, verbose_name="Остання помилка")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Створено")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="Надіслано")
+
+    class Meta:
+        verbose_name = "Лист у черзі"
+        verbose_name_plural = "Черга листів"
+        ordering = ['id']
+        indexes = [models.Index(fields=['status', 'next_attempt_at'], name='core_outbox_due')]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.recipients)} ({self.get_status_display()})"
+
+
+class FormSubmission(models.Model):
+    """Заявки з форм сайту (записуються пачками через apps.core.submissions)"""
+    form_type = models.CharField(max_length=50, verbose_name="Тип форми")
+    name = models.CharField(max_length=100, blank=True, verbose_name="Ім'я")
+    phone = models.CharField(max_length=30, blank=True, verbose_name="Телефон")
+    email = models.CharField(max_length=254, blank=True, verbose_name="Email")
+    payload = models.JSONField(default=dict, verbose_name="Дані форми")
+    # Час заявки, а не запису пачки в БД
+    created_at = models.DateTimeField(default=timezone.now, db_index=True, verbose_name="Створено")
+
+    class Meta:
+        verbose_name = "Заявка з форми"
+        verbose_name_plural = "Заявки з форм"
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['form_type', 'created_at'], name='core_submission_type_created')]
+
+    def __str__(self):
+        return f"{self.form_type}: {self.name} {self.phone}"
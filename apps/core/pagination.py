@@ -0,0 +1,176 @@
+"""
+Keyset (cursor) пагінація замість Paginator з COUNT(*) та OFFSET
+
+Сторінка вибирається умовою по полях сортування останнього/першого рядка
+попередньої сторінки (WHERE (start_date, id) < (...)) - з індексом по тих самих
+полях вартість однакова для першої й тисячної сторінки. Курсор - base64 JSON
+[номер сторінки, значення полів], номер лише для відображення "Сторінка N з M".
+
+ordering - поля як у order_by ('-start_date', 'id'), останнє унікальне (tie-breaker).
+NULL у nullable полях завжди в кінці (NULLS LAST для обох напрямків).
+"""
+import base64
+import binascii
+import json
+import math
+from collections.abc import Sequence
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPage(Sequence):
+    def __init__(self, object_list, number, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f'<KeysetPage {self.number}>'
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        return self.paginator.encode_cursor(self.number, self.object_list[-1]) if self._has_next else None
+
+    @property
+    def previous_cursor(self):
+        return self.paginator.encode_cursor(self.number, self.object_list[0]) if self._has_previous else None
+
+
+class KeysetPaginator:
+    """
+    paginator.page(after=курсор) / page(before=курсор) / page() - перша сторінка.
+    count - готова кількість (напр. кешована) або callable; без нього num_pages невідомий
+    """
+
+    def __init__(self, queryset, per_page, ordering, count=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.fields = []
+        for name in ordering:
+            descending = name.startswith('-')
+            field = queryset.model._meta.get_field(name.lstrip('-'))
+            self.fields.append((field, descending))
+        self._count = count
+
+    @property
+    def count(self):
+        if callable(self._count):
+            self._count = self._count()
+        return self._count
+
+    @property
+    def num_pages(self):
+        if self.count is None:
+            return None
+        return max(1, math.ceil(self.count / self.per_page))
+
+    def page(self, after=None, before=None):
+        """Невалідний курсор (зіпсоване посилання) - перша сторінка"""
+        try:
+            if after:
+                return self._page_after(*self.decode_cursor(after))
+            if before:
+                return self._page_before(*self.decode_cursor(before))
+        except InvalidCursor:
+            pass
+        return self._page_after(0, None)
+
+    def seek_queryset(self, values=None, reverse=False):
+        """Вибірка сторінки (без LIMIT): рядки після values (reverse - перед ними) у порядку обходу"""
+        queryset = self.queryset.order_by(*self._order_by(reverse))
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, reverse))
+        return queryset
+
+    def _page_after(self, number, values):
+        rows = list(self.seek_queryset(values)[:self.per_page + 1])
+        return KeysetPage(rows[:self.per_page], number + 1, self, len(rows) > self.per_page, values is not None)
+
+    def _page_before(self, number, values):
+        rows = list(self.seek_queryset(values, reverse=True)[:self.per_page + 1])
+        if len(rows) <= self.per_page:
+            # Попереду менше повної сторінки (дані змінились) - показуємо першу
+            return self._page_after(0, None)
+        rows = rows[:self.per_page]
+        rows.reverse()
+        return KeysetPage(rows, max(1, number - 1), self, True, True)
+
+    def _order_by(self, reverse):
+        ordering = []
+        for field, descending in self.fields:
+            expression = F(field.attname)
+            descending = descending != reverse
+            if field.null:
+                # NULL в кінці порядку: при зворотному обході - на початку
+                nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+                ordering.append(expression.desc(**nulls) if descending else expression.asc(**nulls))
+            else:
+                ordering.append(f'-{field.attname}' if descending else field.attname)
+        return ordering
+
+    def _seek(self, values, reverse):
+        """
+        Рядки строго після (reverse - строго перед) values у порядку сортування:
+        OR по префіксах (a > x) | (a = x & b > y) | ..., плюс межа a >= x для індексу
+        """
+        condition, equal = Q(pk__in=[]), Q()
+        for (field, descending), value in zip(self.fields, values):
+            name = field.attname
+            forward = descending == reverse  # True - наступні значення більші
+            if value is None:
+                # NULL у кінці: після нього лише NULL, перед ним - усі не-NULL
+                step = Q(**{f'{name}__isnull': False}) if reverse else Q(pk__in=[])
+                same = Q(**{f'{name}__isnull': True})
+            else:
+                step = Q(**{f'{name}__gt' if forward else f'{name}__lt': value})
+                if field.null and not reverse:
+                    step |= Q(**{f'{name}__isnull': True})
+                same = Q(**{name: value})
+            condition |= equal & step
+            equal &= same
+
+        first_field, first_descending = self.fields[0]
+        first_value = values[0]
+        if first_value is not None and not first_field.null:
+            forward = first_descending == reverse
+            condition &= Q(**{f'{first_field.attname}__gte' if forward else f'{first_field.attname}__lte': first_value})
+        return condition
+
+    def encode_cursor(self, number, obj):
+        values = [field.value_to_string(obj) if getattr(obj, field.attname) is not None else None
+                  for field, _ in self.fields]
+        raw = json.dumps([number, values], separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            number, values = json.loads(raw)
+            if not isinstance(number, int) or len(values) != len(self.fields):
+                raise InvalidCursor(cursor)
+            return number, [None if value is None else field.to_python(value)
+                            for (field, _), value in zip(self.fields, values)]
+        except (ValueError, TypeError, ValidationError, binascii.Error) as e:
+            raise InvalidCursor(cursor) from e
@@ -0,0 +1,105 @@
+"""
+Кеш singleton/config моделей (налаштування, що читаються на кожному запиті)
+
+Два рівні:
+  L1 - об'єкт у пам'яті процесу, довіряємо йому l1_ttl секунд без жодних звернень;
+  L2 - спільний кеш Django: токен версії + об'єкт під ключем цієї версії.
+post_save/post_delete моделі змінюють токен версії, тож після правки в адмінці
+кожен процес бачить нові дані не пізніше ніж через l1_ttl секунд (межа застарілості),
+а процес, де відбулась правка, - одразу.
+"""
+import threading
+import time
+import uuid
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cache import AppCache
+
+DEFAULT_L1_TTL = 5
+DEFAULT_L2_TIMEOUT = 3600
+
+singleton_store = AppCache('singleton')
+
+_MISSING = object()
+
+
+class SingletonCache:
+    def __init__(self, model, loader=None, l1_ttl=DEFAULT_L1_TTL, l2_timeout=DEFAULT_L2_TIMEOUT):
+        self.model = model
+        self.loader = loader or (lambda: model.objects.first())
+        self.l1_ttl = l1_ttl
+        self.l2_timeout = l2_timeout
+        self.prefix = model._meta.label_lower
+        self.version_key = f'{self.prefix}:version'
+        self.lock = threading.Lock()
+        # (значення, версія, момент останньої перевірки версії)
+        self._local = None
+
+    def get(self):
+        return self._entry()[0]
+
+    def get_version(self):
+        """Версія значення, яке зараз повертає get() (для ключів залежних кешів)"""
+        return self._entry()[1]
+
+    def _entry(self):
+        local = self._local
+        if local is not None and time.monotonic() - local[2] < self.l1_ttl:
+            return local
+        return self._refresh(local)
+
+    def _refresh(self, local):
+        with self.lock:
+            version = self._get_l2_version()
+            if local is not None and local[1] == version:
+                # Дані не змінились - лише продовжуємо довіру до L1
+                self._local = (local[0], version, time.monotonic())
+                return self._local
+
+            data_key = f'{self.prefix}:data:{version}'
+            value = singleton_store.get(data_key, _MISSING)
+            if value is _MISSING:
+                value = self.loader()
+                singleton_store.set(data_key, value, self.l2_timeout)
+            self._local = (value, version, time.monotonic())
+            return self._local
+
+    def _get_l2_version(self):
+        version = singleton_store.get(self.version_key)
+        if version is None:
+            singleton_store.add(self.version_key, uuid.uuid4().hex, None)
+            version = singleton_store.get(self.version_key)
+        return version
+
+    def invalidate(self):
+        """Новий токен версії в L2 та скидання L1 цього процесу"""
+        singleton_store.set(self.version_key, uuid.uuid4().hex, None)
+        self._local = None
+
+    def _model_changed(self, **kwargs):
+        # Після коміту: інакше інший процес може закешувати старий рядок під новою версією
+        transaction.on_commit(self.invalidate)
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def singleton_cache(model, **options):
+    """
+    Кеш для моделі (один на модель) з підписаними сигналами інвалідації.
+    Реєструвати в AppConfig.ready(), щоб правки з будь-якого процесу скидали версію
+    """
+    cached = _registry.get(model)
+    if cached is None:
+        with _registry_lock:
+            cached = _registry.get(model)
+            if cached is None:
+                cached = SingletonCache(model, **options)
+                uid = f'singleton:{cached.prefix}:invalidate'
+                post_save.connect(cached._model_changed, sender=model, weak=False, dispatch_uid=uid)
+                post_delete.connect(cached._model_changed, sender=model, weak=False, dispatch_uid=uid)
+                _registry[model] = cached
+    return cached
@@ -0,0 +1,43 @@
+"""
+Сховище статики для продакшн: хешовані імена + gzip/brotli під час collectstatic
+
+Усе робиться один раз у build.sh (collectstatic): файли копіюються з хешем
+вмісту в імені, стискаються поруч (.gz, .br) і записуються в staticfiles.json.
+WhiteNoise індексує STATIC_ROOT при старті воркера і віддає хешовані URL
+з Cache-Control immutable. Оригінальні імена залишаються поруч, тож жорстко
+прописані /static/... шляхи в JS продовжують працювати.
+
+URL з кирилицею в іменах віддаються percent-encoded (ASCII), а файли, яких
+немає в маніфесті (посилання в шаблонах на ще не завантажені відео/картинки),
+не ламають сторінку - для них віддається нехешований URL.
+"""
+import logging
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import iri_to_uri
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+logger = logging.getLogger(__name__)
+
+
+class HashedStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    # Відсутній у маніфесті файл - не 500, а нехешований URL (див. url())
+    manifest_strict = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._missing = set()
+
+    def url(self, name, force=False):
+        if name in self._missing:
+            url = FileSystemStorage.url(self, name)
+        else:
+            try:
+                url = super().url(name, force)
+            except ValueError as e:
+                logger.warning(f"Static file {name!r} is not in the manifest: {e}")
+                self._missing.add(name)
+                url = FileSystemStorage.url(self, name)
+        # Django повертає unquote()-нутий URL; кирилицю в атрибутах HTML віддаємо в ASCII
+        return iri_to_uri(url)
@@ -0,0 +1,118 @@
+"""
+Буферизований запис заявок з форм (FormSubmission)
+
+Кожен воркер накопичує заявки в пам'яті та записує їх одним bulk_create,
+коли буфер досягає FORM_SUBMISSION_BUFFER_SIZE або минає
+FORM_SUBMISSION_FLUSH_INTERVAL секунд. При зупинці процесу залишок
+записується синхронно (atexit). Розмір буфера 1 - запис одразу в запиті.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import FormSubmission
+
+logger = logging.getLogger(__name__)
+
+# Поля form_data, що зберігаються окремими колонками
+COLUMN_FIELDS = ('name', 'phone', 'email')
+
+
+class SubmissionBuffer:
+    """Буфер заявок процесу з фоновим flush за часом"""
+
+    def __init__(self, size=None, interval=None):
+        self.size = size or getattr(settings, 'FORM_SUBMISSION_BUFFER_SIZE', 50)
+        self.interval = interval or getattr(settings, 'FORM_SUBMISSION_FLUSH_INTERVAL', 2.0)
+        self.pending = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wake_event = threading.Event()
+        self.flusher = None
+        self.pid = None
+
+    def add(self, submission):
+        with self.lock:
+            self.pending.append(submission)
+            full = len(self.pending) >= self.size
+        if full:
+            self.flush()
+        else:
+            self._ensure_flusher()
+
+    def flush(self):
+        """Записує все накопичене одним bulk_create. Повертає кількість записів"""
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, []
+            if not batch:
+                return 0
+            try:
+                FormSubmission.objects.bulk_create(batch, batch_size=500)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(batch)} form submissions: {e}")
+                with self.lock:
+                    # Повертаємо в буфер - наступний flush спробує ще раз
+                    self.pending[:0] = batch
+                return 0
+            logger.info(f"Form submissions flushed: {len(batch)}")
+            return len(batch)
+
+    def _ensure_flusher(self):
+        # Після fork потік батьківського процесу не успадковується
+        if self.flusher is not None and self.pid == os.getpid() and self.flusher.is_alive():
+            return
+        with self.lock:
+            if self.flusher is None or self.pid != os.getpid() or not self.flusher.is_alive():
+                self.pid = os.getpid()
+                self.flusher = threading.Thread(target=self._run, name='form-submission-flusher', daemon=True)
+                self.flusher.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            if self.pending:
+                try:
+                    self.flush()
+                finally:
+                    close_old_connections()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_submission_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = SubmissionBuffer()
+                atexit.register(_buffer.flush)
+    return _buffer
+
+
+def build_submission(form_type, form_data):
+    payload = {key: value for key, value in form_data.items() if key not in COLUMN_FIELDS}
+    return FormSubmission(
+        form_type=form_type,
+        payload=payload,
+        **{field: str(form_data.get(field) or '')[:FormSubmission._meta.get_field(field).max_length]
+           for field in COLUMN_FIELDS},
+    )
+
+
+def record_submission(form_type, form_data):
+    """Додає заявку в буфер процесу (або пише одразу, якщо буфер розміром 1)"""
+    submission = build_submission(form_type, form_data)
+    buffer = get_submission_buffer()
+    if buffer.size <= 1:
+        submission.save()
+    else:
+        buffer.add(submission)
+    return submission
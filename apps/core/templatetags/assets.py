@@ -0,0 +1,75 @@
+"""
+Теги підключення CSS/JS бандлів (apps.core.assets)
+
+{% css_bundle 'home' %} - inline критичний CSS + асинхронне завантаження бандла,
+{% js_bundle 'home' %} - один <script> замість кількох. Якщо бандли вимкнено
+(ASSET_BUNDLES=False, за замовчуванням у DEBUG) або не зібрані (build_assets) -
+окремі файли з BUNDLES, як і раніше.
+"""
+import logging
+
+from django import template
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join, mark_safe
+
+from apps.core import assets
+
+logger = logging.getLogger(__name__)
+register = template.Library()
+
+# Вміст статики змінюється лише з деплоєм (новий процес), тож кешуємо на процес
+_built = {}
+_critical = {}
+
+
+def _is_built(path):
+    if path not in _built:
+        _built[path] = staticfiles_storage.exists(path)
+        if not _built[path]:
+            logger.warning(f"Asset bundle {path} is not built, serving individual files")
+    return _built[path]
+
+
+def _critical_css(name):
+    if name not in _critical:
+        path = assets.critical_path(name)
+        stored = getattr(staticfiles_storage, 'stored_name', lambda name: name)
+        try:
+            with staticfiles_storage.open(stored(path)) as f:
+                css = f.read().decode('utf-8')
+        except (OSError, ValueError):
+            css = ''
+        # </style> всередині CSS не повинен закрити тег
+        _critical[name] = css.replace('</', '<\\/')
+    return _critical[name]
+
+
+@register.simple_tag
+def css_bundle(name):
+    path = assets.bundle_path(name, 'css')
+    if not assets.bundles_enabled() or not _is_built(path):
+        return format_html_join('\n', '<link rel="stylesheet" href="{}">',
+                                ((static(source),) for source in assets.BUNDLES[name]['css']))
+
+    url = static(path)
+    critical = _critical_css(name)
+    if not critical:
+        return format_html('<link rel="stylesheet" href="{}">', url)
+    return format_html(
+        '<style>{}</style>\n'
+        '<link rel="preload" href="{}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+        '<noscript><link rel="stylesheet" href="{}"></noscript>',
+        mark_safe(critical), url, url,
+    )
+
+
+@register.simple_tag
+def js_bundle(name, defer=True):
+    path = assets.bundle_path(name, 'js')
+    sources = assets.BUNDLES[name]['js']
+    attrs = ' defer' if defer else ''
+    if assets.bundles_enabled() and sources and _is_built(path):
+        sources = [path]
+    return format_html_join('\n', '<script src="{}"{}></script>',
+                            ((static(source), mark_safe(attrs)) for source in sources))
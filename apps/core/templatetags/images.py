@@ -0,0 +1,45 @@
+"""
+Тег адаптивного зображення (apps.core.images)
+
+{% responsive_image 'images/portfolio/coresync.png' alt='Coresync' sizes='320px' %}
+{% responsive_image post.featured_image alt=post.title %}
+Рендерить <picture> з <source> AVIF/WebP (srcset за ширинами + sizes), <img> з
+розмірами оригіналу та розмитою LQIP-заглушкою фоном. Поки похідних немає
+(не зібрані / завантаження ще обробляється) - звичайний <img>.
+"""
+from django import template
+from django.forms.utils import flatatt
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from apps.core import images
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(source, alt='', sizes='100vw', **attrs):
+    if hasattr(source, 'storage'):
+        # FieldFile завантаженого зображення
+        if not source:
+            return ''
+        meta, src, url = images.media_image(source.name), source.url, source.storage.url
+    else:
+        meta, src, url = images.static_image(source), static(source), static
+
+    img_attrs = {'src': src, 'alt': alt, 'loading': 'lazy', 'decoding': 'async', **attrs}
+    if not meta:
+        return format_html('<img{}>', flatatt(img_attrs))
+
+    img_attrs.update(width=meta['width'], height=meta['height'])
+    if not meta['alpha']:
+        # Крізь прозорі пікселі заглушку було б видно й після завантаження
+        style = f"background:url({meta['lqip']}) center/cover no-repeat"
+        img_attrs['style'] = f"{style};{attrs['style']}" if attrs.get('style') else style
+
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((images.MIME_TYPES[fmt], ', '.join(f'{url(name)} {width}w' for width, name in variants), sizes)
+         for fmt, variants in meta['variants'].items()),
+    )
+    return format_html('<picture>{}<img{}></picture>', sources, flatatt(img_attrs))
@@ -0,0 +1,31 @@
+"""
+Тег адаптивного відео (apps.core.videos)
+
+{% responsive_video 'videos/desktop/main.mp4' mobile='videos/mobile/mainmobile.mp4' class='video-background' autoplay=True %}
+Рендерить один <video> з <source> за media-запитами (мобільне відео до 767px,
+десктопні сходинки драбини від найбільшої), preload="none" та постером WebP -
+замість пари desktop/mobile елементів, з яких браузер міг качати обидва.
+Поки драбини немає (build_videos не запускався) - <source> з оригінальними файлами.
+"""
+from django import template
+from django.forms.utils import flatatt
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from apps.core import videos
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_video(src, mobile=None, **attrs):
+    video_attrs = {'muted': True, 'loop': True, 'playsinline': True, 'preload': 'none', **attrs}
+    meta = videos.static_video(src) or (videos.static_video(mobile) if mobile else None)
+    if meta and 'poster' not in attrs:
+        video_attrs['poster'] = static(meta['poster']['webp'])
+
+    sources = format_html_join(
+        '', '<source src="{}" type="video/mp4"{}>',
+        ((static(name), flatatt({'media': media}) if media else '') for name, media in videos.video_sources(src, mobile)),
+    )
+    return format_html('<video{}>{}</video>', flatatt(video_attrs), sources)
@@ -0,0 +1,13 @@
+"""
+Спільні налаштування для тестів
+
+Кеш - локальний для процесу (файловий кеш пережив би тестову БД), а фонові
+потоки (відправник листів, таймери статусів подій і звірки платежів) не
+стартують: тестову БД у транзакції тесту бачить лише потік самого тесту.
+"""
+ISOLATED_SETTINGS = {
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    'EMAIL_OUTBOX_MODE': 'worker',
+    'EVENTS_STATUS_MODE': 'worker',
+    'PAYMENTS_RECONCILE_MODE': 'worker',
+}
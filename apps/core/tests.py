@@ -0,0 +1,264 @@
+"""
+Тести core: кеш singleton-моделей (правка в адмінці, межа застарілості L1),
+умовні GET і Cache-Control сторінок, кеш сторінок, буфер заявок з форм,
+відправка листів у режимі 'sync' та віддача хешованої статики
+"""
+import smtplib
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.http import HttpResponse, HttpResponseNotFound
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.payment.models import PaymentSettings
+from prometey_project.middleware import CacheHeadersMiddleware, StaticFilesMiddleware
+
+from .form_handlers import send_test_result_email
+from .models import FormSubmission
+from .singletons import SingletonCache, singleton_cache
+from .submissions import SubmissionBuffer, build_submission
+from .testing import ISOLATED_SETTINGS
+
+
+@override_settings(**ISOLATED_SETTINGS)
+class SingletonCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cached = singleton_cache(PaymentSettings)
+        self.cached.invalidate()
+        self.settings_obj = PaymentSettings.objects.create(title='Оплата послуг')
+
+    def save_in_admin(self, title):
+        admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(admin)
+        url = reverse('admin:payment_paymentsettings_change', args=[self.settings_obj.pk])
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(url, {'title': title, 'description': ''})
+        self.assertEqual(response.status_code, 302)
+        return callbacks
+
+    def test_admin_save_is_visible_from_fresh_l1_after_commit(self):
+        self.assertEqual(self.cached.get().title, 'Оплата послуг')
+        version = self.cached.get_version()
+
+        callbacks = self.save_in_admin('Нові налаштування')
+
+        self.assertTrue(callbacks)
+        self.assertNotEqual(self.cached.get_version(), version)
+        # Процес, де відбулась правка, бачить її одразу
+        self.assertEqual(self.cached.get().title, 'Нові налаштування')
+        # Новий воркер (порожній L1, спільний L2) - теж
+        self.assertEqual(SingletonCache(PaymentSettings).get().title, 'Нові налаштування')
+
+    def test_version_changes_only_after_commit(self):
+        version = self.cached.get_version()
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.settings_obj.title = 'До коміту'
+            self.settings_obj.save()
+        self.assertEqual(self.cached.get_version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(self.cached.get_version(), version)
+
+    def test_stale_l1_is_bounded_by_version_check(self):
+        other_worker = SingletonCache(PaymentSettings, l1_ttl=5)
+        with mock.patch('apps.core.singletons.time.monotonic', return_value=1000.0) as monotonic:
+            self.assertEqual(other_worker.get().title, 'Оплата послуг')
+
+            self.save_in_admin('Нові налаштування')
+
+            # У межах l1_ttl інший воркер ще може віддавати старе значення - без звернень до кешу й БД
+            monotonic.return_value = 1004.9
+            with self.assertNumQueries(0):
+                self.assertEqual(other_worker.get().title, 'Оплата послуг')
+
+            # Після l1_ttl перевірка версії в L2 віддає нове значення
+            monotonic.return_value = 1005.0
+            self.assertEqual(other_worker.get().title, 'Нові налаштування')
+
+    def test_unchanged_version_extends_l1_without_query(self):
+        other_worker = SingletonCache(PaymentSettings, l1_ttl=5)
+        with mock.patch('apps.core.singletons.time.monotonic', return_value=1000.0) as monotonic:
+            other_worker.get()
+            monotonic.return_value = 1010.0
+            with self.assertNumQueries(0):
+                self.assertEqual(other_worker.get().title, 'Оплата послуг')
+
+
+@override_settings(**ISOLATED_SETTINGS)
+class ConditionalGetTests(TestCase):
+    """Сторінки з валідаторами: 304 без рендерингу шаблонів і Cache-Control від CacheHeadersMiddleware"""
+
+    urls = ('home', 'contacts', 'blog:blog_list', 'events')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_not_modified_without_rendering(self):
+        for name in self.urls:
+            with self.subTest(url=name):
+                url = reverse(name)
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                etag = response['ETag']
+
+                response = self.client.get(url, headers={'if-none-match': etag})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.templates, [])
+
+    def test_cache_control_depends_on_cookies(self):
+        def view(request):
+            response = HttpResponse('page')
+            response['ETag'] = '"page"'
+            return response
+
+        middleware = CacheHeadersMiddleware(view)
+        response = middleware(RequestFactory().get('/'))
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn(f's-maxage={settings.CDN_S_MAXAGE}', response['Cache-Control'])
+
+        request = RequestFactory().get('/')
+        request.COOKIES['sessionid'] = 'visitor'
+        response = middleware(request)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        # Сторінки з формами ставлять csrftoken - лише private
+        response = self.client.get(reverse('blog:blog_list'))
+        self.assertIn('csrftoken', response.cookies)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_not_found_has_no_validators(self):
+        response = self.client.get(reverse('blog:blog_detail', kwargs={'slug': 'missing-post'}))
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+        self.assertFalse(response.has_header('Cache-Control'))
+
+
+@override_settings(**ISOLATED_SETTINGS, PAGE_CACHE_ENABLED=True)
+class PageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_repeat_view_is_served_from_cache(self):
+        url = reverse('home')
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'MISS')
+        response = self.client.get(url)
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+        self.assertNotContains(response, 'csrfplaceholder')
+
+    def test_unknown_params_bypass_cache(self):
+        url = reverse('home')
+        for query in ({'utm_source': 'newsletter'}, {'x': 'random'}):
+            with self.subTest(query=query):
+                response = self.client.get(url, query)
+                self.assertEqual(response.status_code, 200)
+                self.assertFalse(response.has_header('X-Page-Cache'))
+        # Обхід не залишив записів: перший перегляд без параметрів - MISS
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'MISS')
+
+
+class SubmissionBufferTests(TestCase):
+    def setUp(self):
+        self.buffer = SubmissionBuffer(size=3, interval=3600)
+        patcher = mock.patch.object(self.buffer, '_ensure_flusher')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submission(self, number):
+        return build_submission('contact', {'name': f'Клієнт {number}', 'phone': '+380501234567', 'service': 'web'})
+
+    def test_full_buffer_is_written_with_one_insert(self):
+        self.buffer.add(self.submission(1))
+        self.buffer.add(self.submission(2))
+        self.assertEqual(FormSubmission.objects.count(), 0)
+
+        with self.assertNumQueries(1):
+            self.buffer.add(self.submission(3))
+
+        self.assertEqual(self.buffer.pending, [])
+        submissions = FormSubmission.objects.order_by('name')
+        self.assertEqual([item.name for item in submissions], ['Клієнт 1', 'Клієнт 2', 'Клієнт 3'])
+        self.assertEqual(submissions[0].payload, {'service': 'web'})
+
+    def test_failed_flush_keeps_submissions(self):
+        self.buffer.add(self.submission(1))
+        with mock.patch.object(FormSubmission.objects, 'bulk_create', side_effect=DatabaseError('down')):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(len(self.buffer.pending), 1)
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(FormSubmission.objects.get().name, 'Клієнт 1')
+
+
+@override_settings(EMAIL_OUTBOX_MODE='sync', EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class SyncEmailTests(SimpleTestCase):
+    def test_client_email_failure_does_not_block_admin_email(self):
+        send_messages = mail.get_connection().__class__.send_messages
+
+        def fail_for_client(backend, messages):
+            # Як SMTP-бекенд: з fail_silently помилка відправки не кидається
+            if messages[0].to == ['client@example.com']:
+                if backend.fail_silently:
+                    return 0
+                raise smtplib.SMTPRecipientsRefused({'client@example.com': (550, b'No such user')})
+            return send_messages(backend, messages)
+
+        test_data = {'name': 'Клієнт', 'phone': '+380501234567', 'email': 'client@example.com', 'answers': {}}
+        with mock.patch.object(mail.get_connection().__class__, 'send_messages', fail_for_client):
+            self.assertTrue(send_test_result_email(test_data, 10000))
+
+        self.assertEqual([message.to for message in mail.outbox], [[settings.CONTACT_EMAIL]])
+
+
+class HashedStaticFilesTests(SimpleTestCase):
+    """collectstatic у тимчасову теку з HashedStaticFilesStorage та віддача через StaticFilesMiddleware"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        source = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+        (source / 'css').mkdir()
+        (source / 'css' / 'головна.css').write_text('body { color: #333; }\n' * 100, encoding='utf-8')
+        (source / 'video').mkdir()
+        (source / 'video' / 'intro.mp4').write_bytes(b'\x00' * 4096)
+        cls.enterClassContext(override_settings(
+            STATICFILES_DIRS=[source],
+            STATIC_ROOT=cls.enterClassContext(tempfile.TemporaryDirectory()),
+            STORAGES={**settings.STORAGES, 'staticfiles': {'BACKEND': 'apps.core.storage.HashedStaticFilesStorage'}},
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            WHITENOISE_USE_FINDERS=False, WHITENOISE_AUTOREFRESH=False,
+        ))
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.middleware = StaticFilesMiddleware(lambda request: HttpResponseNotFound())
+
+    def get(self, url, **headers):
+        return self.middleware(RequestFactory().get(url, headers=headers))
+
+    def test_hashed_url_is_immutable_and_compressed(self):
+        url = staticfiles_storage.url('css/головна.css')
+        self.assertTrue(url.isascii())
+        self.assertNotEqual(url, f'{settings.STATIC_URL}css/головна.css')
+
+        response = self.get(url, accept_encoding='br, gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn(response['Content-Encoding'], ('br', 'gzip'))
+
+    def test_missing_file_falls_back_to_plain_url(self):
+        self.assertEqual(staticfiles_storage.url('video/missing.mp4'), f'{settings.STATIC_URL}video/missing.mp4')
+
+    def test_video_supports_ranges(self):
+        response = self.get(staticfiles_storage.url('video/intro.mp4'), range='bytes=0-99')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
@@ -0,0 +1,215 @@
+"""
+Адаптивні відео: драбина бітрейтів H.264 з faststart, постери JPEG/WebP та маніфест
+
+build_videos (у build.sh перед collectstatic) перекодовує MP4 зі static/videos через
+ffmpeg у STATIC_BUILD_DIR поруч з відносним шляхом джерела ('main-720p.mp4',
+'main-poster.webp') і пише маніфест responsive-videos.json, collectstatic хешує
+їх як звичайну статику. Тег {% responsive_video %} віддає один <video> з <source>
+за media-запитами замість пари desktop/mobile елементів.
+
+Метадані відео: {'width', 'height', 'duration', 'hash', 'faststart',
+'renditions': [[коротка сторона, ім'я], ...] від більшої, 'bytes': {'source', '720p', ...},
+'poster': {'jpg': ім'я, 'webp': ім'я}}.
+ffmpeg: FFMPEG_BINARY, інакше з PATH, інакше з пакета imageio-ffmpeg.
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import struct
+import subprocess
+
+from django.conf import settings
+from PIL import Image
+
+STATIC_MANIFEST = 'responsive-videos.json'
+SOURCE_EXTENSIONS = ('.mp4', '.mov', '.webm')
+
+# (коротка сторона, максимальний бітрейт, media десктопного <source>); найменша - без media
+LADDER = (
+    (1080, '4000k', '(min-width: 1440px)'),
+    (720, '2000k', '(min-width: 768px)'),
+    (480, '1000k', ''),
+)
+# Мобільне відео (портретне) - не більше 720 по короткій стороні
+MOBILE_MEDIA = '(max-width: 767px)'
+MOBILE_HIDPI_MEDIA = '(max-width: 767px) and (min-resolution: 2dppx)'
+MOBILE_MAX_SIDE = 720
+CRF = 23
+POSTER_QUALITY = {'jpg': 80, 'webp': 75}
+
+
+class FFmpegError(Exception):
+    pass
+
+
+def ffmpeg_binary():
+    """Шлях до ffmpeg або None, якщо його немає"""
+    configured = getattr(settings, 'FFMPEG_BINARY', '')
+    if configured:
+        return shutil.which(configured)
+    found = shutil.which('ffmpeg')
+    if found:
+        return found
+    try:
+        import imageio_ffmpeg
+    except ImportError:
+        return None
+    try:
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except RuntimeError:
+        return None
+
+
+def _run(ffmpeg, *args):
+    result = subprocess.run([ffmpeg, '-hide_banner', '-nostdin', *args], capture_output=True)
+    if result.returncode:
+        lines = result.stderr.decode('utf-8', 'replace').strip().splitlines()
+        raise FFmpegError(lines[-1] if lines else f'ffmpeg завершився з кодом {result.returncode}')
+    return result
+
+
+_DURATION = re.compile(r'Duration: (\d+):(\d+):([\d.]+)')
+_VIDEO_SIZE = re.compile(r'Stream #.*?Video: .*?(\d{2,5})x(\d{2,5})')
+
+
+def probe(ffmpeg, path):
+    """(width, height, duration) з виводу 'ffmpeg -i' (ffprobe в imageio-ffmpeg немає)"""
+    result = subprocess.run([ffmpeg, '-hide_banner', '-nostdin', '-i', path], capture_output=True)
+    output = result.stderr.decode('utf-8', 'replace')
+    size = _VIDEO_SIZE.search(output)
+    if not size:
+        raise FFmpegError(f'{path}: відеопотік не знайдено')
+    duration = _DURATION.search(output)
+    seconds = int(duration[1]) * 3600 + int(duration[2]) * 60 + float(duration[3]) if duration else 0
+    return int(size[1]), int(size[2]), round(seconds, 2)
+
+
+def is_faststart(path):
+    """Чи стоїть moov перед mdat - тоді браузер починає відтворення з першого Range-запиту"""
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return False
+            size, kind = struct.unpack('>I4s', header)
+            if kind == b'moov':
+                return True
+            if kind == b'mdat':
+                return False
+            if size == 1:
+                size = struct.unpack('>Q', f.read(8))[0] - 8
+            elif size == 0:
+                return False
+            f.seek(size - 8, os.SEEK_CUR)
+
+
+def source_hash(path):
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def rendition_name(name, side):
+    return f'{os.path.splitext(name)[0]}-{side}p.mp4'
+
+
+def poster_name(name, fmt):
+    return f'{os.path.splitext(name)[0]}-poster.{fmt}'
+
+
+def ladder_sides(width, height):
+    """Сходинки драбини від більшої, не більші за оригінал (без апскейлу); щонайменше одна"""
+    short = min(width, height)
+    sides = [side for side, _, _ in LADDER if side <= short]
+    return sides or [short - short % 2]
+
+
+def process_video(ffmpeg, name, path, output_dir):
+    """Перекодовує джерело name (файл path) у output_dir; повертає метадані (див. docstring модуля)"""
+    width, height, duration = probe(ffmpeg, path)
+    bitrates = {side: bitrate for side, bitrate, _ in LADDER}
+    meta = {
+        'width': width, 'height': height, 'duration': duration, 'hash': source_hash(path),
+        'faststart': is_faststart(path), 'renditions': [], 'bytes': {'source': os.path.getsize(path)},
+    }
+
+    for side in ladder_sides(width, height):
+        bitrate = bitrates.get(side, LADDER[-1][1])
+        # -2 - пропорційно з парним розміром (вимога yuv420p)
+        scale = f'scale=-2:{side}' if width >= height else f'scale={side}:-2'
+        target = output_dir / rendition_name(name, side)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Фонові відео завжди muted - звукова доріжка лише додає байти (-an)
+        _run(ffmpeg, '-y', '-i', path, '-vf', scale, '-c:v', 'libx264', '-preset', 'slow', '-crf', str(CRF),
+             '-maxrate', bitrate, '-bufsize', f'{int(bitrate[:-1]) * 2}k', '-profile:v', 'high',
+             '-pix_fmt', 'yuv420p', '-an', '-movflags', '+faststart', str(target))
+        meta['renditions'].append([side, rendition_name(name, side)])
+        meta['bytes'][f'{side}p'] = target.stat().st_size
+
+    # Постер - характерний кадр (фільтр thumbnail) у розмірі найбільшої сходинки
+    side = meta['renditions'][0][0]
+    scale = f'scale=-2:{side}' if width >= height else f'scale={side}:-2'
+    frame = _run(ffmpeg, '-i', path, '-vf', f'thumbnail=60,{scale}', '-frames:v', '1',
+                 '-f', 'image2pipe', '-c:v', 'png', '-').stdout
+    meta['poster'] = {}
+    with Image.open(io.BytesIO(frame)) as image:
+        image = image.convert('RGB')
+        for fmt, quality in POSTER_QUALITY.items():
+            target = output_dir / poster_name(name, fmt)
+            image.save(target, 'JPEG' if fmt == 'jpg' else fmt.upper(), quality=quality)
+            meta['poster'][fmt] = poster_name(name, fmt)
+    return meta
+
+
+def renditions_exist(output_dir, meta):
+    names = [name for _, name in meta['renditions']] + list(meta['poster'].values())
+    return all((output_dir / name).exists() for name in names)
+
+
+_static_manifest = None
+
+
+def static_video(name):
+    """Метадані статичного відео з маніфесту (читається один раз на процес)"""
+    global _static_manifest
+    if _static_manifest is None:
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        try:
+            with staticfiles_storage.open(STATIC_MANIFEST) as f:
+                _static_manifest = json.loads(f.read().decode('utf-8'))
+        except (OSError, ValueError):
+            _static_manifest = {}
+    return _static_manifest.get(name)
+
+
+def video_sources(src, mobile=None):
+    """
+    [(ім'я, media)] для <source> у порядку вибору браузером: спершу мобільні
+    (max-width: 767px), далі десктопні від найбільшої сходинки; остання - без media.
+    Без маніфесту - самі джерела
+    """
+    sources = []
+    if mobile:
+        meta = static_video(mobile)
+        renditions = [r for r in meta['renditions'] if r[0] <= MOBILE_MAX_SIDE] if meta else []
+        if renditions:
+            sources += [(name, MOBILE_HIDPI_MEDIA) for _, name in renditions[:-1][-1:]]
+            sources.append((renditions[-1][1], MOBILE_MEDIA))
+        else:
+            sources.append((mobile, MOBILE_MEDIA))
+
+    meta = static_video(src)
+    media = {side: query for side, _, query in LADDER}
+    if meta:
+        renditions = meta['renditions']
+        sources += [(name, media.get(side, '')) for side, name in renditions[:-1]]
+        sources.append((renditions[-1][1], ''))
+    else:
+        sources.append((src, ''))
+    return sources
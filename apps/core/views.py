@@ -14,27 +14,32 @@ logger = logging.getLogger(__name__)
 
 class HomeView(BasePageView):
     template_name = 'pages/home.html'
+    page_cache = True
     page_title = 'PrometeyLabs - Розробка сайтів під ключ | Telegram боти | Реклама'
     meta_description = 'PrometeyLabs - професійна розробка сайтів під ключ, створення Telegram ботів, налаштування реклами Google Ads, навчання веб-розробки. Сучасні технології, конкурентні ціни.'
     og_title = 'PrometeyLabs - Розробка сайтів під ключ'
 
 class PortfolioView(BasePageView):
     template_name = 'pages/portfolio.html'
+    page_cache = True
     page_title = 'Портфоліо | Створені нами сайти під ключ - PrometeyLabs'
     meta_description = 'Портфоліо PrometeyLabs - приклади створених сайтів під ключ, Telegram ботів, налаштованої реклами. Подивіться на наші роботи та оцініть якість.'
 
 class CalculatorView(BasePageView):
     template_name = 'pages/calculator.html'
+    page_cache = True
     page_title = 'Розрахувати вартість сайту | Калькулятор ціни - PrometeyLabs'
     meta_description = 'Розрахуйте вартість створення сайту онлайн. Сучасні технології знижують ціну розробки. Тест для точного розрахунку вартості проекту.'
 
 class DeveloperView(BasePageView):
     template_name = 'pages/developer.html'
+    page_cache = True
     page_title = 'Курси програмування | Стати веб-розробником - PrometeyLabs'
     meta_description = 'Курси програмування у PrometeyLabs. Навчання веб-розробки з нуля. Індивідуальні та групові заняття. Практичний досвід, сучасні технології.'
 
 class ContactsView(BasePageView):
     template_name = 'pages/contacts.html'
+    page_cache = True
     page_title = 'Контакти | PrometeyLabs - Зв\'яжіться з нами'
     meta_description = 'Зв\'яжіться з командою PrometeyLabs для розробки сайтів, Telegram ботів, реклами чи навчання. Київ, Україна.'
 
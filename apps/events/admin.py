@@ -1,8 +1,10 @@
 from django.contrib import admin
+from django.db import transaction
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from .models import Event, EventCategory, EventRegistration
+from .intake import recount_participants
+from .models import Event, EventCategory, EventRegistration, RegistrationIntake
 
 
 @admin.register(EventCategory)
@@ -90,7 +92,7 @@ class EventAdmin(admin.ModelAdmin):
     price_display.short_description = 'Ціна'
     
     def participants_display(self, obj):
-        if obj.max_participants:
+        if obj.has_capacity_limit:
             return f"{obj.current_participants}/{obj.max_participants}"
         return f"{obj.current_participants}"
     participants_display.short_description = 'Учасники'
@@ -143,6 +145,13 @@ class EventRegistrationAdmin(admin.ModelAdmin):
     
     actions = ['confirm_registrations', 'unconfirm_registrations']
     
+    def delete_queryset(self, request, queryset):
+        """Масове видалення минає EventRegistration.delete - лічильники подій перераховуємо"""
+        with transaction.atomic():
+            event_ids = set(queryset.values_list('event_id', flat=True))
+            super().delete_queryset(request, queryset)
+            recount_participants(event_ids)
+    
     def confirm_registrations(self, request, queryset):
         updated = queryset.update(is_confirmed=True)
         self.message_user(request, f'{updated} реєстрацій підтверджено.')
@@ -151,4 +160,12 @@ class EventRegistrationAdmin(admin.ModelAdmin):
     def unconfirm_registrations(self, request, queryset):
         updated = queryset.update(is_confirmed=False)
         self.message_user(request, f'{updated} реєстрацій знято з підтвердження.')
-    unconfirm_registrations.short_description = "Зняти підтвердження" 
\ No newline at end of file
+    unconfirm_registrations.short_description = "Зняти підтвердження" 
+
+
+@admin.register(RegistrationIntake)
+class RegistrationIntakeAdmin(admin.ModelAdmin):
+    list_display = ['email', 'name', 'event_id', 'status', 'created_at', 'processed_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['name', 'email', 'phone']
+    readonly_fields = ['created_at', 'processed_at']
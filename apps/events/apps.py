@@ -4,4 +4,12 @@ from django.apps import AppConfig
 class EventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.events'
-    verbose_name = 'Події' 
\ No newline at end of file
+    verbose_name = 'Події'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        # WebP/AVIF похідні завантажених зображень подій генеруються у фоні
+        from apps.core.images import responsive_images
+        from .models import Event
+        responsive_images(Event, 'image')
@@ -0,0 +1,90 @@
+"""
+Кешовані відповіді events_ajax_filter
+
+Сторінка списку рендериться на сервері тими ж шаблонами, що й pages/events.html
+(components/event_cards.html, components/events_pagination.html), і кешується
+готовим JSON за (фільтри, сортування, курсор, мова, версія даних подій, збірка).
+Версія змінюється при збереженні/видаленні Event і EventCategory (signals.py).
+Відкритість реєстрації та вільні місця залежать від часу й реєстрацій
+(UPDATE без сигналів), тому фрагмент живе не довше FRAGMENT_TIMEOUT.
+
+Режими: 'html' - картки й пагінація HTML-рядками; 'json' - компактні дані подій
+без HTML для власного рендерингу на клієнті.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils import translation
+
+from .listing import (
+    FILTERS, events_cache, get_filters, get_listing_version, get_sort, page_query, paginate_events,
+)
+
+FRAGMENT_TIMEOUT = 60
+MODES = ('html', 'json')
+
+
+def get_fragment_cache_key(params, mode):
+    query = {param: params.get(param, '') for param in (*FILTERS, 'after', 'before')}
+    query['sort'] = get_sort(params)
+    query_hash = hashlib.md5(json.dumps(query, sort_keys=True).encode('utf-8')).hexdigest()
+    return ':'.join([
+        'fragment', getattr(settings, 'BUILD_HASH', 'dev'), get_listing_version(),
+        translation.get_language() or settings.LANGUAGE_CODE, mode, query_hash,
+    ])
+
+
+def build_fragment(params, mode):
+    """JSON-відповідь сторінки списку (рядок); params - GET з уже перевіреним sort"""
+    filters = get_filters(params)
+    page_obj = paginate_events(filters, get_sort(params), after=params.get('after'), before=params.get('before'))
+    data = {
+        'has_next': page_obj.has_next(),
+        'has_previous': page_obj.has_previous(),
+        'current_page': page_obj.number,
+        'total_pages': page_obj.paginator.num_pages,
+        'previous_cursor': page_obj.previous_cursor,
+        'next_cursor': page_obj.next_cursor,
+    }
+    if mode == 'json':
+        data['events'] = [compact_event(event) for event in page_obj]
+    else:
+        context = {
+            'page_obj': page_obj,
+            'has_filters': bool(filters),
+            'previous_query': page_query(params, 'before', page_obj.previous_cursor),
+            'next_query': page_query(params, 'after', page_obj.next_cursor),
+        }
+        data['html'] = render_to_string('components/event_cards.html', context)
+        data['pagination'] = render_to_string('components/events_pagination.html', context)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def compact_event(event):
+    return {
+        'id': event.id,
+        'slug': event.slug,
+        'title': event.title,
+        'start': event.start_date.isoformat(),
+        'type': event.event_type,
+        'category': event.category.slug,
+        'price': str(event.price) if event.price else None,
+        'online': event.is_online,
+        'featured': event.is_featured,
+        'open': event.is_registration_open,
+        'spots': event.available_spots,
+    }
+
+
+def get_fragment(params, mode='html'):
+    """(JSON-рядок, 'HIT'/'MISS') з кешу або щойно зібраний"""
+    computed = []
+
+    def compute():
+        computed.append(True)
+        return build_fragment(params, mode)
+
+    content = events_cache.get_or_compute(get_fragment_cache_key(params, mode), compute, FRAGMENT_TIMEOUT)
+    return content, 'MISS' if computed else 'HIT'
@@ -0,0 +1,215 @@
+"""
+Черга реєстрацій на події для флеш-анонсів (EVENTS_REGISTRATION_QUEUE)
+
+View валідує заявку та додає рядок у RegistrationIntake (без блокувань і
+перерахунків), а воркер drain_registration_queue пакетно переносить заявки
+в EventRegistration через bulk_create та одним UPDATE перераховує учасників.
+Кожен автор заявки отримує лист з результатом (apps.core.mail.queue_email).
+"""
+import logging
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.cache import AppCache
+from apps.core.form_handlers import validate_phone
+from apps.core.mail import get_outbox_mode, queue_email
+
+from .models import Event, EventRegistration, RegistrationIntake
+
+logger = logging.getLogger(__name__)
+
+events_cache = AppCache('events')
+TARGET_CACHE_TIMEOUT = 60
+DEFAULT_BATCH_SIZE = 500
+
+
+def target_cache_key(event_id):
+    return f'intake:target:{event_id}'
+
+
+def get_registration_target(event_id):
+    """
+    Мінімальні дані події для прийому заявки (кешуються на хвилину):
+    {'slug', 'is_open', 'is_full'} або None, якщо подія недоступна
+    """
+    key = target_cache_key(event_id)
+    target = events_cache.get(key)
+    if target is None:
+        event = (
+            Event.objects.filter(pk=event_id, is_published=True)
+            .only('slug', 'status', 'start_date', 'registration_deadline', 'max_participants', 'current_participants')
+            .first()
+        )
+        target = {'slug': event.slug, 'is_open': event.is_registration_open, 'is_full': event.is_full} if event else {}
+        events_cache.set(key, target, TARGET_CACHE_TIMEOUT)
+    return target or None
+
+
+def clean_intake_data(data):
+    """Валідація полів форми без звернень до БД. Повертає (дані, помилка)"""
+    fields = {
+        'name': (data.get('name') or '').strip(),
+        'email': (data.get('email') or '').strip(),
+        'phone': (data.get('phone') or '').strip(),
+        'company': (data.get('company') or '').strip(),
+        'message': (data.get('message') or '').strip(),
+    }
+    if not fields['name'] or not fields['email'] or not fields['phone']:
+        return None, "Заповніть ім'я, email та телефон."
+    try:
+        validate_email(fields['email'])
+    except ValidationError:
+        return None, 'Вкажіть коректний email.'
+    if not validate_phone(fields['phone']):
+        return None, 'Вкажіть коректний номер телефону.'
+    for field in ('name', 'email', 'phone', 'company'):
+        max_length = RegistrationIntake._meta.get_field(field).max_length
+        fields[field] = fields[field][:max_length]
+    return fields, None
+
+
+def enqueue_registration(event_id, fields):
+    return RegistrationIntake.objects.create(event_id=event_id, **fields)
+
+
+def drain_registrations(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Обробляє одну пачку заявок у порядку надходження.
+    Повертає Counter статусів (порожній, якщо черга порожня)
+    """
+    with transaction.atomic():
+        intakes = list(
+            RegistrationIntake.objects.select_for_update(skip_locked=True)
+            .filter(status='pending').order_by('id')[:batch_size]
+        )
+        if not intakes:
+            return Counter()
+
+        event_ids = {intake.event_id for intake in intakes}
+        # Блокуємо рядки подій - синхронні реєстрації (reserve_spot) чекають завершення пачки
+        events = (
+            Event.objects.select_for_update()
+            .filter(is_published=True)
+            .only('id', 'title', 'slug', 'status', 'start_date', 'registration_deadline', 'max_participants')
+            .in_bulk(event_ids)
+        )
+        counts = dict(
+            EventRegistration.objects.filter(event_id__in=list(events))
+            .values_list('event_id').annotate(total=Count('id'))
+        )
+        registered = set(
+            EventRegistration.objects.filter(
+                event_id__in=list(events), email__in={intake.email for intake in intakes}
+            ).values_list('event_id', 'email')
+        )
+
+        new_registrations = []
+        by_status = defaultdict(list)
+        notifications = []
+        for intake in intakes:
+            event = events.get(intake.event_id)
+            key = (intake.event_id, intake.email)
+            # Відкритість перевіряємо на момент обробки: заявка могла чекати довше дедлайну
+            if event is None or not event.is_registration_open:
+                status = 'rejected'
+            elif key in registered:
+                status = 'duplicate'
+            elif event.has_capacity_limit and counts.get(event.pk, 0) >= event.max_participants:
+                status = 'full'
+            else:
+                status = 'registered'
+                registered.add(key)
+                counts[event.pk] = counts.get(event.pk, 0) + 1
+                new_registrations.append(EventRegistration(
+                    event_id=intake.event_id, name=intake.name, email=intake.email,
+                    phone=intake.phone, company=intake.company, message=intake.message,
+                ))
+            by_status[status].append(intake.pk)
+            notifications.append(registration_email(intake, status, event))
+
+        # bulk_create не викликає save(), тому лічильник перераховується нижче
+        EventRegistration.objects.bulk_create(new_registrations, ignore_conflicts=True)
+
+        now = timezone.now()
+        for status, ids in by_status.items():
+            RegistrationIntake.objects.filter(pk__in=ids).update(status=status, processed_at=now)
+
+        recount_participants(events)
+
+        # Лист у черзі комітиться разом зі статусом заявки: без рядка outbox немає й статусу
+        if get_outbox_mode() != 'sync':
+            for notification in notifications:
+                queue_email(*notification)
+
+    if get_outbox_mode() == 'sync':
+        # Відправка по SMTP - поза транзакцією з блокуваннями подій
+        for notification in notifications:
+            try:
+                queue_email(*notification)
+            except Exception as e:
+                logger.error(f"Failed to send registration email to {notification[2]}: {e}")
+
+    events_cache.delete_many([target_cache_key(event_id) for event_id in event_ids])
+    stats = Counter({status: len(ids) for status, ids in by_status.items()})
+    logger.info(f"Черга реєстрацій: оброблено {len(intakes)} заявок {dict(stats)}")
+    return stats
+
+
+REGISTRATION_EMAILS = {
+    'registered': (
+        'Реєстрацію підтверджено: {title}',
+        'Вітаємо, {name}!\n\nВи зареєстровані на подію "{title}", що розпочнеться {start}.\n'
+        'Деталі події: {url}',
+    ),
+    'duplicate': (
+        'Ви вже зареєстровані: {title}',
+        'Вітаємо, {name}!\n\nEmail {email} уже зареєстрований на подію "{title}" - '
+        'повторна заявка не потрібна.\nДеталі події: {url}',
+    ),
+    'full': (
+        'Немає вільних місць: {title}',
+        'Вітаємо, {name}!\n\nНа жаль, поки ваша заявка була в черзі, всі місця на подію "{title}" '
+        'зайняли. Стежте за новими подіями: {url}',
+    ),
+    'rejected': (
+        'Реєстрація недоступна',
+        'Вітаємо, {name}!\n\nНа жаль, реєстрацію на подію{title_suffix} закрито або подія недоступна. '
+        'Актуальні події: {url}',
+    ),
+}
+
+
+def registration_email(intake, status, event):
+    """(тема, текст, [email]) листа з результатом обробки заявки"""
+    subject, body = REGISTRATION_EMAILS[status]
+    site_url = getattr(settings, 'SITE_URL', '').rstrip('/')
+    context = {
+        'name': intake.name,
+        'email': intake.email,
+        'title': event.title if event else '',
+        'title_suffix': f' "{event.title}"' if event else '',
+        'start': timezone.localtime(event.start_date).strftime('%d.%m.%Y %H:%M') if event else '',
+        'url': site_url + (event.get_absolute_url() if event and status != 'rejected'
+                           else reverse('events')),
+    }
+    body += '\n\nЗ повагою,\nКоманда PrometeyLabs'
+    return subject.format(**context), body.format(**context), [intake.email]
+
+
+def recount_participants(event_ids):
+    """Один агрегатний UPDATE current_participants для заданих подій"""
+    total = (
+        EventRegistration.objects.filter(event=OuterRef('pk'))
+        .values('event').annotate(total=Count('id')).values('total')
+    )
+    return Event.objects.filter(pk__in=list(event_ids)).update(
+        current_participants=Coalesce(Subquery(total), 0)
+    )
@@ -0,0 +1,127 @@
+"""
+Запити списку подій: фільтри, сортування, keyset-пагінація та кешована кількість
+
+events_list і events_ajax_filter будують вибірку через filter_events(), а сторінку -
+через paginate_events(). ?sort= приймає лише ключі SORTS; порядок кожного з них
+збігається з частковим індексом Event.Meta.indexes (WHERE is_published), тож
+глибокі сторінки коштують як перша (перевірка: EventSortPlanTests в tests.py).
+COUNT(*) для "Сторінка N з M" кешується за фільтрами та версією даних подій
+(post_save/post_delete Event і EventCategory, див. signals.py); з
+EVENTS_APPROXIMATE_COUNT на PostgreSQL великі вибірки рахує оцінка планувальника.
+"""
+import hashlib
+import json
+import uuid
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connection
+
+from apps.core.cache import AppCache
+from apps.core.pagination import KeysetPaginator
+
+from .models import Event
+
+PER_PAGE = 6
+# ?sort= -> (назва для кнопки, порядок keyset-пагінації); останнє поле - унікальний tie-breaker.
+# Кожен порядок має відповідний індекс в Event.Meta.indexes
+SORTS = {
+    '-start_date': ('Найближчі', ('-start_date', '-id')),
+    'price': ('За ціною', ('price', '-id')),
+    '-current_participants': ('Популярні', ('-current_participants', '-id')),
+    '-is_featured': ('Рекомендовані', ('-is_featured', '-start_date', '-id')),
+}
+DEFAULT_SORT = '-start_date'
+ORDERING = SORTS[DEFAULT_SORT][1]
+# GET-параметр -> lookup
+FILTERS = {'category': 'category__slug', 'type': 'event_type', 'status': 'status'}
+COUNT_TIMEOUT = 300
+# Менші вибірки рахуються точно - COUNT по індексу там дешевий
+APPROXIMATE_COUNT_THRESHOLD = 10000
+
+events_cache = AppCache('events')
+VERSION_CACHE_KEY = 'listing:version'
+
+
+class InvalidSort(ValueError):
+    """Сортування, якого немає в SORTS"""
+
+
+def get_listing_version():
+    """Спільна для всіх воркерів версія даних списку подій"""
+    version = events_cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        events_cache.add(VERSION_CACHE_KEY, version, None)
+        version = events_cache.get(VERSION_CACHE_KEY, version)
+    return version
+
+
+def invalidate_listing():
+    version = uuid.uuid4().hex
+    events_cache.set(VERSION_CACHE_KEY, version, None)
+    return version
+
+
+def get_filters(params):
+    """Непорожні фільтри з GET-параметрів"""
+    return {param: params[param] for param in FILTERS if params.get(param)}
+
+
+def filter_events(filters):
+    events = Event.objects.filter(is_published=True).select_related('category')
+    for param, value in filters.items():
+        events = events.filter(**{FILTERS[param]: value})
+    return events
+
+
+def get_sort(params):
+    """Ключ SORTS з GET-параметра sort (порожній - DEFAULT_SORT); невідомий - InvalidSort"""
+    sort = params.get('sort') or DEFAULT_SORT
+    if sort not in SORTS:
+        raise InvalidSort(sort)
+    return sort
+
+
+def get_ordering(sort):
+    try:
+        return SORTS[sort][1]
+    except (KeyError, TypeError) as e:
+        raise InvalidSort(sort) from e
+
+
+def estimate_count(queryset):
+    """Оцінка кількості рядків з плану PostgreSQL (без COUNT); None на інших БД"""
+    if connection.vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_events(queryset, filters):
+    def compute():
+        if getattr(settings, 'EVENTS_APPROXIMATE_COUNT', False):
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate >= APPROXIMATE_COUNT_THRESHOLD:
+                return estimate
+        return queryset.count()
+
+    key = hashlib.md5(json.dumps(filters, sort_keys=True).encode('utf-8')).hexdigest()
+    return events_cache.get_or_compute(f'count:{get_listing_version()}:{key}', compute, COUNT_TIMEOUT)
+
+
+def paginate_events(filters, sort=DEFAULT_SORT, after=None, before=None, per_page=PER_PAGE):
+    """Сторінка подій (KeysetPage); кількість сторінок рахується лише при зверненні до num_pages"""
+    queryset = filter_events(filters)
+    paginator = KeysetPaginator(queryset, per_page, get_ordering(sort),
+                                count=lambda: count_events(queryset, filters))
+    return paginator.page(after=after, before=before)
+
+
+def page_query(params, cursor_param, cursor):
+    """Query string посилання на сусідню сторінку: поточні фільтри й сортування + курсор"""
+    if not cursor:
+        return ''
+    query = {param: params[param] for param in (*FILTERS, 'sort') if params.get(param)}
+    query[cursor_param] = cursor
+    return urlencode(query)
@@ -0,0 +1,35 @@
+"""
+Django management команда - воркер черги реєстрацій на події
+
+Разовий запуск обробляє всі заявки, що є в черзі; з --loop працює постійно
+(окремий процес/сервіс поруч з веб-воркерами при EVENTS_REGISTRATION_QUEUE=True).
+"""
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from apps.events.intake import DEFAULT_BATCH_SIZE, drain_registrations
+
+
+class Command(BaseCommand):
+    help = 'Пакетно переносить заявки з черги реєстрацій у EventRegistration'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Заявок за одну транзакцію')
+        parser.add_argument('--loop', action='store_true', help='Працювати постійно')
+        parser.add_argument('--interval', type=float, default=1.0, help='Пауза між перевірками порожньої черги, с')
+
+    def handle(self, *args, **options):
+        total = Counter()
+        while True:
+            stats = drain_registrations(options['batch_size'])
+            total.update(stats)
+            if stats:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        summary = ', '.join(f'{status}: {count}' for status, count in sorted(total.items())) or 'черга порожня'
+        self.stdout.write(self.style.SUCCESS(f'✅ Оброблено {sum(total.values())} заявок ({summary})'))
@@ -0,0 +1,30 @@
+"""
+Django management команда - переходи статусів подій за часом
+
+Переводить події upcoming -> active -> completed пакетними UPDATE. Разовий
+запуск підходить для cron (раз на хвилину); з --loop працює як воркер і спить
+до найближчої межі start_date/end_date (режим EVENTS_STATUS_MODE=worker).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.events.statuses import MAX_SLEEP, seconds_until_next_transition, sync_event_statuses
+
+
+class Command(BaseCommand):
+    help = 'Оновлює статуси подій (upcoming/active/completed) за датами початку й завершення'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Працювати постійно')
+        parser.add_argument('--max-interval', type=float, default=MAX_SLEEP,
+                            help='Найдовша пауза між проходами, с (межі змінених подій)')
+
+    def handle(self, *args, **options):
+        while True:
+            changed = sync_event_statuses()
+            summary = ', '.join(f'{status}: {count}' for status, count in sorted(changed.items())) or 'без змін'
+            self.stdout.write(f'🗓  Статуси подій: {summary}')
+            if not options['loop']:
+                break
+            time.sleep(seconds_until_next_transition(options['max_interval']))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-17 16:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_alter_eventcategory_color'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationIntake',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.BigIntegerField(verbose_name='ID події')),
+                ('name', models.CharField(max_length=100, verbose_name="Ім'я")),
+                ('email', models.EmailField(max_length=254, verbose_name='Email')),
+                ('phone', models.CharField(max_length=20, verbose_name='Телефон')),
+                ('company', models.CharField(blank=True, max_length=100, verbose_name='Компанія')),
+                ('message', models.TextField(blank=True, verbose_name='Додаткова інформація')),
+                ('status', models.CharField(choices=[('pending', 'В черзі'), ('registered', 'Зареєстровано'), ('duplicate', 'Вже зареєстрований'), ('full', 'Немає місць'), ('rejected', 'Подія недоступна')], default='pending', max_length=20, verbose_name='Статус')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Отримано')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='Оброблено')),
+            ],
+            options={
+                'verbose_name': 'Заявка в черзі реєстрацій',
+                'verbose_name_plural': 'Черга реєстрацій',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='events_intake_status_id')],
+            },
+        ),
+    ]
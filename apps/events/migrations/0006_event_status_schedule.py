@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-17 18:14
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def sync_statuses(apps, schema_editor):
+    """Початкові статуси за датами (до цього status ніхто не оновлював); cancelled не чіпаємо"""
+    Event = apps.get_model('events', 'Event')
+    now = timezone.now()
+    events = Event.objects.exclude(status='cancelled')
+    events.filter(start_date__gt=now).exclude(status='upcoming').update(status='upcoming')
+    events.filter(start_date__lte=now, end_date__gte=now).exclude(status='active').update(status='active')
+    events.filter(end_date__lt=now).exclude(status='completed').update(status='completed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'end_date'], name='events_status_end'),
+        ),
+        migrations.RunPython(sync_statuses, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,23 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q
 from django.urls import reverse
 from django.utils.text import slugify
 from django.utils import timezone
 
 
+# Умова Event.has_capacity_limit == False для запитів (має збігатися з властивістю)
+NO_CAPACITY_LIMIT = Q(max_participants__isnull=True) | Q(max_participants__lte=0)
+
+
+class EventFullError(Exception):
+    """На подію не залишилось вільних місць"""
+
+
+class AlreadyRegisteredError(Exception):
+    """Email вже зареєстрований на цю подію"""
+
+
 class EventCategory(models.Model):
     """Категорії подій"""
     name = models.CharField(max_length=100, verbose_name="Назва категорії")
@@ -85,6 +99,26 @@ class Event(models.Model):
         ordering = ['-start_date']
         verbose_name = "Подія"
         verbose_name_plural = "Події"
+        # Під фільтри та keyset-порядки списку (apps.events.listing.SORTS); лише опубліковані
+        indexes = [
+            models.Index(fields=['-start_date', '-id'], condition=Q(is_published=True),
+                         name='events_pub_start'),
+            models.Index(fields=['category', '-start_date', '-id'], condition=Q(is_published=True),
+                         name='events_pub_category_start'),
+            models.Index(fields=['event_type', '-start_date', '-id'], condition=Q(is_published=True),
+                         name='events_pub_type_start'),
+            models.Index(fields=['status', '-start_date', '-id'], condition=Q(is_published=True),
+                         name='events_pub_status_start'),
+            # Решта сортувань listing.SORTS
+            models.Index(fields=['price', '-id'], condition=Q(is_published=True),
+                         name='events_pub_price'),
+            models.Index(fields=['-current_participants', '-id'], condition=Q(is_published=True),
+                         name='events_pub_popular'),
+            models.Index(fields=['-is_featured', '-start_date', '-id'], condition=Q(is_published=True),
+                         name='events_pub_featured'),
+            # Переходи статусів за часом (apps.events.statuses)
+            models.Index(fields=['status', 'end_date'], name='events_status_end'),
+        ]
     
     def __str__(self):
         return self.title
@@ -96,44 +130,80 @@ class Event(models.Model):
         # Автоматичний розрахунок зниженої ціни
         if self.original_price and self.discount_percent > 0:
             self.price = self.original_price * (1 - self.discount_percent / 100)
+
+        # Статус за датами; далі переходи з часом робить apps.events.statuses
+        if self.status != 'cancelled' and self.start_date and self.end_date:
+            self.status = self.scheduled_status()
         
         super().save(*args, **kwargs)
     
     def get_absolute_url(self):
         return reverse('event_detail', kwargs={'slug': self.slug})
     
+    def scheduled_status(self, now=None):
+        """Статус, що відповідає датам події на момент now"""
+        now = now or timezone.now()
+        if self.start_date > now:
+            return 'upcoming'
+        if self.end_date >= now:
+            return 'active'
+        return 'completed'
+
     @property
     def is_registration_open(self):
-        """Чи відкрита реєстрація"""
+        """Чи відкрита реєстрація (лише для майбутніх подій)"""
+        if self.status != 'upcoming':
+            return False
         now = timezone.now()
         if self.registration_deadline:
             return now <= self.registration_deadline
         return now <= self.start_date
     
+    @property
+    def has_capacity_limit(self):
+        """Чи обмежена кількість місць: порожній, 0 або від'ємний max_participants - без обмежень"""
+        return self.max_participants is not None and self.max_participants > 0
+
     @property
     def is_full(self):
         """Чи заповнена подія"""
-        if self.max_participants:
+        if self.has_capacity_limit:
             return self.current_participants >= self.max_participants
         return False
     
     @property
     def available_spots(self):
         """Доступні місця"""
-        if self.max_participants:
+        if self.has_capacity_limit:
             return max(0, self.max_participants - self.current_participants)
         return None
     
+    def reserve_spot(self):
+        """
+        Атомарно займає місце: UPDATE ... WHERE current_participants < max_participants.
+        Повертає False, якщо місць немає (без обмежень - як has_capacity_limit, але за даними в БД)
+        """
+        has_room = NO_CAPACITY_LIMIT | Q(current_participants__lt=F('max_participants'))
+        return bool(
+            Event.objects.filter(has_room, pk=self.pk)
+            .update(current_participants=F('current_participants') + 1)
+        )
+
+    def release_spot(self):
+        """Атомарно звільняє місце (лічильник не опускається нижче нуля)"""
+        Event.objects.filter(pk=self.pk, current_participants__gt=0).update(
+            current_participants=F('current_participants') - 1
+        )
+
     @property
     def is_upcoming(self):
-        """Чи майбутня подія"""
-        return self.start_date > timezone.now()
+        """Чи майбутня подія (статус оновлює apps.events.statuses)"""
+        return self.status == 'upcoming'
     
     @property
     def is_active(self):
-        """Чи активна подія"""
-        now = timezone.now()
-        return self.start_date <= now <= self.end_date
+        """Чи активна подія (статус оновлює apps.events.statuses)"""
+        return self.status == 'active'
 
 
 class EventRegistration(models.Model):
@@ -157,9 +227,74 @@ class EventRegistration(models.Model):
     def __str__(self):
         return f"{self.name} - {self.event.title}"
     
+    def clean(self):
+        super().clean()
+        if self._state.adding and self.event_id and self.event.is_full:
+            raise ValidationError('На жаль, всі місця на цю подію вже зайняті.')
+
     def save(self, *args, **kwargs):
-        # Збільшуємо лічильник учасників при реєстрації
-        if not self.pk:  # Тільки при створенні
-            self.event.current_participants += 1
-            self.event.save()
-        super().save(*args, **kwargs) 
\ No newline at end of file
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        # Місце резервується в тій самій транзакції: якщо вставка впаде
+        # (наприклад, на unique_together), резерв відкотиться разом з нею
+        with transaction.atomic():
+            if not self.event.reserve_spot():
+                raise EventFullError(self.event_id)
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            self.event.release_spot()
+        return result
+
+    @classmethod
+    def register(cls, event, **fields):
+        """
+        Реєстрація на подію без гонок між воркерами.
+        Кидає EventFullError або AlreadyRegisteredError
+        """
+        registration = cls(event=event, **fields)
+        try:
+            registration.save()
+        except IntegrityError as exc:
+            # IntegrityError також буває через NOT NULL - дублікат перевіряємо лише тут
+            if cls.objects.filter(event=event, email=fields.get('email')).exists():
+                raise AlreadyRegisteredError(fields.get('email')) from exc
+            raise
+        return registration 
+
+
+class RegistrationIntake(models.Model):
+    """
+    Черга заявок на реєстрацію (режим EVENTS_REGISTRATION_QUEUE).
+    View лише додає рядок, воркер drain_registration_queue пакетно
+    переносить заявки в EventRegistration
+    """
+    STATUS_CHOICES = [
+        ('pending', 'В черзі'),
+        ('registered', 'Зареєстровано'),
+        ('duplicate', 'Вже зареєстрований'),
+        ('full', 'Немає місць'),
+        ('rejected', 'Подія недоступна'),
+    ]
+
+    event_id = models.BigIntegerField(verbose_name="ID події")
+    name = models.CharField(max_length=100, verbose_name="Ім'я")
+    email = models.EmailField(verbose_name="Email")
+    phone = models.CharField(max_length=20, verbose_name="Телефон")
+    company = models.CharField(max_length=100, blank=True, verbose_name="Компанія")
+    message = models.TextField(blank=True, verbose_name="Додаткова інформація")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Статус")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Отримано")
+    processed_at = models.DateTimeField(null=True, blank=True, verbose_name="Оброблено")
+
+    class Meta:
+        verbose_name = "Заявка в черзі реєстрацій"
+        verbose_name_plural = "Черга реєстрацій"
+        ordering = ['id']
+        indexes = [models.Index(fields=['status', 'id'], name='events_intake_status_id')]
+
+    def __str__(self):
+        return f"{self.email} → {self.event_id} ({self.get_status_display()})"
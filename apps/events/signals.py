@@ -0,0 +1,26 @@
+"""
+Сигнали подій: нова версія даних списку (кешовані кількості в apps.events.listing)
+та перерахунок найближчої межі статусів (apps.events.statuses)
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .listing import invalidate_listing
+from .models import Event, EventCategory
+from .statuses import wake_status_timer
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+def events_changed(sender, **kwargs):
+    # Після коміту: інакше інший процес закешує кількість/фрагменти з рядків до коміту під новою версією
+    transaction.on_commit(invalidate_listing)
+
+
+@receiver(post_save, sender=Event)
+def event_dates_changed(sender, **kwargs):
+    # Таймер читає межі з БД - будимо, коли нові дати вже видно
+    transaction.on_commit(wake_status_timer)
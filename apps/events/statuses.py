@@ -0,0 +1,111 @@
+"""
+Статуси подій за часом: upcoming -> active -> completed
+
+Event.save виставляє статус за датами (крім cancelled), а переходи, що настають
+з часом, застосовуються пакетно - по одному UPDATE на цільовий статус
+(sync_event_statuses). Після переходів скидається версія списку подій, тож
+фільтр ?status= і кеші listing/fragments бачать актуальний статус.
+
+Режим задається settings.EVENTS_STATUS_MODE:
+  'thread' - таймер у кожному веб-процесі (за замовчуванням): спить до найближчої
+             межі start_date/end_date, але не довше MAX_SLEEP
+  'worker' - лише python manage.py sync_event_statuses (cron або --loop)
+UPDATE умовні, тож паралельні таймери кількох воркерів нічого не дублюють.
+"""
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .listing import invalidate_listing
+from .models import Event
+
+logger = logging.getLogger(__name__)
+
+MAX_SLEEP = 60  # секунд: межі подій, змінених в інших процесах, підхоплюються не пізніше
+MIN_SLEEP = 1
+
+
+def get_status_mode():
+    return getattr(settings, 'EVENTS_STATUS_MODE', 'thread')
+
+
+def sync_event_statuses(now=None):
+    """Переходи, що настали до now: {цільовий статус: кількість подій}"""
+    now = now or timezone.now()
+    changed = {
+        'completed': Event.objects.filter(status__in=['upcoming', 'active'], end_date__lt=now)
+        .update(status='completed', updated_at=now),
+        'active': Event.objects.filter(status='upcoming', start_date__lte=now, end_date__gte=now)
+        .update(status='active', updated_at=now),
+    }
+    if any(changed.values()):
+        # UPDATE минає post_save - версію списку скидаємо самі
+        invalidate_listing()
+    return {status: count for status, count in changed.items() if count}
+
+
+def next_transition_at():
+    """Найближча межа (start_date майбутньої або end_date незавершеної події); None - переходів немає"""
+    bounds = Event.objects.filter(status__in=['upcoming', 'active']).aggregate(
+        start=Min('start_date', filter=Q(status='upcoming')), end=Min('end_date'),
+    )
+    return min(filter(None, bounds.values()), default=None)
+
+
+def seconds_until_next_transition(max_sleep=MAX_SLEEP):
+    moment = next_transition_at()
+    if moment is None:
+        return max_sleep
+    delay = (moment - timezone.now()).total_seconds()
+    # end_date < now: перехід у completed стається на першій секунді після межі
+    return min(max(delay + 1, MIN_SLEEP), max_sleep)
+
+
+class StatusTimer(threading.Thread):
+    """Таймер у межах процесу: прокидається на межі подій, після збереження події або раз на MAX_SLEEP"""
+
+    def __init__(self):
+        super().__init__(name='event-status-timer', daemon=True)
+        self.wake_event = threading.Event()
+
+    def run(self):
+        while True:
+            try:
+                sync_event_statuses()
+                delay = seconds_until_next_transition()
+            except Exception as e:
+                logger.error(f"Event status timer error: {e}")
+                delay = MAX_SLEEP
+            finally:
+                close_old_connections()
+            self.wake_event.wait(delay)
+            self.wake_event.clear()
+
+
+_timer = None
+_timer_pid = None
+_timer_lock = threading.Lock()
+
+
+def start_status_timer():
+    """Запускає таймер цього процесу (режим 'thread'), якщо він ще не працює"""
+    global _timer, _timer_pid
+    if get_status_mode() != 'thread':
+        return
+    with _timer_lock:
+        # Після fork потоки батьківського процесу не успадковуються
+        if _timer is None or _timer_pid != os.getpid() or not _timer.is_alive():
+            _timer = StatusTimer()
+            _timer_pid = os.getpid()
+            _timer.start()
+
+
+def wake_status_timer():
+    """Перераховує найближчу межу після зміни дат (лише якщо таймер цього процесу вже працює)"""
+    if _timer is not None and _timer_pid == os.getpid() and _timer.is_alive():
+        _timer.wake_event.set()
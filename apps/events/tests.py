@@ -0,0 +1,306 @@
+"""
+Тести подій: whitelist сортувань, keyset-пагінація проти OFFSET, інвалідація
+кешу фрагментів, черга реєстрацій, перерахунок учасників у адмінці та плани
+запитів кожного сортування
+
+Перевірка планів - лише на PostgreSQL (CI з DATABASE_URL): для кожного ключа
+SORTS робиться EXPLAIN першої сторінки, наступної (after) та попередньої (before);
+Seq Scan по таблиці подій або окремий Sort означає, що порядок не обслуговується
+індексом з Event.Meta.indexes. Seq scan, bitmap scan і Sort вимикаються на час
+перевірки: на малій тестовій таблиці планувальник справедливо обирає їх за
+вартістю, а без індексу під порядок вони лишаються в плані попри заборону.
+"""
+import json
+import threading
+import unittest
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.admin import helpers
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.models import EmailOutbox
+from apps.core.pagination import KeysetPaginator
+from apps.core.testing import ISOLATED_SETTINGS
+
+from .fragments import get_fragment
+from .intake import drain_registrations
+from .listing import PER_PAGE, SORTS, filter_events, paginate_events
+from .models import (
+    AlreadyRegisteredError, Event, EventCategory, EventFullError, EventRegistration, RegistrationIntake,
+)
+
+BAD_PLAN_NODES = {'Seq Scan', 'Sort', 'Incremental Sort'}
+
+
+def create_event(category, number=0, **fields):
+    now = timezone.now()
+    defaults = {
+        'title': f'Подія {number}', 'slug': f'event-{number}', 'excerpt': '-', 'content': '-',
+        'category': category, 'event_type': 'other', 'start_date': now, 'end_date': now, 'price': 100,
+    }
+    return Event.objects.create(**{**defaults, **fields})
+
+
+@override_settings(**ISOLATED_SETTINGS)
+class EventSortTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = EventCategory.objects.create(name='Веб-розробка', slug='web-development')
+        create_event(category)
+
+    def test_known_sorts(self):
+        for sort in SORTS:
+            with self.subTest(sort=sort):
+                self.assertEqual(self.client.get(reverse('events'), {'sort': sort}).status_code, 200)
+                response = self.client.get(
+                    reverse('events_ajax_filter'), {'sort': sort}, headers={'x-requested-with': 'XMLHttpRequest'},
+                )
+                self.assertEqual(response.status_code, 200)
+
+    def test_unknown_sort_is_rejected(self):
+        for sort in ('title', 'category__name', '-id', 'price; DROP TABLE'):
+            with self.subTest(sort=sort):
+                self.assertEqual(self.client.get(reverse('events'), {'sort': sort}).status_code, 400)
+                response = self.client.get(
+                    reverse('events_ajax_filter'), {'sort': sort}, headers={'x-requested-with': 'XMLHttpRequest'},
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': 'Unknown sort'})
+
+
+@override_settings(**ISOLATED_SETTINGS)
+class EventPaginationTests(TestCase):
+    """Обхід keyset-курсорами дає ті самі сторінки, що й OFFSET, для кожного сортування"""
+
+    def setUp(self):
+        cache.clear()
+        category = EventCategory.objects.create(name='Веб-розробка', slug='web-development')
+        start = timezone.now() + timedelta(days=1)
+        for number in range(PER_PAGE * 3 + 2):
+            # Повтори значень сортування перевіряють tie-breaker, порожня ціна - NULL у кінці порядку
+            create_event(
+                category, number, start_date=start + timedelta(days=number // 3), end_date=start + timedelta(days=30),
+                price=(number % 4) * 100 or None, current_participants=number % 5, is_featured=not number % 3,
+            )
+
+    def test_keyset_pages_match_offset(self):
+        for sort, (_, ordering) in SORTS.items():
+            with self.subTest(sort=sort):
+                offset = Paginator(KeysetPaginator(filter_events({}), PER_PAGE, ordering).seek_queryset(), PER_PAGE)
+                expected = [[event.pk for event in offset.page(number)] for number in offset.page_range]
+
+                pages, page = [], paginate_events({}, sort)
+                pages.append([event.pk for event in page])
+                while page.has_next():
+                    page = paginate_events({}, sort, after=page.next_cursor)
+                    pages.append([event.pk for event in page])
+                self.assertEqual(pages, expected)
+                self.assertEqual(page.paginator.num_pages, offset.num_pages)
+
+                # Назад від останньої сторінки - ті самі сторінки у зворотному порядку
+                backwards = [pages[-1]]
+                while page.has_previous():
+                    page = paginate_events({}, sort, before=page.previous_cursor)
+                    backwards.append([event.pk for event in page])
+                self.assertEqual(backwards[::-1], expected)
+
+
+@override_settings(**ISOLATED_SETTINGS)
+class EventFragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = create_event(EventCategory.objects.create(name='Веб-розробка', slug='web-development'))
+
+    def test_event_save_invalidates_fragments_after_commit(self):
+        params = QueryDict('')
+        self.assertEqual(get_fragment(params)[1], 'MISS')
+        self.assertEqual(get_fragment(params)[1], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.title = 'Змінена подія'
+            self.event.save()
+            self.assertEqual(get_fragment(params)[1], 'HIT')
+
+        content, status = get_fragment(params)
+        self.assertEqual(status, 'MISS')
+        self.assertIn('Змінена подія', content)
+
+
+@override_settings(**ISOLATED_SETTINGS, EVENTS_REGISTRATION_QUEUE=True)
+class RegistrationQueueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        start = timezone.now() + timedelta(days=7)
+        self.event = create_event(
+            EventCategory.objects.create(name='Веб-розробка', slug='web-development'),
+            start_date=start, end_date=start + timedelta(hours=1), max_participants=5,
+        )
+        self.url = reverse('event_registration', args=[self.event.pk])
+
+    def apply(self, number):
+        return self.client.post(self.url, {
+            'name': f'Учасник {number}', 'email': f'user{number}@example.com', 'phone': '+380501234567',
+        })
+
+    def test_queued_applications_are_registered_by_drain(self):
+        for number in range(7):
+            self.assertEqual(self.apply(number).status_code, 302)
+        self.apply(0)  # повторна заявка того ж email
+        self.assertEqual(RegistrationIntake.objects.filter(status='pending').count(), 8)
+        self.assertFalse(EventRegistration.objects.exists())
+
+        stats = drain_registrations()
+
+        self.assertEqual(stats, {'registered': 5, 'full': 2, 'duplicate': 1})
+        self.assertFalse(drain_registrations())
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.current_participants, 5)
+        self.assertEqual(EventRegistration.objects.filter(event=self.event).count(), 5)
+        # Кожен автор заявки отримує лист з результатом
+        self.assertEqual(EmailOutbox.objects.count(), 8)
+        self.assertEqual(
+            sorted(EmailOutbox.objects.values_list('recipients', flat=True).distinct().order_by()),
+            sorted([f'user{number}@example.com'] for number in range(7)),
+        )
+
+    def test_non_positive_limit_means_unlimited_in_both_paths(self):
+        for limit in (None, 0, -1):
+            with self.subTest(max_participants=limit):
+                Event.objects.filter(pk=self.event.pk).update(max_participants=limit, current_participants=0)
+                EventRegistration.objects.all().delete()
+                RegistrationIntake.objects.all().delete()
+                cache.clear()
+                self.event.refresh_from_db()
+                self.assertFalse(self.event.has_capacity_limit)
+
+                # Синхронна реєстрація (reserve_spot) і черга дають однаковий результат
+                for number in range(3):
+                    EventRegistration.register(self.event, name='Учасник', email=f'sync{number}@example.com',
+                                               phone='+380501234567')
+                for number in range(3):
+                    self.apply(number)
+                self.assertEqual(drain_registrations(), {'registered': 3})
+                self.event.refresh_from_db()
+                self.assertEqual(self.event.current_participants, 6)
+                self.assertFalse(self.event.is_full)
+                self.assertIsNone(self.event.available_spots)
+
+    def test_closed_event_rejects_queued_applications(self):
+        self.apply(1)
+        Event.objects.filter(pk=self.event.pk).update(status='cancelled')
+        self.assertEqual(drain_registrations(), {'rejected': 1})
+        self.assertFalse(EventRegistration.objects.exists())
+
+
+@override_settings(**ISOLATED_SETTINGS)
+class RegistrationAdminTests(TestCase):
+    def test_bulk_delete_recounts_participants(self):
+        start = timezone.now() + timedelta(days=7)
+        event = create_event(
+            EventCategory.objects.create(name='Веб-розробка', slug='web-development'),
+            start_date=start, end_date=start + timedelta(hours=1),
+        )
+        registrations = [
+            EventRegistration.register(event, name=f'Учасник {number}', email=f'user{number}@example.com',
+                                       phone='+380501234567')
+            for number in range(3)
+        ]
+        event.refresh_from_db()
+        self.assertEqual(event.current_participants, 3)
+
+        admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(admin)
+        response = self.client.post(reverse('admin:events_eventregistration_changelist'), {
+            'action': 'delete_selected', 'post': 'yes',
+            helpers.ACTION_CHECKBOX_NAME: [registration.pk for registration in registrations[:2]],
+        })
+
+        self.assertEqual(response.status_code, 302)
+        event.refresh_from_db()
+        self.assertEqual(event.current_participants, 1)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'SQLite серіалізує записи глобальним локом')
+@override_settings(**ISOLATED_SETTINGS)
+class ConcurrentRegistrationTests(TransactionTestCase):
+    """Одночасні реєстрації з окремих з'єднань: без переповнення та втрачених інкрементів"""
+
+    def test_no_overbooking(self):
+        capacity, threads_count, duplicates = 10, 20, 3
+        start = timezone.now() + timedelta(days=7)
+        event = create_event(
+            EventCategory.objects.create(name='Стрес-тест', slug='stress-test'),
+            start_date=start, end_date=start + timedelta(hours=1), max_participants=capacity,
+        )
+        emails = [f'user{number}@example.com' for number in range(threads_count - duplicates)]
+        emails += emails[:duplicates]
+        barrier = threading.Barrier(len(emails))
+        outcomes = []
+
+        def worker(email):
+            barrier.wait()
+            try:
+                EventRegistration.register(event, name='Учасник', email=email, phone='+380501234567')
+                outcomes.append('registered')
+            except EventFullError:
+                outcomes.append('full')
+            except AlreadyRegisteredError:
+                outcomes.append('duplicate')
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(email,)) for email in emails]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        event.refresh_from_db()
+        registrations = EventRegistration.objects.filter(event=event).count()
+        self.assertEqual(len(outcomes), len(emails))
+        self.assertEqual(registrations, capacity)
+        self.assertEqual(event.current_participants, registrations)
+        self.assertEqual(outcomes.count('registered'), registrations)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'Плани запитів перевіряються лише на PostgreSQL')
+class EventSortPlanTests(TestCase):
+    def setUp(self):
+        with connection.cursor() as cursor:
+            # SET LOCAL діє до кінця транзакції тесту
+            for setting in ('enable_seqscan', 'enable_bitmapscan', 'enable_sort'):
+                cursor.execute(f'SET LOCAL {setting} = off')
+        self.event = create_event(EventCategory.objects.create(name='Plan check', slug='plan-check'))
+
+    def test_every_sort_uses_an_index(self):
+        for sort, (_, ordering) in SORTS.items():
+            paginator = KeysetPaginator(filter_events({}), PER_PAGE, ordering)
+            values = paginator.decode_cursor(paginator.encode_cursor(1, self.event))[1]
+            queries = {
+                'first': paginator.seek_queryset(),
+                'after': paginator.seek_queryset(values),
+                'before': paginator.seek_queryset(values, reverse=True),
+            }
+            for name, queryset in queries.items():
+                with self.subTest(sort=sort, page=name):
+                    plan = json.loads(queryset[:PER_PAGE + 1].explain(format='json'))[0]['Plan']
+                    self.assertEqual([node['Node Type'] for node in walk_plan(plan) if is_bad_node(node)], [])
+
+
+def walk_plan(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from walk_plan(child)
+
+
+def is_bad_node(node):
+    if node['Node Type'] == 'Seq Scan':
+        return node.get('Relation Name') == Event._meta.db_table
+    return node['Node Type'] in BAD_PLAN_NODES
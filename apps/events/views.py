@@ -1,55 +1,78 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
 from django.contrib import messages
-from django.http import JsonResponse
-from .models import Event, EventCategory, EventRegistration
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.utils.cache import patch_vary_headers
+from apps.core.conditional import build_etag, conditional_page
+from .fragments import MODES as FRAGMENT_MODES, get_fragment
+from .intake import clean_intake_data, enqueue_registration, get_registration_target
+from .listing import PER_PAGE, SORTS, InvalidSort, get_filters, get_sort, page_query, paginate_events
+from .models import AlreadyRegisteredError, Event, EventCategory, EventFullError, EventRegistration
+from .statuses import start_status_timer
 
 
+def events_state(request):
+    """
+    Один агрегатний запит на запит: кількість, останнє оновлення та зайняті місця
+    опублікованих подій (місця бронюються UPDATE без зміни updated_at)
+    """
+    # Таймер статусів процесу (EVENTS_STATUS_MODE=thread) стартує з першим запитом до подій
+    start_status_timer()
+    if not hasattr(request, '_events_state'):
+        state = Event.objects.filter(is_published=True).aggregate(
+            count=Count('id'), updated=Max('updated_at'), participants=Sum('current_participants'),
+        )
+        # Відкритість реєстрації залежить від часу - валідатори живуть не довше хвилини
+        state['minute'] = timezone.now().replace(second=0, microsecond=0)
+        request._events_state = state
+    return request._events_state
+
+
+def events_etag(request, *args, **kwargs):
+    state = events_state(request)
+    return build_etag(request, 'events', state['count'], state['updated'], state['participants'], state['minute'])
+
+
+def events_last_modified(request, *args, **kwargs):
+    state = events_state(request)
+    return max(filter(None, [state['updated'], state['minute']]))
+
+
+@conditional_page(etag_func=events_etag, last_modified_func=events_last_modified)
 def events_list(request):
     """Список подій з фільтрацією"""
+    filters = get_filters(request.GET)
     try:
-        events = Event.objects.filter(is_published=True).select_related('category')
-        
-        # Фільтри
-        category_slug = request.GET.get('category')
-        event_type = request.GET.get('type')
-        status = request.GET.get('status')
-        
-        if category_slug:
-            events = events.filter(category__slug=category_slug)
-        
-        if event_type:
-            events = events.filter(event_type=event_type)
-        
-        if status:
-            events = events.filter(status=status)
-        
-        # Сортування
-        sort_by = request.GET.get('sort', '-start_date')
-        events = events.order_by(sort_by)
-        
-        # Пагінація
-        paginator = Paginator(events, 6)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        sort_by = get_sort(request.GET)
+    except InvalidSort:
+        return HttpResponseBadRequest('Невідоме сортування')
+    try:
+        # Keyset-пагінація: ?after=/?before= курсори замість ?page=N з OFFSET
+        page_obj = paginate_events(filters, sort_by, after=request.GET.get('after'),
+                                   before=request.GET.get('before'))
         
         # Категорії для фільтрів
         categories = EventCategory.objects.all()
     except Exception:
         # Fallback якщо таблиці не існують
-        from django.core.paginator import Paginator
-        paginator = Paginator([], 6)
+        paginator = Paginator([], PER_PAGE)
         page_obj = paginator.get_page(1)
         categories = []
     
     context = {
         'page_obj': page_obj,
         'categories': categories,
-        'current_category': category_slug,
-        'current_type': event_type,
-        'current_status': status,
+        'current_category': filters.get('category'),
+        'current_type': filters.get('type'),
+        'current_status': filters.get('status'),
+        'has_filters': bool(filters),
         'current_sort': sort_by,
+        'sort_options': [(sort, label) for sort, (label, _) in SORTS.items()],
+        'previous_query': page_query(request.GET, 'before', getattr(page_obj, 'previous_cursor', None)),
+        'next_query': page_query(request.GET, 'after', getattr(page_obj, 'next_cursor', None)),
         'page_title': 'Події та акції | PrometeyLabs',
         'meta_description': 'Актуальні вебінари, курси, знижки та події від PrometeyLabs. Реєструйтесь на безкоштовні вебінари та отримуйте знижки на курси програмування.',
         'og_title': 'Події PrometeyLabs - Вебінари, курси, знижки',
@@ -58,6 +81,7 @@ def events_list(request):
     return render(request, 'pages/events.html', context)
 
 
+@conditional_page(etag_func=events_etag, last_modified_func=events_last_modified)
 def event_detail(request, slug):
     """Детальна сторінка події"""
     try:
@@ -105,6 +129,9 @@ def event_detail(request, slug):
 
 def event_registration(request, event_id):
     """Реєстрація на подію"""
+    if request.method == 'POST' and getattr(settings, 'EVENTS_REGISTRATION_QUEUE', False):
+        return queue_event_registration(request, event_id)
+
     if request.method == 'POST':
         try:
             event = get_object_or_404(
@@ -125,93 +152,80 @@ def event_registration(request, event_id):
             messages.error(request, 'На жаль, всі місця на цю подію вже зайняті.')
             return redirect('event_detail', slug=event.slug)
         
-        # Перевіряємо чи користувач вже реєструвався
-        try:
-            if EventRegistration.objects.filter(event=event, email=request.POST.get('email')).exists():
-                messages.warning(request, 'Ви вже зареєстровані на цю подію.')
-                return redirect('event_detail', slug=event.slug)
-        except Exception:
-            # Якщо таблиця не існує, просто продовжуємо
-            pass
-        
-        # Створюємо реєстрацію
+        # Створюємо реєстрацію: місце резервується атомарно, дублікат email
+        # відсікається unique_together на рівні БД
         try:
-            registration = EventRegistration.objects.create(
-                event=event,
+            EventRegistration.register(
+                event,
                 name=request.POST.get('name'),
                 email=request.POST.get('email'),
                 phone=request.POST.get('phone'),
                 company=request.POST.get('company', ''),
                 message=request.POST.get('message', '')
             )
-            
-            messages.success(request, f'Ви успішно зареєструвалися на подію "{event.title}"!')
-            return redirect('event_detail', slug=event.slug)
-            
-        except Exception as e:
+        except EventFullError:
+            messages.error(request, 'На жаль, всі місця на цю подію вже зайняті.')
+        except AlreadyRegisteredError:
+            messages.warning(request, 'Ви вже зареєстровані на цю подію.')
+        except Exception:
             messages.error(request, 'Помилка при реєстрації. Спробуйте ще раз.')
-            return redirect('event_detail', slug=event.slug)
+        else:
+            messages.success(request, f'Ви успішно зареєструвалися на подію "{event.title}"!')
+        return redirect('event_detail', slug=event.slug)
     
     return redirect('events_list')
 
 
+def queue_event_registration(request, event_id):
+    """Прийом заявки в чергу: валідація та один INSERT, реєстрацію виконує drain_registration_queue"""
+    try:
+        target = get_registration_target(event_id)
+    except Exception:
+        target = None
+    if target is None:
+        messages.error(request, 'Подію не знайдено.')
+        return redirect('events')
+
+    if not target['is_open']:
+        messages.error(request, 'Реєстрація на цю подію закрита.')
+    elif target['is_full']:
+        messages.error(request, 'На жаль, всі місця на цю подію вже зайняті.')
+    else:
+        fields, error = clean_intake_data(request.POST)
+        if error:
+            messages.error(request, error)
+        else:
+            try:
+                enqueue_registration(event_id, fields)
+                messages.success(request, 'Заявку прийнято! Результат реєстрації надійде на email.')
+            except Exception:
+                messages.error(request, 'Помилка при реєстрації. Спробуйте ще раз.')
+    return redirect('event_detail', slug=target['slug'])
+
+
 def events_ajax_filter(request):
-    """AJAX фільтрація подій"""
-    if request.is_ajax():
-        try:
-            events = Event.objects.filter(is_published=True).select_related('category')
-        except Exception:
-            return JsonResponse({'error': 'Database not available'})
-        
-        # Застосовуємо фільтри
-        category_slug = request.GET.get('category')
-        event_type = request.GET.get('type')
-        status = request.GET.get('status')
-        
-        if category_slug:
-            events = events.filter(category__slug=category_slug)
-        
-        if event_type:
-            events = events.filter(event_type=event_type)
-        
-        if status:
-            events = events.filter(status=status)
-        
-        # Сортування
-        sort_by = request.GET.get('sort', '-start_date')
-        events = events.order_by(sort_by)
-        
-        # Пагінація
-        paginator = Paginator(events, 6)
-        page_number = request.GET.get('page', 1)
-        page_obj = paginator.get_page(page_number)
-        
-        # Формуємо HTML для подій
-        events_html = []
-        for event in page_obj:
-            events_html.append({
-                'id': event.id,
-                'title': event.title,
-                'excerpt': event.excerpt,
-                'start_date': event.start_date.strftime('%d.%m.%Y %H:%M'),
-                'category_name': event.category.name,
-                'category_color': event.category.color,
-                'event_type': event.get_event_type_display(),
-                'price': str(event.price) if event.price else 'Безкоштовно',
-                'is_online': event.is_online,
-                'url': event.get_absolute_url(),
-                'image_url': event.image.url if event.image else '',
-                'is_featured': event.is_featured,
-                'is_registration_open': event.is_registration_open,
-                'available_spots': event.available_spots,
-            })
-        
-        return JsonResponse({
-            'events': events_html,
-            'has_next': page_obj.has_next(),
-            'has_previous': page_obj.has_previous(),
-            'current_page': page_obj.number,
-            'total_pages': paginator.num_pages,
-        })
-    
-    return JsonResponse({'error': 'Invalid request'}) 
\ No newline at end of file
+    """
+    AJAX фільтрація подій: готові HTML-картки й пагінація (або ?format=json - компактні
+    дані) з кешу фрагментів apps.events.fragments
+    """
+    if request.headers.get('x-requested-with') != 'XMLHttpRequest':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    try:
+        get_sort(request.GET)
+    except InvalidSort:
+        return JsonResponse({'error': 'Unknown sort'}, status=400)
+    mode = request.GET.get('format', 'html')
+    start_status_timer()
+    if mode not in FRAGMENT_MODES:
+        return JsonResponse({'error': 'Unknown format'}, status=400)
+
+    try:
+        content, cache_status = get_fragment(request.GET, mode)
+    except Exception:
+        return JsonResponse({'error': 'Database not available'})
+
+    response = HttpResponse(content, content_type='application/json')
+    response['X-Fragment-Cache'] = cache_status
+    # Відповідь залежить від X-Requested-With - без Vary проксі віддав би її звичайному запиту
+    patch_vary_headers(response, ['X-Requested-With'])
+    return response
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.conf import settings
-from .models import PaymentLink, PaymentSettings
+from .models import MonobankWebhookEvent, PaymentLink, PaymentSettings
 
 
 @admin.register(PaymentSettings)
@@ -21,7 +21,10 @@ class PaymentLinkAdmin(admin.ModelAdmin):
     list_display = ('client_name', 'amount_usd', 'final_amount_uah', 'status', 'created_at', 'open_link_button', 'copy_link_button')
     list_filter = ('status', 'created_at')
     search_fields = ('client_name', 'client_email', 'unique_id')
-    readonly_fields = ('final_amount_uah', 'first_opened_at', 'expires_at', 'monobank_invoice_id', 'monobank_invoice_url', 'payment_processed_at')
+    readonly_fields = (
+        'final_amount_uah', 'first_opened_at', 'expires_at', 'monobank_invoice_id', 'monobank_invoice_url',
+        'monobank_invoice_amount_uah', 'monobank_invoice_expires_at', 'payment_processed_at',
+    )
 
     def get_client_facing_link(self, obj: PaymentLink) -> str:
         base_url = getattr(settings, 'SITE_URL', '').rstrip('/') or 'https://pay.prometeylabs.com'
@@ -37,3 +40,10 @@ class PaymentLinkAdmin(admin.ModelAdmin):
         return format_html('<input type="text" value="{}" readonly style="width:100%"/>', url)
     copy_link_button.short_description = 'Скопіювати'
 
+
+@admin.register(MonobankWebhookEvent)
+class MonobankWebhookEventAdmin(admin.ModelAdmin):
+    list_display = ('invoice_id', 'status', 'modified_date', 'reference', 'received_at')
+    list_filter = ('status', 'received_at')
+    search_fields = ('invoice_id', 'reference')
+    readonly_fields = ('invoice_id', 'status', 'modified_date', 'reference', 'received_at')
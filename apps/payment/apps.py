@@ -6,6 +6,13 @@ class PaymentConfig(AppConfig):
     verbose_name = 'Payment'
 
     def ready(self):
-        # Можна підключати сигнали за потреби
-        pass
+        # Кеш PaymentSettings з інвалідацією через post_save/post_delete
+        from apps.core.singletons import singleton_cache
+        from .models import PaymentSettings
+        singleton_cache(PaymentSettings)
+
+        # Звірка з Monobank і закриття прострочених посилань - таймер веб-процесу (режим 'thread')
+        from django.core.signals import request_started
+        from .reconcile import start_reconcile_timer
+        request_started.connect(start_reconcile_timer, dispatch_uid='payment:start_reconcile_timer')
 
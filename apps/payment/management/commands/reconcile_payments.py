@@ -0,0 +1,32 @@
+"""
+Django management команда - звірка платіжних посилань з Monobank
+
+Запитує статуси інвойсів PENDING посилань (якщо вебхук загубився), потім
+переводить прострочені посилання без інвойсу в EXPIRED. З --loop працює як воркер
+(режим PAYMENTS_RECONCILE_MODE=worker; у режимі thread те саме робить таймер веб-процесу).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.payment.reconcile import DEFAULT_BATCH_SIZE, DEFAULT_CONCURRENCY, DEFAULT_RATE, reconcile_payments
+
+
+class Command(BaseCommand):
+    help = 'Звіряє PENDING платіжні посилання з Monobank та закриває прострочені'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Посилань на сторінку')
+        parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Паралельних запитів')
+        parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='Максимум запитів до Monobank на секунду')
+        parser.add_argument('--loop', action='store_true', help='Працювати постійно')
+        parser.add_argument('--interval', type=float, default=60, help='Пауза між проходами, с')
+
+    def handle(self, *args, **options):
+        while True:
+            stats, expired = reconcile_payments(options['batch_size'], options['concurrency'], options['rate'])
+            summary = ', '.join(f'{key}: {value}' for key, value in sorted(stats.items())) or 'немає PENDING інвойсів'
+            self.stdout.write(f'⏰ Прострочено: {expired}; 🔄 звірка: {summary}')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
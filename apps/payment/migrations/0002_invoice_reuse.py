@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-17 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paymentlink',
+            name='monobank_invoice_amount_uah',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='paymentlink',
+            name='monobank_invoice_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-17 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0002_invoice_reuse'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonobankWebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('invoice_id', models.CharField(max_length=128)),
+                ('status', models.CharField(max_length=32)),
+                ('modified_date', models.CharField(blank=True, default='', max_length=64)),
+                ('reference', models.CharField(blank=True, default='', max_length=64)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Подія вебхука Monobank',
+                'verbose_name_plural': 'Події вебхука Monobank',
+                'ordering': ['-received_at'],
+                'constraints': [models.UniqueConstraint(fields=('invoice_id', 'status', 'modified_date'), name='payment_webhook_event_unique')],
+            },
+        ),
+    ]
@@ -48,6 +48,9 @@ class PaymentLink(models.Model):
 
     monobank_invoice_id = models.CharField(max_length=128, blank=True, default='')
     monobank_invoice_url = models.URLField(blank=True, default='')
+    # Сума та термін дії інвойсу - щоб повторно використати його замість створення нового
+    monobank_invoice_amount_uah = models.DecimalField(max_digits=14, decimal_places=2, blank=True, null=True)
+    monobank_invoice_expires_at = models.DateTimeField(blank=True, null=True)
     payment_processed_at = models.DateTimeField(blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -67,14 +70,56 @@ class PaymentLink(models.Model):
             self.final_amount_uah = (self.amount_usd * self.exchange_rate_usd_to_uah).quantize(Decimal('0.01'))
         super().save(*args, **kwargs)
 
-    def mark_first_open(self):
-        if not self.first_opened_at:
-            self.first_opened_at = timezone.now()
-            if self.duration_minutes and self.duration_minutes > 0:
-                self.expires_at = self.first_opened_at + timezone.timedelta(minutes=self.duration_minutes)
-            if self.status == self.Status.NEW:
-                self.status = self.Status.PENDING
-            self.save(update_fields=['first_opened_at', 'expires_at', 'status'])
+    def mark_first_open(self) -> bool:
+        """
+        Фіксує перше відкриття одним UPDATE ... WHERE first_opened_at IS NULL.
+        Повторні відкриття (і паралельні вкладки) нічого не пишуть. True - якщо відкриття перше
+        """
+        if self.first_opened_at:
+            return False
+        now = timezone.now()
+        expires_at = None
+        if self.duration_minutes and self.duration_minutes > 0:
+            expires_at = now + timezone.timedelta(minutes=self.duration_minutes)
+        updated = PaymentLink.objects.filter(pk=self.pk, first_opened_at__isnull=True).update(
+            first_opened_at=now,
+            expires_at=expires_at,
+            status=models.Case(
+                models.When(status=self.Status.NEW, then=models.Value(self.Status.PENDING)),
+                default=models.F('status'),
+            ),
+            updated_at=now,
+        )
+        if not updated:
+            # Інший запит встиг першим - беремо його значення
+            self.refresh_from_db(fields=['first_opened_at', 'expires_at', 'status', 'updated_at'])
+            return False
+        self.first_opened_at = now
+        self.expires_at = expires_at
+        self.updated_at = now
+        if self.status == self.Status.NEW:
+            self.status = self.Status.PENDING
+        return True
+
+    def get_reusable_invoice_url(self, min_validity_seconds: int = 60) -> str:
+        """URL чинного інвойсу Monobank на поточну суму або '' (тоді потрібен новий)"""
+        if not self.monobank_invoice_id or not self.monobank_invoice_url:
+            return ''
+        if self.monobank_invoice_amount_uah != self.final_amount_uah or not self.monobank_invoice_expires_at:
+            return ''
+        if self.monobank_invoice_expires_at - timezone.timedelta(seconds=min_validity_seconds) <= timezone.now():
+            return ''
+        return self.monobank_invoice_url
+
+    def set_invoice(self, invoice_id: str, page_url: str, validity_seconds: int):
+        self.monobank_invoice_id = invoice_id
+        self.monobank_invoice_url = page_url
+        self.monobank_invoice_amount_uah = self.final_amount_uah
+        self.monobank_invoice_expires_at = timezone.now() + timezone.timedelta(seconds=validity_seconds)
+        self.save(update_fields=[
+            'monobank_invoice_id', 'monobank_invoice_url',
+            'monobank_invoice_amount_uah', 'monobank_invoice_expires_at',
+        ])
 
     def is_expired(self) -> bool:
         if self.duration_minutes and self.expires_at:
@@ -90,3 +135,48 @@ class PaymentLink(models.Model):
         self.payment_processed_at = timezone.now()
         self.save(update_fields=['status', 'payment_processed_at'])
 
+    @classmethod
+    def transition(cls, reference, to_status, from_statuses, **extra) -> int:
+        """
+        Атомарна зміна статусу одним UPDATE ... WHERE status IN (...), без читання рядка.
+        Повертає кількість змінених рядків (0 - статус уже інший або посилання немає)
+        """
+        return cls.objects.filter(unique_id=reference, status__in=from_statuses).update(
+            status=to_status, updated_at=timezone.now(), **extra
+        )
+
+
+# Дозволені переходи статусу PaymentLink за статусом інвойсу Monobank
+PAID_FROM = [PaymentLink.Status.NEW, PaymentLink.Status.PENDING, PaymentLink.Status.EXPIRED, PaymentLink.Status.DEACTIVATED]
+EXPIRED_FROM = [PaymentLink.Status.NEW, PaymentLink.Status.PENDING]
+REVERSED_FROM = [PaymentLink.Status.NEW, PaymentLink.Status.PENDING, PaymentLink.Status.PAID]
+
+# Статус інвойсу Monobank -> (новий статус посилання, з яких статусів дозволено)
+INVOICE_STATUS_TRANSITIONS = {
+    'success': (PaymentLink.Status.PAID, PAID_FROM),
+    'expired': (PaymentLink.Status.EXPIRED, EXPIRED_FROM),
+    'reversed': (PaymentLink.Status.EXPIRED, REVERSED_FROM),
+}
+
+
+class MonobankWebhookEvent(models.Model):
+    """Оброблені доставки вебхука Monobank (дедуплікація повторів)"""
+    invoice_id = models.CharField(max_length=128)
+    status = models.CharField(max_length=32)
+    modified_date = models.CharField(max_length=64, blank=True, default='')
+    reference = models.CharField(max_length=64, blank=True, default='')
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-received_at']
+        verbose_name = 'Подія вебхука Monobank'
+        verbose_name_plural = 'Події вебхука Monobank'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['invoice_id', 'status', 'modified_date'], name='payment_webhook_event_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.invoice_id} — {self.status} ({self.modified_date})'
+
@@ -1,21 +1,140 @@
 import os
 import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from typing import Optional, Tuple
 
 import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger('payment')
 
+# connect / read: довгий read лише для створення інвойсу, з'єднання - швидко або ніяк
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class MonobankUnavailable(Exception):
+    """Monobank API тимчасово недоступний (circuit breaker відкритий або немає вільних слотів)"""
+
+
+class CircuitBreaker:
+    """
+    Після failure_threshold помилок поспіль запити не йдуть у мережу reset_timeout секунд,
+    далі один пробний запит (half-open) вирішує - закривати чи знову відкривати
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        with self.lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                if self.opened_at is None:
+                    logger.warning('Monobank circuit breaker opened after %s failures', self.failures)
+                self.opened_at = time.monotonic()
+
+
+class MonobankClient:
+    """Пул keep-alive з'єднань до Monobank API на процес з обмеженням паралельних запитів"""
+
+    def __init__(self, base_url, max_concurrency=8, acquire_timeout=2.0, breaker=None):
+        self.base_url = base_url.rstrip('/')
+        self.acquire_timeout = acquire_timeout
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, method, path, headers=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+        if not self.slots.acquire(timeout=self.acquire_timeout):
+            raise MonobankUnavailable('too many concurrent requests')
+        try:
+            if not self.breaker.allow():
+                raise MonobankUnavailable('circuit breaker is open')
+            try:
+                resp = self.session.request(method, f'{self.base_url}{path}', headers=headers,
+                                            timeout=timeout, **kwargs)
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            # 4xx - помилка запиту, а не недоступність сервісу
+            if resp.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            resp.raise_for_status()
+            return resp
+        finally:
+            self.slots.release()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_monobank_client(base_url=None) -> MonobankClient:
+    """Спільний клієнт процесу (окремий після fork, щоб не ділити сокети між воркерами)"""
+    base_url = base_url or getattr(settings, 'MONOBANK_API_URL', MonobankAcquiringService.BASE_URL)
+    key = (os.getpid(), base_url)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = MonobankClient(
+                    base_url,
+                    max_concurrency=getattr(settings, 'MONOBANK_MAX_CONCURRENCY', 8),
+                )
+                _clients[key] = client
+    return client
+
 
 class MonobankAcquiringService:
     BASE_URL = 'https://api.monobank.ua'
 
-    def __init__(self, token: Optional[str] = None, site_url: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, site_url: Optional[str] = None,
+                 client: Optional[MonobankClient] = None):
         self.token = token or os.getenv('MONOBANK_TOKEN') or getattr(settings, 'MONOBANK_TOKEN', None)
         self.site_url = (site_url or os.getenv('SITE_URL') or getattr(settings, 'SITE_URL', '')).rstrip('/')
+        self.client = client or get_monobank_client()
         if not self.token:
             logger.error('Monobank token is not configured')
 
@@ -43,24 +162,62 @@ class MonobankAcquiringService:
                 'paymentType': 'debit',
             }
 
-            url = f'{self.BASE_URL}/api/merchant/invoice/create'
-            resp = requests.post(url, headers=self._headers(), data=json.dumps(payload), timeout=20)
-            resp.raise_for_status()
+            resp = self.client.request('POST', '/api/merchant/invoice/create',
+                                       headers=self._headers(), data=json.dumps(payload))
             data = resp.json()
             page_url = data.get('pageUrl')
             invoice_id = data.get('invoiceId')
             return invoice_id, page_url
+        except MonobankUnavailable as e:
+            logger.warning('Monobank unavailable, invoice not created: %s', e)
+            return None, None
         except Exception as e:
             logger.exception('Failed to create monobank invoice: %s', e)
             return None, None
 
     def get_invoice_status(self, invoice_id: str) -> Optional[dict]:
         try:
-            url = f'{self.BASE_URL}/api/merchant/invoice/status?invoiceId={invoice_id}'
-            resp = requests.get(url, headers=self._headers(), timeout=15)
-            resp.raise_for_status()
+            resp = self.client.request('GET', '/api/merchant/invoice/status',
+                                       headers=self._headers(), params={'invoiceId': invoice_id})
             return resp.json()
+        except MonobankUnavailable as e:
+            logger.warning('Monobank unavailable, status not fetched: %s', e)
+            return None
         except Exception as e:
             logger.exception('Failed to fetch monobank invoice status: %s', e)
             return None
 
+
+_executor = None
+
+
+def get_monobank_executor() -> ThreadPoolExecutor:
+    """Окремий пул потоків під Monobank: розмір як у пулу з'єднань, не залежить від кількості CPU"""
+    global _executor
+    if _executor is None:
+        with _clients_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'MONOBANK_MAX_CONCURRENCY', 8),
+                    thread_name_prefix='monobank',
+                )
+    return _executor
+
+
+class AsyncMonobankAcquiringService(MonobankAcquiringService):
+    """
+    Async-варіант для ASGI: HTTP-виклики виконуються в окремому пулі потоків,
+    тож event loop не блокується, а пул з'єднань та circuit breaker спільні з sync-версією
+    """
+
+    async def create_invoice(self, *args, **kwargs):
+        sync_create = super().create_invoice
+        return await sync_to_async(sync_create, thread_sensitive=False, executor=get_monobank_executor())(
+            *args, **kwargs
+        )
+
+    async def get_invoice_status(self, invoice_id: str):
+        sync_status = super().get_invoice_status
+        return await sync_to_async(sync_status, thread_sensitive=False, executor=get_monobank_executor())(
+            invoice_id
+        )
@@ -0,0 +1,191 @@
+"""
+Звірка платіжних посилань з Monobank (на випадок втрачених вебхуків)
+
+- expire_overdue_links: прострочені посилання без інвойсу переводяться в EXPIRED
+  одним UPDATE (payment_page більше не пише в БД на шляху читання); посилання
+  з інвойсом закриває лише звірка - за статусом інвойсу, зокрема 'expired';
+- reconcile_pending_links: PENDING посилання з інвойсом обходяться keyset-пагінацією,
+  статуси інвойсів запитуються паралельно (обмежений async-пул + rate limit),
+  а переходи застосовуються пакетно - по одному UPDATE на цільовий статус.
+
+Режим задається settings.PAYMENTS_RECONCILE_MODE:
+  'thread' - таймер у кожному веб-процесі (за замовчуванням, стартує з першим запитом);
+             прохід раз на RECONCILE_INTERVAL робить лише процес, що взяв замок у кеші
+  'worker' - лише python manage.py reconcile_payments (cron або --loop)
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.core.cache import AppCache
+
+from .models import INVOICE_STATUS_TRANSITIONS, PaymentLink
+from .monobank_service import AsyncMonobankAcquiringService
+
+logger = logging.getLogger('payment')
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_CONCURRENCY = 5
+DEFAULT_RATE = 10  # запитів на секунду
+RECONCILE_INTERVAL = 60  # секунд між проходами таймера
+LOCK_CACHE_KEY = 'reconcile:lock'
+
+payment_cache = AppCache('payment')
+
+
+def get_reconcile_mode():
+    return getattr(settings, 'PAYMENTS_RECONCILE_MODE', 'thread')
+
+
+def expire_overdue_links(now=None) -> int:
+    """
+    NEW/PENDING посилання без інвойсу з минулим expires_at -> EXPIRED (один UPDATE).
+    З інвойсом - ні: оплату з загубленим вебхуком знайде лише звірка PENDING
+    """
+    now = now or timezone.now()
+    return PaymentLink.objects.filter(
+        status__in=[PaymentLink.Status.NEW, PaymentLink.Status.PENDING],
+        duration_minutes__gt=0,
+        expires_at__lt=now,
+        monobank_invoice_id='',
+    ).update(status=PaymentLink.Status.EXPIRED, updated_at=now)
+
+
+def iter_pending_batches(batch_size=DEFAULT_BATCH_SIZE):
+    """Пачки (id, unique_id, monobank_invoice_id) PENDING посилань - keyset по id замість OFFSET"""
+    last_id = 0
+    while True:
+        batch = list(
+            PaymentLink.objects.filter(status=PaymentLink.Status.PENDING, id__gt=last_id)
+            .exclude(monobank_invoice_id='')
+            .order_by('id')
+            .values_list('id', 'unique_id', 'monobank_invoice_id')[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1][0]
+
+
+class AsyncRateLimiter:
+    """Рівномірний rate limit: не частіше ніж rate викликів на секунду"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        loop = asyncio.get_running_loop()
+        async with self.lock:
+            now = loop.time()
+            delay = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def fetch_invoice_statuses(invoice_ids, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, service=None):
+    """{invoice_id: status} для інвойсів, які вдалося запитати"""
+    service = service or AsyncMonobankAcquiringService()
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = AsyncRateLimiter(rate)
+
+    async def fetch(invoice_id):
+        async with semaphore:
+            await limiter.wait()
+            data = await service.get_invoice_status(invoice_id)
+            return invoice_id, (data or {}).get('status')
+
+    results = await asyncio.gather(*(fetch(invoice_id) for invoice_id in invoice_ids))
+    return {invoice_id: status for invoice_id, status in results if status}
+
+
+def apply_invoice_statuses(links, statuses) -> Counter:
+    """Пакетні переходи: один UPDATE ... WHERE status IN (...) на кожен цільовий статус"""
+    groups = defaultdict(list)
+    for _, unique_id, invoice_id in links:
+        status = statuses.get(invoice_id)
+        if status in INVOICE_STATUS_TRANSITIONS:
+            groups[status].append(unique_id)
+
+    now = timezone.now()
+    applied = Counter()
+    for status, unique_ids in groups.items():
+        to_status, from_statuses = INVOICE_STATUS_TRANSITIONS[status]
+        extra = {'payment_processed_at': now} if to_status == PaymentLink.Status.PAID else {}
+        applied[status] = PaymentLink.objects.filter(unique_id__in=unique_ids, status__in=from_statuses).update(
+            status=to_status, updated_at=now, **extra
+        )
+    return applied
+
+
+def reconcile_pending_links(batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                            service=None) -> Counter:
+    """Звіряє всі PENDING посилання з інвойсом. Повертає лічильники (checked, success, expired, ...)"""
+    stats = Counter()
+    for links in iter_pending_batches(batch_size):
+        invoice_ids = [invoice_id for _, _, invoice_id in links]
+        # HTTP - в event loop, БД - лише тут, у синхронному коді між пачками
+        statuses = asyncio.run(fetch_invoice_statuses(invoice_ids, concurrency, rate, service))
+        stats['checked'] += len(links)
+        stats['unavailable'] += len(links) - len(statuses)
+        stats.update(apply_invoice_statuses(links, statuses))
+    if stats['checked']:
+        logger.info('Payment reconciliation: %s', dict(stats))
+    return stats
+
+
+def reconcile_payments(batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE):
+    """
+    Повний прохід: (лічильники звірки, кількість прострочених).
+    Спершу звірка - оплачене посилання не повинно встигнути стати EXPIRED
+    """
+    stats = reconcile_pending_links(batch_size, concurrency, rate)
+    return stats, expire_overdue_links()
+
+
+class ReconcileTimer(threading.Thread):
+    """Таймер у межах процесу: раз на RECONCILE_INTERVAL пробує взяти замок і зробити прохід"""
+
+    def __init__(self):
+        super().__init__(name='payment-reconcile-timer', daemon=True)
+
+    def run(self):
+        while True:
+            try:
+                # Замок живе весь інтервал: інші воркери не дублюють запити до Monobank
+                if payment_cache.add(LOCK_CACHE_KEY, os.getpid(), RECONCILE_INTERVAL):
+                    reconcile_payments()
+            except Exception as e:
+                logger.error(f"Payment reconcile timer error: {e}")
+            finally:
+                close_old_connections()
+            time.sleep(RECONCILE_INTERVAL)
+
+
+_timer = None
+_timer_pid = None
+_timer_lock = threading.Lock()
+
+
+def start_reconcile_timer(**kwargs):
+    """Запускає таймер цього процесу (режим 'thread'); підписаний на request_started"""
+    global _timer, _timer_pid
+    if _timer_pid == os.getpid() and _timer.is_alive():
+        return
+    if get_reconcile_mode() != 'thread':
+        return
+    with _timer_lock:
+        # Після fork потоки батьківського процесу не успадковуються
+        if _timer is None or _timer_pid != os.getpid() or not _timer.is_alive():
+            _timer = ReconcileTimer()
+            _timer_pid = os.getpid()
+            _timer.start()
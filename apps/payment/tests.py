@@ -0,0 +1,205 @@
+"""
+Тести платежів: кількість запитів payment_page, єдиний запис першого відкриття,
+прострочення без запису на шляху читання та його збереження звіркою, повторні
+доставки вебхука Monobank і circuit breaker клієнта
+"""
+import json
+import random
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.singletons import singleton_cache
+from apps.core.testing import ISOLATED_SETTINGS
+
+from . import reconcile
+from .models import MonobankWebhookEvent, PaymentLink, PaymentSettings
+from .monobank_service import CircuitBreaker, MonobankAcquiringService, MonobankClient
+
+
+def writes(captured):
+    return [query['sql'] for query in captured.captured_queries if query['sql'].startswith(('UPDATE', 'INSERT', 'DELETE'))]
+
+
+@override_settings(**ISOLATED_SETTINGS)
+class PaymentPageQueriesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        singleton_cache(PaymentSettings).invalidate()
+        PaymentSettings.objects.create(title='Оплата послуг')
+        self.link = PaymentLink.objects.create(
+            client_name='Клієнт', amount_usd=Decimal('10.00'), duration_minutes=30,
+        )
+        self.url = reverse('payment:payment_page', kwargs={'unique_id': self.link.unique_id})
+
+    def test_first_view_then_repeat_views(self):
+        # Перше відкриття: SELECT посилання, UPDATE першого відкриття, SELECT налаштувань
+        with self.assertNumQueries(3) as first:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        # Повторні перегляди: лише SELECT посилання, сторінка з кешу
+        repeats = []
+        for _ in range(3):
+            with self.assertNumQueries(1) as captured:
+                response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+            repeats.extend(writes(captured))
+
+        self.assertEqual(repeats, [])
+        first_writes = writes(first)
+        self.assertEqual(len(first_writes), 1)
+        self.assertIn('first_opened_at', first_writes[0])
+
+        self.link.refresh_from_db()
+        self.assertEqual(self.link.status, PaymentLink.Status.PENDING)
+        self.assertIsNotNone(self.link.first_opened_at)
+        self.assertEqual(self.link.expires_at, self.link.first_opened_at + timedelta(minutes=30))
+
+    def test_csrf_token_is_per_visitor(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertNotContains(response, 'csrfplaceholder')
+
+    def test_overdue_link_is_rendered_expired_without_write(self):
+        opened_at = timezone.now() - timedelta(hours=1)
+        PaymentLink.objects.filter(pk=self.link.pk).update(
+            status=PaymentLink.Status.PENDING, first_opened_at=opened_at, expires_at=opened_at + timedelta(minutes=30),
+        )
+        with self.assertNumQueries(1) as captured:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'payment/link_inactive.html')
+        self.assertEqual(writes(captured), [])
+        self.link.refresh_from_db()
+        self.assertEqual(self.link.status, PaymentLink.Status.PENDING)
+
+
+class FakeMonobankService:
+    def __init__(self, statuses):
+        self.statuses = statuses
+
+    async def get_invoice_status(self, invoice_id):
+        return {'status': self.statuses[invoice_id]}
+
+
+@override_settings(**ISOLATED_SETTINGS)
+class ReconcilePaymentsTests(TestCase):
+    def create_overdue_link(self, **fields):
+        opened_at = timezone.now() - timedelta(hours=1)
+        return PaymentLink.objects.create(
+            client_name='Клієнт', amount_usd=Decimal('10.00'), duration_minutes=30, status=PaymentLink.Status.PENDING,
+            first_opened_at=opened_at, expires_at=opened_at + timedelta(minutes=30), **fields,
+        )
+
+    def test_overdue_links_are_persisted_as_expired(self):
+        overdue = self.create_overdue_link()
+        paid = self.create_overdue_link(monobank_invoice_id='inv-paid')
+        service = FakeMonobankService({'inv-paid': 'success'})
+
+        with mock.patch.object(reconcile, 'AsyncMonobankAcquiringService', return_value=service):
+            stats, expired = reconcile.reconcile_payments()
+
+        self.assertEqual(expired, 1)
+        self.assertEqual(stats['success'], 1)
+        overdue.refresh_from_db()
+        paid.refresh_from_db()
+        self.assertEqual(overdue.status, PaymentLink.Status.EXPIRED)
+        # Оплата з загубленим вебхуком не стає EXPIRED, хоч посилання й прострочене
+        self.assertEqual(paid.status, PaymentLink.Status.PAID)
+
+    def test_timer_starts_only_in_thread_mode(self):
+        with mock.patch.object(reconcile, 'ReconcileTimer') as timer, mock.patch.object(reconcile, '_timer', None), \
+                mock.patch.object(reconcile, '_timer_pid', None):
+            reconcile.start_reconcile_timer()
+            timer.assert_not_called()
+            with override_settings(PAYMENTS_RECONCILE_MODE='thread'):
+                reconcile.start_reconcile_timer()
+            timer.return_value.start.assert_called_once_with()
+
+
+@override_settings(**ISOLATED_SETTINGS)
+class MonobankWebhookTests(TestCase):
+    def setUp(self):
+        self.url = reverse('payment:monobank_webhook')
+
+    def deliver(self, payload):
+        return self.client.post(self.url, json.dumps(payload), content_type='application/json')
+
+    def test_replayed_deliveries_are_processed_once(self):
+        links = [
+            PaymentLink.objects.create(client_name='Клієнт', amount_usd=Decimal('10.00'),
+                                       status=PaymentLink.Status.PENDING)
+            for _ in range(5)
+        ]
+        base_time = timezone.now()
+        events = [
+            {'invoiceId': f'inv-{number}', 'status': status, 'reference': str(link.unique_id),
+             'modifiedDate': (base_time + timedelta(seconds=offset)).isoformat()}
+            for number, link in enumerate(links)
+            for offset, status in enumerate(('processing', 'success'))
+        ]
+        # Monobank повторює доставку до отримання 200 - у довільному порядку
+        rng = random.Random(42)
+        deliveries = events + [rng.choice(events) for _ in range(30)]
+        rng.shuffle(deliveries)
+
+        duplicates = 0
+        for delivery in deliveries:
+            response = self.deliver(delivery)
+            self.assertEqual(response.status_code, 200)
+            duplicates += bool(response.json().get('duplicate'))
+
+        self.assertEqual(duplicates, len(deliveries) - len(events))
+        self.assertEqual(MonobankWebhookEvent.objects.count(), len(events))
+        self.assertEqual(PaymentLink.objects.filter(status=PaymentLink.Status.PAID).count(), len(links))
+
+    def test_bad_reference(self):
+        for reference in ('', 'not-a-uuid'):
+            with self.subTest(reference=reference):
+                response = self.deliver({'invoiceId': 'inv', 'status': 'success', 'reference': reference})
+                self.assertEqual(response.status_code, 400)
+
+    def test_unknown_reference_is_not_remembered(self):
+        payload = {'invoiceId': 'inv', 'status': 'success', 'reference': '00000000-0000-0000-0000-000000000000'}
+        self.assertEqual(self.deliver(payload).status_code, 400)
+        self.assertFalse(MonobankWebhookEvent.objects.exists())
+
+
+class CircuitBreakerTests(TestCase):
+    def test_opens_after_server_errors(self):
+        unavailable = requests.Response()
+        unavailable.status_code = 503
+        breaker = CircuitBreaker(failure_threshold=5, reset_timeout=60)
+        client = MonobankClient('http://monobank.test', breaker=breaker)
+        service = MonobankAcquiringService(token='test', site_url='http://localhost', client=client)
+
+        with mock.patch.object(client.session, 'request', return_value=unavailable) as request, \
+                self.assertLogs('payment', 'WARNING'):
+            for _ in range(20):
+                self.assertIsNone(service.get_invoice_status('inv'))
+
+        self.assertEqual(breaker.state, 'open')
+        # Після порогу запити відхиляються без мережі
+        self.assertEqual(request.call_count, 5)
+
+    def test_half_open_probe_closes_on_success(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        with mock.patch('apps.payment.monobank_service.time.monotonic', return_value=100.0) as monotonic:
+            with self.assertLogs('payment', 'WARNING'):
+                breaker.record_failure()
+                breaker.record_failure()
+            self.assertFalse(breaker.allow())
+
+            monotonic.return_value = 130.0
+            self.assertTrue(breaker.allow())
+            # Лише один пробний запит
+            self.assertFalse(breaker.allow())
+            breaker.record_success()
+            self.assertEqual(breaker.state, 'closed')
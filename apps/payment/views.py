@@ -1,43 +1,70 @@
 import json
+import uuid
+from decimal import Decimal
 from django.contrib.admin.views.decorators import staff_member_required
 from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.csrf import csrf_exempt
-from django.core.cache import cache
-
-from .models import PaymentLink, PaymentSettings
+from django.conf import settings
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.core.cache import AppCache
+from apps.core.mixins import CSRF_PLACEHOLDER
+from apps.core.singletons import singleton_cache
+
+from .models import EXPIRED_FROM, PAID_FROM, REVERSED_FROM, MonobankWebhookEvent, PaymentLink, PaymentSettings
 from .monobank_service import MonobankAcquiringService
 
 
 def get_payment_settings():
-    """Кешована функція для отримання PaymentSettings (оптимізація)"""
-    settings = cache.get('payment_settings')
-    if settings is None:
-        settings = PaymentSettings.objects.first()
-        # Кешуємо на 1 годину (settings рідко змінюються)
-        cache.set('payment_settings', settings, 3600)
-    return settings
+    """PaymentSettings з кешу singleton-моделей (L1 у процесі + спільний L2, скидається при збереженні)"""
+    return singleton_cache(PaymentSettings).get()
+
+
+payment_cache = AppCache('payment')
+PAYMENT_PAGE_CACHE_TIMEOUT = 3600
+
+
+def get_payment_page_cache_key(payment_link):
+    """Ключ залежить від updated_at та версії PaymentSettings: будь-яка зміна дає новий ключ"""
+    return ':'.join([
+        'page', getattr(settings, 'BUILD_HASH', 'dev'), str(payment_link.unique_id),
+        str(payment_link.updated_at.timestamp()), singleton_cache(PaymentSettings).get_version(),
+        translation.get_language() or settings.LANGUAGE_CODE,
+    ])
 
 
 def payment_page(request: HttpRequest, unique_id):
     payment_link = get_object_or_404(PaymentLink, unique_id=unique_id)
 
     # Перевірка статусів
-    if payment_link.status in [PaymentLink.Status.PAID, PaymentLink.Status.DEACTIVATED]:
+    if payment_link.status in [PaymentLink.Status.PAID, PaymentLink.Status.DEACTIVATED, PaymentLink.Status.EXPIRED]:
         return render(request, 'payment/link_inactive.html', {'payment_link': payment_link})
 
-    # Прострочення
+    # Пише в БД лише при першому відкритті (умовний UPDATE)
     payment_link.mark_first_open()
+
+    # Прострочення рахується при читанні; статус у БД оновлює reconcile_payments
     if payment_link.is_expired():
         payment_link.status = PaymentLink.Status.EXPIRED
-        payment_link.save(update_fields=['status'])
         return render(request, 'payment/link_inactive.html', {'payment_link': payment_link})
 
-    payment_settings = get_payment_settings()
-    return render(request, 'payment/payment_page.html', {
-        'payment_link': payment_link,
-        'payment_settings': payment_settings,
-    })
+    key = get_payment_page_cache_key(payment_link)
+    content = payment_cache.get(key)
+    if content is None:
+        content = render_to_string('payment/payment_page.html', {
+            'payment_link': payment_link,
+            'payment_settings': get_payment_settings(),
+            'csrf_token': CSRF_PLACEHOLDER,
+        }, request=request)
+        payment_cache.set(key, content, PAYMENT_PAGE_CACHE_TIMEOUT)
+
+    # CSRF токен унікальний для відвідувача, тому підставляємо його після кешу
+    return HttpResponse(content.replace(CSRF_PLACEHOLDER, get_token(request)))
 
 
 def create_invoice(request: HttpRequest, unique_id):
@@ -48,21 +75,25 @@ def create_invoice(request: HttpRequest, unique_id):
     if payment_link.status in [PaymentLink.Status.PAID, PaymentLink.Status.DEACTIVATED] or payment_link.is_expired():
         return render(request, 'payment/link_inactive.html', {'payment_link': payment_link})
 
+    # Повторний POST (оновлення сторінки, подвійний клік) - той самий чинний інвойс
+    reusable_url = payment_link.get_reusable_invoice_url()
+    if reusable_url:
+        return redirect(reusable_url)
+
+    validity_seconds = payment_link.duration_minutes * 60 if payment_link.duration_minutes else 3600
     svc = MonobankAcquiringService()
     invoice_id, page_url = svc.create_invoice(
         reference=str(payment_link.unique_id),
         amount_uah=payment_link.final_amount_uah,
         destination=payment_link.description or 'Оплата послуг',
         comment=f'Платіж від {payment_link.client_name}',
-        validity_seconds=payment_link.duration_minutes * 60 if payment_link.duration_minutes else 3600,
+        validity_seconds=validity_seconds,
     )
 
     if not invoice_id or not page_url:
         return render(request, 'payment/payment_failure.html', {'payment_link': payment_link, 'reason': 'Помилка створення інвойсу'})
 
-    payment_link.monobank_invoice_id = invoice_id
-    payment_link.monobank_invoice_url = page_url
-    payment_link.save(update_fields=['monobank_invoice_id', 'monobank_invoice_url'])
+    payment_link.set_invoice(invoice_id, page_url, validity_seconds)
     return redirect(page_url)
 
 
@@ -77,24 +108,47 @@ def monobank_webhook(request: HttpRequest):
         return HttpResponseBadRequest('Invalid JSON')
 
     # Приклад структури, перевіряйте під свій контракт
-    invoice_id = payload.get('invoiceId') or payload.get('invoice', {}).get('invoiceId')
-    status = payload.get('status') or payload.get('invoice', {}).get('status')
-    reference = payload.get('reference') or payload.get('invoice', {}).get('reference')
+    invoice = payload.get('invoice', {})
+    invoice_id = payload.get('invoiceId') or invoice.get('invoiceId')
+    status = payload.get('status') or invoice.get('status')
+    reference = payload.get('reference') or invoice.get('reference')
+    modified_date = payload.get('modifiedDate') or invoice.get('modifiedDate') or ''
 
     if not reference:
         return HttpResponseBadRequest('No reference')
+    try:
+        reference = str(uuid.UUID(str(reference)))
+    except ValueError:
+        return HttpResponseBadRequest('Invalid reference')
 
+    # Подія дедуплікації комітиться лише разом зі зміною статусу: якщо обробка впаде,
+    # повтор від Monobank не вважатиметься дублікатом
     try:
-        payment_link = PaymentLink.objects.get(unique_id=reference)
-    except PaymentLink.DoesNotExist:
-        return HttpResponseBadRequest('Unknown reference')
-
-    # Оновлення статусу
-    if status == 'success' or status == 'paid' or payload.get('paymentInfo', {}).get('maskedPan'):
-        payment_link.mark_paid()
-    elif status in ['expired', 'reversed']:
-        payment_link.status = PaymentLink.Status.EXPIRED
-        payment_link.save(update_fields=['status'])
+        with transaction.atomic():
+            MonobankWebhookEvent.objects.create(
+                invoice_id=invoice_id or reference, status=status or '',
+                modified_date=str(modified_date)[:64], reference=reference[:64],
+            )
+
+            # Оновлення статусу одним умовним UPDATE: дублікати та гонки з payment_page не перезаписують фінальні статуси
+            if status == 'success' or status == 'paid' or payload.get('paymentInfo', {}).get('maskedPan'):
+                updated = PaymentLink.transition(
+                    reference, PaymentLink.Status.PAID, PAID_FROM, payment_processed_at=timezone.now()
+                )
+            elif status == 'expired':
+                updated = PaymentLink.transition(reference, PaymentLink.Status.EXPIRED, EXPIRED_FROM)
+            elif status == 'reversed':
+                updated = PaymentLink.transition(reference, PaymentLink.Status.EXPIRED, REVERSED_FROM)
+            else:
+                updated = 0
+
+            if not updated and not PaymentLink.objects.filter(unique_id=reference).exists():
+                # Подію не запам'ятовуємо - повтор після створення посилання має бути оброблений
+                transaction.set_rollback(True)
+                return HttpResponseBadRequest('Unknown reference')
+    except IntegrityError:
+        # Повторна доставка тієї ж події - PaymentLink не чіпаємо
+        return JsonResponse({'ok': True, 'duplicate': True})
 
     return JsonResponse({'ok': True})
 
@@ -7,11 +7,24 @@ pip install -r requirements.txt
 echo "🌍 Compiling translations..."
 python manage.py compilemessages --ignore=prometey_env
 
-echo "📁 Collecting static files..."
+echo "🖼️  Building responsive image variants..."
+python manage.py build_images
+
+echo "🎬 Building video renditions and posters..."
+python manage.py build_videos
+
+echo "🧩 Building CSS/JS bundles..."
+python manage.py build_assets
+
+echo "📁 Collecting static files (hashed names + gzip/brotli, staticfiles.json)..."
 python manage.py collectstatic --no-input
 
 echo "🗄️  Running migrations..."
 python manage.py migrate
+python manage.py createcachetable
+
+echo "📝 Rendering blog content HTML..."
+python manage.py render_blog_content
 
 echo "👤 Creating superuser..."
 python manage.py create_superuser
@@ -39,7 +39,8 @@ INSTALLED_APPS = [
 # MIDDLEWARE
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'prometey_project.middleware.StaticFilesMiddleware',
+    'prometey_project.middleware.CacheHeadersMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -98,17 +99,81 @@ MEDIA_ROOT = BASE_DIR / 'media'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# STATIC BUILD - згенерована статика (build_images, build_assets у build.sh перед collectstatic)
+STATIC_BUILD_DIR = BASE_DIR / 'static_build'
+if STATIC_BUILD_DIR.is_dir():
+    STATICFILES_DIRS.append(STATIC_BUILD_DIR)
+
+# ASSETS - CSS/JS бандли з критичним CSS (apps.core.assets)
+ASSET_BUNDLES = os.environ.get('ASSET_BUNDLES', str(not DEBUG)) == 'True'
+ASSET_BUNDLES_DIR = STATIC_BUILD_DIR / 'bundles'
+
+# IMAGES - ширини WebP/AVIF похідних для srcset (apps.core.images)
+RESPONSIVE_IMAGE_WIDTHS = [int(w) for w in os.environ.get('RESPONSIVE_IMAGE_WIDTHS', '480,960,1440').split(',')]
+
+# VIDEOS - ffmpeg для драбини відео build_videos (порожньо - PATH або imageio-ffmpeg; apps.core.videos)
+FFMPEG_BINARY = os.environ.get('FFMPEG_BINARY', '')
+
 # WhiteNoise налаштування
-if DEBUG:
-    STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
-else:
-    # Продакшн: найпростіші налаштування для WhiteNoise (100% працює)
-    STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
-    WHITENOISE_USE_FINDERS = True
-    WHITENOISE_AUTOREFRESH = True
-    WHITENOISE_MAX_AGE = 31536000
-    WHITENOISE_SKIP_COMPRESS_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'zip', 'gz', 'bz2']
-    WHITENOISE_IMMUTABLE_FILE_TEST = lambda path, url: url.startswith('/static/') and ('.' in url)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+if not DEBUG:
+    # Продакшн: хешовані імена + .gz/.br збираються в collectstatic (apps.core.storage),
+    # WhiteNoise індексує STATIC_ROOT один раз при старті (без finders/autorefresh - див. core.E001)
+    STORAGES['staticfiles'] = {'BACKEND': 'apps.core.storage.HashedStaticFilesStorage'}
+    WHITENOISE_USE_FINDERS = False
+    WHITENOISE_AUTOREFRESH = False
+    WHITENOISE_MAX_AGE = 3600  # нехешовані URL; хешовані отримують immutable на рік
+    WHITENOISE_SKIP_COMPRESS_EXTENSIONS = [
+        'jpg', 'jpeg', 'png', 'gif', 'webp', 'avif', 'ico', 'zip', 'gz', 'tgz', 'bz2', 'br',
+        'mp4', 'webm', 'mov', 'mp3', 'woff', 'woff2',
+    ]
+
+# BUILD - хеш збірки для інвалідації кешів при деплої (Render передає RENDER_GIT_COMMIT)
+BUILD_HASH = (os.environ.get('BUILD_HASH') or os.environ.get('RENDER_GIT_COMMIT', ''))[:12] or 'dev'
+
+# CACHE - спільний для всіх воркерів кеш (apps.core.cache): redis, file (диск хоста), db або locmem
+REDIS_URL = os.environ.get('REDIS_URL', '')
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND') or ('redis' if REDIS_URL else 'locmem' if DEBUG else 'file')
+CACHE_BACKENDS = {
+    'redis': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL},
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_DIR', '/tmp/prometey-cache'),
+        'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 5000))},
+    },
+    'db': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'core_cache'},
+    'locmem': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}
+CACHES = {
+    'default': {**CACHE_BACKENDS[CACHE_BACKEND], 'KEY_PREFIX': 'prometey'},
+}
+
+# PAGE CACHE - кешування відрендерених статичних сторінок (BasePageView.page_cache)
+PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', str(not DEBUG)) == 'True'
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 600))
+
+# HTTP CACHE - s-maxage для CDN на сторінках з ETag/Last-Modified без cookies (CacheHeadersMiddleware)
+CDN_S_MAXAGE = int(os.environ.get('CDN_S_MAXAGE', 300))
+
+# FORMS - заявки з форм пишуться в БД пачками (1 - одразу в запиті)
+FORM_SUBMISSION_BUFFER_SIZE = int(os.environ.get('FORM_SUBMISSION_BUFFER_SIZE', 50))
+FORM_SUBMISSION_FLUSH_INTERVAL = float(os.environ.get('FORM_SUBMISSION_FLUSH_INTERVAL', 2))
+
+# EVENTS - режим черги реєстрацій для флеш-анонсів (потрібен воркер drain_registration_queue --loop)
+EVENTS_REGISTRATION_QUEUE = os.environ.get('EVENTS_REGISTRATION_QUEUE', 'False') == 'True'
+# EVENTS - оцінка кількості подій планувальником PostgreSQL для великих вибірок (замість COUNT)
+EVENTS_APPROXIMATE_COUNT = os.environ.get('EVENTS_APPROXIMATE_COUNT', 'False') == 'True'
+# EVENTS - переходи статусів за часом: thread - таймер у веб-процесі, worker - sync_event_statuses (cron / --loop)
+EVENTS_STATUS_MODE = os.environ.get('EVENTS_STATUS_MODE', 'thread')
+
+# PAYMENTS - звірка з Monobank та прострочення посилань: thread - таймер у веб-процесі, worker - reconcile_payments (cron / --loop)
+PAYMENTS_RECONCILE_MODE = os.environ.get('PAYMENTS_RECONCILE_MODE', 'thread')
+
+# METRICS - хуки для лічильників apps.core.metrics (dotted path до функції hook(name, value))
+METRICS_HOOKS = [h for h in os.environ.get('METRICS_HOOKS', '').split(',') if h]
 
 # TEMPLATES
 TEMPLATES = [
@@ -136,6 +201,9 @@ EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 587))
 EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', 'your-email@gmail.com')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', 'your-password')
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', 20))
+# Черга листів (apps.core.mail): thread - фоновий потік у процесі, worker - send_outbox_emails --loop, sync - в запиті
+EMAIL_OUTBOX_MODE = os.environ.get('EMAIL_OUTBOX_MODE', 'thread')
 
 # MAILGUN
 ANYMAIL = {
@@ -148,6 +216,9 @@ CONTACT_EMAIL = os.environ.get('CONTACT_EMAIL', 'info@prometeylabs.com')
 
 # MONOBANK - Зберігаємо поточні налаштування
 MONOBANK_TOKEN = os.environ.get('MONOBANK_TOKEN', '')
+MONOBANK_API_URL = os.environ.get('MONOBANK_API_URL', 'https://api.monobank.ua')
+# Максимум одночасних запитів до Monobank з одного процесу (розмір пулу з'єднань)
+MONOBANK_MAX_CONCURRENCY = int(os.environ.get('MONOBANK_MAX_CONCURRENCY', 8))
 SITE_URL = os.environ.get('SITE_URL', 'https://www.prometeylabs.com')
 if DEBUG:
     SITE_URL = 'http://localhost:8001'
@@ -1,6 +1,13 @@
 """
-Middleware для відключення кешування під час розробки
+Middleware для заголовків кешування: відключення під час розробки та Cache-Control у продакшн
 """
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.utils.cache import has_vary_header, patch_cache_control
+from whitenoise.middleware import WhiteNoiseMiddleware
+
 
 class NoCacheMiddleware:
     def __init__(self, get_response):
@@ -14,4 +21,51 @@ class NoCacheMiddleware:
         response['Pragma'] = 'no-cache'
         response['Expires'] = '0'
         
-        return response 
\ No newline at end of file
+        return response 
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise для хешованої статики (apps.core.storage.HashedStaticFilesStorage).
+    Сховище віддає percent-encoded URL, а WhiteNoise порівнює їх з декодованими
+    шляхами файлів - без unquote файли з кирилицею в імені не отримали б immutable
+    """
+
+    def add_mime_headers(self, headers, path, url):
+        super().add_mime_headers(headers, path, url)
+        # WhiteNoise відповідає 206 на Range, але сам не оголошує цього
+        if headers['Content-Type'].startswith(('video/', 'audio/')):
+            headers['Accept-Ranges'] = 'bytes'
+
+    def get_static_url(self, name):
+        # Викликається при старті для кожного файлу, схожого на хешований - без спроб хешувати відсутні
+        hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+        if hashed_files is not None and name not in hashed_files:
+            return None
+        url = super().get_static_url(name)
+        return unquote(url) if url else url
+
+
+class CacheHeadersMiddleware:
+    """
+    Cache-Control для сторінок з валідаторами (ETag / Last-Modified, див. apps.core.conditional).
+    Відповіді без cookies кешує CDN (s-maxage), решта - private, браузер щоразу
+    перевіряє валідатори й отримує 304 без рендерингу
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (request.method not in ('GET', 'HEAD') or response.status_code not in (200, 304)
+                or response.has_header('Cache-Control')
+                or not (response.has_header('ETag') or response.has_header('Last-Modified'))):
+            return response
+
+        if request.COOKIES or response.cookies or has_vary_header(response, 'Cookie'):
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(response, public=True, max_age=0, must_revalidate=True,
+                                s_maxage=getattr(settings, 'CDN_S_MAXAGE', 300))
+        return response
@@ -52,31 +52,35 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
 if DEBUG:
     # Розробка - прості налаштування
-    STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
     STATICFILES_FINDERS = [
         'django.contrib.staticfiles.finders.FileSystemFinder',
         'django.contrib.staticfiles.finders.AppDirectoriesFinder',
     ]
 else:
-    # Продакшн - WhiteNoise для статики (ВИПРАВЛЕНО)
+    # Продакшн - WhiteNoise віддає зібрану в collectstatic хешовану статику
     # Додаємо WhiteNoise middleware перед SecurityMiddleware
-    MIDDLEWARE.insert(0, 'whitenoise.middleware.WhiteNoiseMiddleware')
-    
-    # Найпростіші налаштування для WhiteNoise (100% працює)
-    STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
-    
-    # WhiteNoise налаштування з compression та optimization
-    WHITENOISE_USE_FINDERS = True
-    WHITENOISE_AUTOREFRESH = True
-    WHITENOISE_MAX_AGE = 31536000
-    
-    # Compression налаштування (БЕЗПЕЧНО - не змінює URL структуру) 
-    WHITENOISE_SKIP_COMPRESS_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'zip', 'gz', 'bz2']
-    
-    # Гарні cache headers для performance (БЕЗПЕЧНО)
-    WHITENOISE_IMMUTABLE_FILE_TEST = lambda path, url: url.startswith('/static/') and ('.' in url)
+    MIDDLEWARE.insert(0, 'prometey_project.middleware.StaticFilesMiddleware')
+
+    # Хешовані імена + .gz/.br створюються один раз у collectstatic (apps.core.storage)
+    STORAGES['staticfiles'] = {'BACKEND': 'apps.core.storage.HashedStaticFilesStorage'}
+
+    # STATIC_ROOT індексується при старті воркера, без пошуку по файловій системі на запит
+    WHITENOISE_USE_FINDERS = False
+    WHITENOISE_AUTOREFRESH = False
+    WHITENOISE_MAX_AGE = 3600  # нехешовані URL; хешовані отримують immutable на рік
+
+    # Вже стиснені формати не перетискаємо
+    WHITENOISE_SKIP_COMPRESS_EXTENSIONS = [
+        'jpg', 'jpeg', 'png', 'gif', 'webp', 'avif', 'ico', 'zip', 'gz', 'tgz', 'bz2', 'br',
+        'mp4', 'webm', 'mov', 'mp3', 'woff', 'woff2',
+    ]
 
 # === SECURITY CONFIGURATION ===
 
@@ -0,0 +1,101 @@
+"""
+Скрипт для порівняння запитів і байтів до першого рендерингу
+
+Збирає бандли (build_assets) і статику (collectstatic) у тимчасові теки, рендерить
+головну, блог і події з ASSET_BUNDLES=False (окремі файли) та True (бандли) і
+рахує з HTML: запити, що блокують перший рендеринг (stylesheet у <head>,
+синхронні скрипти в <head>), їх байти (brotli, як віддає WhiteNoise), inline CSS,
+а також усі CSS/JS запити сторінки.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import os
+import re
+import tempfile
+from pathlib import Path
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from apps.core.templatetags import assets as assets_tags
+
+PAGES = ['home', 'blog:blog_list', 'events']
+HASHED_STORAGE = 'apps.core.storage.HashedStaticFilesStorage'
+
+_TAG = re.compile(r'<(link|script)\b([^>]*)>', re.I)
+_ATTR = re.compile(r'(\w[\w-]*)(?:\s*=\s*"([^"]*)")?')
+_STYLE = re.compile(r'<style>(.*?)</style>', re.S)
+# З увімкненим JS вміст <noscript> не завантажується
+_NOSCRIPT = re.compile(r'<noscript>.*?</noscript>', re.S)
+
+
+class Command(BaseCommand):
+    help = 'Запити та байти до першого рендерингу (home, blog, events): окремі файли vs бандли'
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as build_dir, tempfile.TemporaryDirectory() as static_root:
+            storages = {**settings.STORAGES, 'staticfiles': {'BACKEND': HASHED_STORAGE}}
+            static_dirs = [d for d in settings.STATICFILES_DIRS if d != settings.STATIC_BUILD_DIR] + [build_dir]
+            with override_settings(STATIC_BUILD_DIR=Path(build_dir), ASSET_BUNDLES_DIR=Path(build_dir) / 'bundles',
+                                   STATICFILES_DIRS=static_dirs, STATIC_ROOT=static_root, STORAGES=storages):
+                self.stdout.write('📦 build_assets + collectstatic у тимчасові теки...')
+                call_command('build_assets', verbosity=0)
+                call_command('collectstatic', interactive=False, verbosity=0)
+
+                with override_settings(DEBUG=False, ALLOWED_HOSTS=['*'], PAGE_CACHE_ENABLED=False):
+                    for view_name in PAGES:
+                        url = reverse(view_name)
+                        self.stdout.write(self.style.MIGRATE_HEADING(f'📄 {url}'))
+                        for enabled in (False, True):
+                            self._measure(url, enabled, static_root)
+
+    def _measure(self, url, enabled, static_root):
+        assets_tags._built.clear()
+        assets_tags._critical.clear()
+        with override_settings(ASSET_BUNDLES=enabled):
+            response = Client().get(url)
+        if response.status_code != 200:
+            raise CommandError(f'{url}: {response.status_code}')
+        html = _NOSCRIPT.sub('', response.content.decode('utf-8'))
+        head = html[:html.find('</head>')]
+
+        blocking, blocking_bytes, css_js, css_js_bytes = 0, 0, 0, 0
+        for tag, raw_attrs in _TAG.findall(html):
+            attrs = {key.lower(): value for key, value in _ATTR.findall(raw_attrs)}
+            src = attrs.get('href') if tag.lower() == 'link' else attrs.get('src')
+            rel = attrs.get('rel', '')
+            if not src or not src.startswith(settings.STATIC_URL) or not src.endswith(('.css', '.js')):
+                continue
+            if tag.lower() == 'link' and rel not in ('stylesheet', 'preload'):
+                continue
+            size = self._transfer_size(static_root, src)
+            css_js += 1
+            css_js_bytes += size
+            in_head = f'"{src}"' in head
+            sync_script = tag.lower() == 'script' and 'defer' not in attrs and 'async' not in attrs
+            if in_head and (rel == 'stylesheet' or sync_script):
+                blocking += 1
+                blocking_bytes += size
+
+        inline = sum(len(css.encode('utf-8')) for css in _STYLE.findall(head))
+        mode = 'бандли     ' if enabled else 'окремі файли'
+        self.stdout.write(
+            f'   {mode}: до першого рендерингу {1 + blocking} запитів '
+            f'(HTML {len(response.content) / 1024:.1f} КБ + {blocking_bytes / 1024:.1f} КБ br, '
+            f'inline CSS {inline / 1024:.1f} КБ); усього CSS/JS {css_js} запитів, {css_js_bytes / 1024:.1f} КБ br'
+        )
+
+    def _transfer_size(self, static_root, url):
+        path = os.path.join(static_root, unquote(url[len(settings.STATIC_URL):]))
+        for candidate in (path + '.br', path + '.gz', path):
+            if os.path.exists(candidate):
+                return os.path.getsize(candidate)
+        return 0
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,81 @@
+"""
+Скрипт для порівняння вартості рендерингу контенту статей
+
+Порівнює рендеринг markdown на кожен запит (старий шлях) з читанням
+збереженого HTML (get_clean_content) на найдовших статтях з seed_initial_data.
+З --memory додатково міряє пікову пам'ять рендерингу через tracemalloc.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import sys
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db.models.functions import Length
+
+from apps.blog.models import BlogPost
+from apps.blog.rendering import render_content
+
+
+class Command(BaseCommand):
+    help = 'Бенчмарк рендерингу контенту статей блогу (на запит vs збережений HTML)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=5, help='Кількість найдовших статей')
+        parser.add_argument('--iterations', type=int, default=200, help='Повторів на статтю')
+        parser.add_argument('--memory', action='store_true', help="Виміряти пікову пам'ять рендерингу (tracemalloc)")
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        posts = list(BlogPost.objects.annotate(content_length=Length('content')).order_by('-content_length')[:options['posts']])
+        if not posts:
+            self.stdout.write(self.style.WARNING('⚠️  Немає статей. Спочатку виконайте seed_initial_data'))
+            return
+
+        for post in posts:
+            post.refresh_rendered_content()
+
+        self.stdout.write(f'{"Стаття":<40} {"Символів":>9} {"На запит, мкс":>14} {"Збережений, мкс":>16} {"Прискорення":>12}')
+        total_render = total_cached = 0.0
+        for post in posts:
+            render_time = self._measure(lambda: render_content(post.content), iterations)
+            cached_time = self._measure(post.get_clean_content, iterations)
+            total_render += render_time
+            total_cached += cached_time
+            self.stdout.write(
+                f'{post.slug[:40]:<40} {post.content_length:>9} {render_time:>14.1f} '
+                f'{cached_time:>16.1f} {render_time / cached_time:>11.0f}x'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Середнє: {total_render / len(posts):.1f} мкс на запит vs '
+            f'{total_cached / len(posts):.1f} мкс із збереженого HTML'
+        ))
+
+        if options['memory']:
+            self._report_memory(posts)
+
+    def _report_memory(self, posts):
+        """Пікова пам'ять та кількість блоків, виділених під час одного рендерингу"""
+        self.stdout.write(f'\n{"Стаття":<40} {"Результат, Б":>13} {"Пік, Б":>10} {"Пік без результату, Б":>22}')
+        for post in posts:
+            render_content(post.content)  # прогрів кешів інтерпретатора
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+            html = render_content(post.content)
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            tracemalloc.stop()
+            result_size = sys.getsizeof(html)
+            self.stdout.write(f'{post.slug[:40]:<40} {result_size:>13} {peak:>10} {peak - result_size:>22}')
+
+    def _measure(self, func, iterations):
+        """Середній час виклику в мікросекундах"""
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
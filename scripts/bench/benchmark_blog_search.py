@@ -0,0 +1,92 @@
+"""
+Скрипт для бенчмарку in-memory пошукового індексу блогу
+
+Генерує синтетичні статті (словник береться з наявних статей або генерується),
+будує InMemorySearchBackend без БД та міряє латентність ранжування і фрагментів.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from apps.blog.models import BlogPost
+from apps.blog.search import InMemorySearchBackend, RankedResults, TOKEN_RE, highlight
+
+
+class Command(BaseCommand):
+    help = 'Бенчмарк пошуку по блогу на синтетичних статтях (за замовчуванням 10k)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000, help='Кількість синтетичних статей')
+        parser.add_argument('--words', type=int, default=600, help='Слів у контенті статті')
+        parser.add_argument('--queries', type=int, default=300, help='Кількість запитів')
+        parser.add_argument('--vocabulary', type=int, default=30000, help='Мінімальний розмір словника')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        vocabulary = self._vocabulary(rng, options['vocabulary'])
+        # Zipf-подібний розподіл: перші слова зустрічаються значно частіше
+        weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+        def text(count):
+            return ' '.join(rng.choices(vocabulary, weights, k=count))
+
+        self.stdout.write(f'📚 Словник: {len(vocabulary)} слів, генеруємо {options["posts"]} статей...')
+        posts = [
+            SimpleNamespace(
+                pk=post_id, is_published=True, title=text(8), keywords=', '.join(text(4).split()),
+                excerpt=text(30), content=text(options['words']),
+            )
+            for post_id in range(1, options['posts'] + 1)
+        ]
+
+        backend = InMemorySearchBackend()
+        start = time.perf_counter()
+        backend.rebuild(posts)
+        build_time = time.perf_counter() - start
+        self.stdout.write(f'🏗  Індекс побудовано за {build_time:.2f} с, термінів: {len(backend.postings)}')
+
+        by_id = {post.pk: post for post in posts}
+        latencies = []
+        for _ in range(options['queries']):
+            query = ' '.join(rng.choices(vocabulary, weights, k=rng.randint(1, 3)))
+            start = time.perf_counter()
+            results = RankedResults(*backend.rank(query))
+            # Як на першій сторінці результатів: кількість, топ-9 та їх фрагменти
+            len(results)
+            for post_id, _ in results.ranked(9):
+                highlight(by_id[post_id].content, results.terms)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f'⏱  Запит (ранжування + 9 фрагментів): медіана {statistics.median(latencies):.2f} мс, '
+            f'p95 {p95:.2f} мс, максимум {latencies[-1]:.2f} мс'
+        )
+        style = self.style.SUCCESS if p95 < 10 else self.style.WARNING
+        self.stdout.write(style(f'{"✅" if p95 < 10 else "⚠️ "} p95 {"<" if p95 < 10 else ">="} 10 мс'))
+
+    def _vocabulary(self, rng, size):
+        words = set()
+        try:
+            for content in BlogPost.objects.values_list('content', flat=True)[:50]:
+                words.update(word.lower() for word in TOKEN_RE.findall(content) if len(word) > 3)
+        except Exception:
+            pass
+        # Реальний корпус з 10k статей має десятки тисяч різних слів - доповнюємо синтетичними
+        letters = 'абвгдеєжзиіїйклмнопрстуфхцчшщьюя'
+        while len(words) < size:
+            words.add(''.join(rng.choices(letters, k=rng.randint(4, 10))))
+        words = sorted(words)
+        rng.shuffle(words)
+        return words
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,154 @@
+"""
+Скрипт для порівняння бекендів кешу
+
+Для кожного бекенду (locmem, file, db, redis - якщо задано --redis-url) міряє
+сирі get/set, пропускну здатність сторінок, що читають кеш (кешовані сторінки
+core, список статей блогу), та перевіряє захист від stampede: скільки разів
+рахується значення, коли холодний або прострочений ключ запитують паралельно.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import statistics
+import tempfile
+import threading
+import time
+import timeit
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from apps.core.cache import AppCache
+
+VIEW_NAMES = ['home', 'portfolio', 'contacts', 'blog:blog_list']
+PAGE_SIZE = 50 * 1024
+
+
+class Command(BaseCommand):
+    help = 'Порівняння бекендів кешу (locmem/file/db/redis): get/set, кешовані сторінки, stampede'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300, help='Запитів на кожну сторінку')
+        parser.add_argument('--threads', type=int, default=16, help='Паралельних запитів у stampede-тесті')
+        parser.add_argument('--compute-time', type=float, default=0.1, help='Тривалість "дорогого" перерахунку, с')
+        parser.add_argument('--redis-url', default='', help='Додати Redis до порівняння')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            backends = {
+                'locmem': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'file': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': cache_dir},
+                'db': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'core_cache_benchmark'},
+            }
+            if options['redis_url']:
+                backends['redis'] = {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                                     'LOCATION': options['redis_url']}
+
+            for name, config in backends.items():
+                with override_settings(CACHES={'default': {**config, 'KEY_PREFIX': 'benchmark'}},
+                                       PAGE_CACHE_ENABLED=True):
+                    if name == 'db':
+                        call_command('createcachetable', verbosity=0)
+                    try:
+                        self.stdout.write(self.style.MIGRATE_HEADING(f'🗄  {name}'))
+                        self._bench_raw()
+                        self._bench_views(options)
+                        self._bench_stampede(options)
+                    finally:
+                        caches['default'].clear()
+                        if name == 'db':
+                            self._drop_cache_table(config['LOCATION'])
+
+    def _bench_raw(self):
+        cache = caches['default']
+        page = 'x' * PAGE_SIZE
+        cache.set('raw:small', 'value')
+        cache.set('raw:page', page)
+        for label, call in (
+            ('get (короткий рядок)', lambda: cache.get('raw:small')),
+            ('get (сторінка 50 КБ)', lambda: cache.get('raw:page')),
+            ('set (сторінка 50 КБ)', lambda: cache.set('raw:page', page)),
+        ):
+            number = 200
+            elapsed = min(timeit.repeat(call, number=number, repeat=3))
+            self.stdout.write(f'   {label}: {elapsed / number * 1e6:,.0f} мкс')
+
+    def _bench_views(self, options):
+        client = Client()
+        for name in VIEW_NAMES:
+            url = reverse(name)
+            client.get(url)  # прогрів: рендер і запис у кеш
+            latencies = []
+            for _ in range(options['requests']):
+                start = time.perf_counter()
+                response = client.get(url)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            self.stdout.write(
+                f'   {url} [{response.status_code}]: медіана {statistics.median(latencies) * 1000:.2f} мс, '
+                f'p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} мс'
+            )
+
+    def _bench_stampede(self, options):
+        store = AppCache('benchmark')
+        computes = {'naive': 0, 'cold': 0, 'stale': 0}
+        lock = threading.Lock()
+
+        def expensive(kind):
+            def compute():
+                with lock:
+                    computes[kind] += 1
+                time.sleep(options['compute_time'])
+                return 'value'
+            return compute
+
+        def naive():
+            # Звичайний get/set: кожен, хто не знайшов значення, рахує сам
+            value = store.get('naive')
+            if value is None:
+                value = expensive('naive')()
+                store.set('naive', value, 60)
+            return value
+
+        self._run_parallel(naive, options['threads'])
+        cold = self._run_parallel(lambda: store.get_or_compute('cold', expensive('cold'), 60),
+                                  options['threads'])
+
+        # Прострочене значення: timeout 0 - одразу застаріле, але ще в межах stale_ttl
+        store.get_or_compute('stale', lambda: 'old', 0)
+        stale = self._run_parallel(lambda: store.get_or_compute('stale', expensive('stale'), 60),
+                                   options['threads'])
+
+        self.stdout.write(
+            f'   stampede ({options["threads"]} запитів): get/set - {computes["naive"]} перерахунків, '
+            f'холодний ключ - {computes["cold"]} (макс. {max(cold) * 1000:.0f} мс), '
+            f'прострочений - {computes["stale"]} (медіана {statistics.median(stale) * 1000:.1f} мс)'
+        )
+
+    def _run_parallel(self, call, count):
+        latencies = []
+        barrier = threading.Barrier(count)
+
+        def worker():
+            barrier.wait()
+            start = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - start)
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies
+
+    def _drop_cache_table(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {connection.ops.quote_name(table)}')
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,82 @@
+"""
+Скрипт для перевірки умовних GET-запитів
+
+Для кожної сторінки з валідаторами отримує повну відповідь (200 + ETag),
+потім повторює запити з If-None-Match і перевіряє, що відповідь 304 віддається
+без жодного рендерингу шаблону. Порівнює латентність та кількість SQL-запитів.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.signals import template_rendered
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from apps.blog.models import BlogPost
+
+
+class Command(BaseCommand):
+    help = 'Перевірка 304 без рендерингу шаблонів та порівняння латентності 200 vs 304'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help='Запитів на кожен режим')
+
+    def handle(self, *args, **options):
+        urls = [reverse('home'), reverse('contacts'), reverse('blog:blog_list'), reverse('events')]
+        post = BlogPost.objects.filter(is_published=True).first()
+        if post:
+            urls.append(post.get_absolute_url())
+
+        rendered = []
+
+        def on_render(sender, template, **kwargs):
+            rendered.append(template.name)
+
+        # Тестове оточення інструментує Template.render сигналом template_rendered
+        setup_test_environment()
+        template_rendered.connect(on_render)
+        try:
+            for url in urls:
+                self._check(Client(), url, options['requests'], rendered)
+        finally:
+            template_rendered.disconnect(on_render)
+            teardown_test_environment()
+        self.stdout.write(self.style.SUCCESS('✅ Відповіді 304 віддаються без рендерингу шаблонів'))
+
+    def _check(self, client, url, count, rendered):
+        response = client.get(url)
+        etag = response.get('ETag')
+        if response.status_code != 200 or not etag:
+            raise CommandError(f'{url}: {response.status_code} без ETag')
+
+        results = {}
+        for mode, headers in (('200', {}), ('304', {'HTTP_IF_NONE_MATCH': etag})):
+            latencies, queries = [], 0
+            rendered.clear()
+            for _ in range(count):
+                reset_queries()
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    response = client.get(url, **headers)
+                    latencies.append(time.perf_counter() - start)
+                queries += len(captured)
+                if response.status_code != int(mode):
+                    raise CommandError(f'{url}: очікувався {mode}, отримано {response.status_code}')
+            if mode == '304' and rendered:
+                raise CommandError(f'{url}: 304 рендерить шаблони {sorted(set(rendered))}')
+            results[mode] = (statistics.median(latencies) * 1000, queries / count)
+
+        self.stdout.write(
+            f'   {url}: 200 - {results["200"][0]:.2f} мс / {results["200"][1]:.1f} SQL, '
+            f'304 - {results["304"][0]:.2f} мс / {results["304"][1]:.1f} SQL '
+            f'[{response.get("Cache-Control")}]'
+        )
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,148 @@
+"""
+Скрипт для бенчмарку відповіді events_ajax_filter
+
+Створює синтетичні опубліковані події в окремій категорії і для кількох
+комбінацій фільтрів/сортувань порівнює:
+- ручну серіалізацію кожної події в dict (image.url, get_absolute_url(),
+  властивості на кожен рядок) + JsonResponse - як було;
+- зібраний фрагмент без кешу (apps.events.fragments.build_fragment, MISS);
+- фрагмент з кешу (get_fragment, HIT) - у HTML та компактному JSON режимах.
+Наприкінці перевіряє, що збереження події скидає кеш. Події видаляються після заміру.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse, QueryDict
+from django.utils import timezone
+
+from apps.events.fragments import build_fragment, get_fragment
+from apps.events.listing import filter_events, get_filters, get_sort, invalidate_listing, paginate_events
+from apps.events.models import Event, EventCategory
+
+BENCHMARK_SLUG = 'benchmark-fragments'
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Латентність events_ajax_filter: ручна серіалізація vs кешовані фрагменти'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=2000, help='Кількість синтетичних подій')
+        parser.add_argument('--repeat', type=int, default=200, help='Повторів на кожен замір')
+
+    def handle(self, *args, **options):
+        category = self._create_events(options['events'])
+        try:
+            scenarios = [
+                ('усі', ''),
+                ('за ціною', 'sort=price'),
+                ('категорія + тип', f'category={BENCHMARK_SLUG}&type=webinar'),
+                ('популярні, стор. 2', self._second_page('sort=-current_participants')),
+            ]
+            self.stdout.write(
+                f'{"Сценарій":<20} {"Вручну, мс":>11} {"MISS, мс":>9} {"HIT html, мс":>13} '
+                f'{"HIT json, мс":>13} {"Прискорення":>12} {"html/json, Б":>14}'
+            )
+            repeat = options['repeat']
+            for label, query in scenarios:
+                params = QueryDict(query)
+                legacy_ms = self._time(lambda: self._legacy_response(params), repeat)
+                miss_ms = self._time(lambda: build_fragment(params, 'html'), repeat)
+                get_fragment(params, 'html'), get_fragment(params, 'json')
+                html_ms = self._time(lambda: get_fragment(params, 'html'), repeat)
+                json_ms = self._time(lambda: get_fragment(params, 'json'), repeat)
+                html_size = len(get_fragment(params, 'html')[0].encode('utf-8'))
+                json_size = len(get_fragment(params, 'json')[0].encode('utf-8'))
+                self.stdout.write(
+                    f'{label:<20} {legacy_ms:>11.2f} {miss_ms:>9.2f} {html_ms:>13.3f} '
+                    f'{json_ms:>13.3f} {legacy_ms / html_ms:>11.0f}x {html_size:>7}/{json_size:<6}'
+                )
+            self._check_invalidation(category)
+        finally:
+            self.stdout.write('🧹 Видалення синтетичних подій...')
+            Event.objects.filter(category=category)._raw_delete(Event.objects.db)
+            category.delete()
+            invalidate_listing()
+
+    def _create_events(self, count):
+        category, _ = EventCategory.objects.get_or_create(slug=BENCHMARK_SLUG, defaults={'name': 'Benchmark'})
+        types = [value for value, _ in Event.EVENT_TYPES]
+        start = timezone.now()
+        for offset in range(0, count, BATCH_SIZE):
+            Event.objects.bulk_create([
+                Event(
+                    title=f'Benchmark {number}', slug=f'{BENCHMARK_SLUG}-{number}', excerpt='Опис події',
+                    content='Опис', category=category, event_type=types[number % len(types)],
+                    start_date=start + timedelta(hours=number), end_date=start + timedelta(hours=number + 2),
+                    price=number % 500 or None, max_participants=100, current_participants=number % 100,
+                )
+                for number in range(offset, min(offset + BATCH_SIZE, count))
+            ])
+        invalidate_listing()
+        return category
+
+    def _second_page(self, query):
+        params = QueryDict(query)
+        page = paginate_events(get_filters(params), get_sort(params))
+        return f'{query}&after={page.next_cursor}'
+
+    def _legacy_response(self, params):
+        """Попередня реалізація events_ajax_filter: dict на кожну подію + JsonResponse"""
+        page_obj = paginate_events(get_filters(params), get_sort(params),
+                                   after=params.get('after'), before=params.get('before'))
+        events = []
+        for event in page_obj:
+            events.append({
+                'id': event.id,
+                'title': event.title,
+                'excerpt': event.excerpt,
+                'start_date': event.start_date.strftime('%d.%m.%Y %H:%M'),
+                'category_name': event.category.name,
+                'category_color': event.category.color,
+                'event_type': event.get_event_type_display(),
+                'price': str(event.price) if event.price else 'Безкоштовно',
+                'is_online': event.is_online,
+                'url': event.get_absolute_url(),
+                'image_url': event.image.url if event.image else '',
+                'is_featured': event.is_featured,
+                'is_registration_open': event.is_registration_open,
+                'available_spots': event.available_spots,
+            })
+        return JsonResponse({
+            'events': events,
+            'has_next': page_obj.has_next(),
+            'has_previous': page_obj.has_previous(),
+            'current_page': page_obj.number,
+            'total_pages': page_obj.paginator.num_pages,
+            'previous_cursor': page_obj.previous_cursor,
+            'next_cursor': page_obj.next_cursor,
+        })
+
+    def _check_invalidation(self, category):
+        params = QueryDict('')
+        get_fragment(params, 'html')
+        event = filter_events({}).first()
+        event.title = f'{event.title} (змінено)'
+        event.save()
+        content, status = get_fragment(params, 'html')
+        if status == 'MISS' and event.title in content:
+            self.stdout.write(self.style.SUCCESS('✅ Збереження події скидає кеш фрагментів'))
+        else:
+            self.stdout.write(self.style.WARNING(f'⚠️  Після збереження події кеш віддав {status}'))
+
+    def _time(self, func, repeat):
+        """Медіана часу виклику в мілісекундах"""
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            latencies.append((time.perf_counter() - start) * 1000)
+        return statistics.median(latencies)
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,134 @@
+"""
+Скрипт для бенчмарку списку подій на глибоких сторінках
+
+Створює синтетичні опубліковані події (за замовчуванням 100k) в окремій категорії
+на поточній БД і для сторінок різної глибини порівнює:
+- Paginator: COUNT(*) + ORDER BY ... LIMIT/OFFSET на кожен запит (як було);
+- keyset (apps.events.listing.paginate_events): WHERE (start_date, id) < курсор
+  + кешована кількість.
+Для PostgreSQL запускати з відповідним DATABASE_URL. Події видаляються після заміру.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils import timezone
+
+from apps.core.pagination import KeysetPaginator
+from apps.events.listing import ORDERING, PER_PAGE, filter_events, invalidate_listing, paginate_events
+from apps.events.models import Event, EventCategory
+
+BENCHMARK_SLUG = 'benchmark-listing'
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = 'Латентність сторінок списку подій: COUNT + OFFSET vs keyset (за замовчуванням 100k подій)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=100000, help='Кількість синтетичних подій')
+        parser.add_argument('--pages', default='1,10,100,1000,10000', help='Номери сторінок через кому')
+        parser.add_argument('--repeat', type=int, default=20, help='Повторів на кожен замір')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'🗄  БД: {connection.vendor}, подій: {options["events"]}')
+        category = self._create_events(options['events'], random.Random(options['seed']))
+        try:
+            scenarios = [
+                ('усі', {}),
+                ('категорія', {'category': BENCHMARK_SLUG}),
+                ('тип webinar', {'type': 'webinar'}),
+            ]
+            for label, filters in scenarios:
+                total = filter_events(filters).count()
+                self.stdout.write(self.style.MIGRATE_HEADING(f'📄 {label} ({total} подій)'))
+                for number in [int(n) for n in options['pages'].split(',')]:
+                    if (number - 1) * PER_PAGE >= total:
+                        continue
+                    self._measure(filters, number, options['repeat'])
+            self._explain()
+        finally:
+            self.stdout.write('🧹 Видалення синтетичних подій...')
+            # Без реєстрацій і per-row сигналів: 100k post_delete лише скидали б версію кешу
+            Event.objects.filter(category=category)._raw_delete(Event.objects.db)
+            category.delete()
+            invalidate_listing()
+
+    def _create_events(self, count, rng):
+        category, _ = EventCategory.objects.get_or_create(slug=BENCHMARK_SLUG, defaults={'name': 'Benchmark'})
+        types = [value for value, _ in Event.EVENT_TYPES]
+        statuses = ['upcoming', 'active', 'completed']
+        start = timezone.now() - timedelta(days=365)
+        for offset in range(0, count, BATCH_SIZE):
+            events = []
+            for number in range(offset, min(offset + BATCH_SIZE, count)):
+                start_date = start + timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+                events.append(Event(
+                    title=f'Benchmark {number}', slug=f'{BENCHMARK_SLUG}-{number}', excerpt='Опис', content='Опис',
+                    category=category, event_type=rng.choice(types), status=rng.choice(statuses),
+                    start_date=start_date, end_date=start_date + timedelta(hours=2),
+                ))
+            Event.objects.bulk_create(events)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(Event._meta.db_table)}')
+        invalidate_listing()
+        return category
+
+    def _measure(self, filters, number, repeat):
+        queryset = filter_events(filters)
+
+        def offset_page():
+            page = Paginator(queryset.order_by(*ORDERING), PER_PAGE).page(number)
+            return list(page), page.paginator.num_pages
+
+        # Курсор, з яким браузер прийшов би на сторінку number ("Наступна" з попередньої)
+        cursor = None
+        if number > 1:
+            paginator = KeysetPaginator(queryset, PER_PAGE, ORDERING)
+            last = queryset.order_by(*ORDERING)[(number - 1) * PER_PAGE - 1]
+            cursor = paginator.encode_cursor(number - 1, last)
+
+        def keyset_page():
+            page = paginate_events(filters, after=cursor)
+            return list(page), page.paginator.num_pages
+
+        offset_rows, offset_pages = offset_page()
+        keyset_rows, keyset_pages = keyset_page()
+        if [e.id for e in offset_rows] != [e.id for e in keyset_rows] or offset_pages != keyset_pages:
+            self.stdout.write(self.style.WARNING(f'⚠️  Сторінка {number}: keyset не збігається з OFFSET'))
+
+        offset_ms = self._time(offset_page, repeat)
+        keyset_ms = self._time(keyset_page, repeat)
+        self.stdout.write(
+            f'   сторінка {number:>6}: COUNT + OFFSET {offset_ms:8.2f} мс | keyset {keyset_ms:6.2f} мс '
+            f'(x{offset_ms / keyset_ms:.0f})'
+        )
+
+    def _time(self, func, repeat):
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            latencies.append((time.perf_counter() - start) * 1000)
+        return statistics.median(latencies)
+
+    def _explain(self):
+        """План запиту глибокої сторінки - має йти по індексу events_pub_start"""
+        queryset = filter_events({})
+        last = queryset.order_by(*ORDERING)[PER_PAGE * 1000]
+        paginator = KeysetPaginator(queryset, PER_PAGE, ORDERING)
+        query = paginator.seek_queryset([last.start_date, last.id])[:PER_PAGE + 1]
+        self.stdout.write(self.style.MIGRATE_HEADING('🔎 План keyset-запиту:'))
+        for line in query.explain().splitlines():
+            self.stdout.write(f'   {line}')
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,76 @@
+"""
+Скрипт для бенчмарку запису заявок з форм
+
+Порівнює стійку пропускну здатність запису FormSubmission поштучно (save)
+та через буфер з bulk_create на поточній БД. Для PostgreSQL запускати з
+відповідним DATABASE_URL. Тестові рядки видаляються після заміру.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from apps.core.models import FormSubmission
+from apps.core.submissions import SubmissionBuffer, build_submission
+
+BENCHMARK_FORM_TYPE = 'benchmark'
+
+
+class Command(BaseCommand):
+    help = 'Бенчмарк пропускної здатності запису заявок з форм (поштучно vs пачками)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=5000, help='Кількість заявок на режим')
+        parser.add_argument('--threads', type=int, default=4, help='Кількість потоків')
+        parser.add_argument('--buffer-size', type=int, default=50, help='Розмір буфера для пакетного режиму')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'🗄  БД: {connection.vendor}, заявок: {options["count"]}, потоків: {options["threads"]}')
+        try:
+            direct = self._run(options, lambda submission: submission.save())
+            buffer = SubmissionBuffer(size=options['buffer_size'], interval=1.0)
+            buffered = self._run(options, buffer.add, finish=buffer.flush)
+        finally:
+            FormSubmission.objects.filter(form_type=BENCHMARK_FORM_TYPE).delete()
+
+        self.stdout.write(f'🐢 Поштучно (save): {direct:.0f} заявок/с')
+        self.stdout.write(f'🚀 Пачками по {options["buffer_size"]}: {buffered:.0f} заявок/с')
+        self.stdout.write(self.style.SUCCESS(f'✅ Прискорення: x{buffered / direct:.1f}'))
+
+    def _run(self, options, write, finish=None):
+        count, threads_count = options['count'], options['threads']
+        form_data = {
+            'type': 'Бенчмарк', 'name': 'Тест', 'phone': '+380501234567', 'email': 'test@example.com',
+            'timestamp': timezone.now().strftime('%d.%m.%Y %H:%M'), 'ip': '127.0.0.1',
+            'user_agent': 'benchmark', 'details': 'Опис проекту ' * 10,
+        }
+
+        def worker(total):
+            for _ in range(total):
+                write(build_submission(BENCHMARK_FORM_TYPE, form_data))
+            connection.close()
+
+        chunks = [count // threads_count + (1 if i < count % threads_count else 0) for i in range(threads_count)]
+        threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if finish:
+            finish()
+        elapsed = time.perf_counter() - start
+
+        written = FormSubmission.objects.filter(form_type=BENCHMARK_FORM_TYPE).count()
+        FormSubmission.objects.filter(form_type=BENCHMARK_FORM_TYPE).delete()
+        if written != count:
+            self.stdout.write(self.style.WARNING(f'⚠️  Записано {written} з {count}'))
+        return count / elapsed
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,173 @@
+"""
+Скрипт для бенчмарку клієнта Monobank на локальному фейковому сервері
+
+Піднімає HTTP-сервер з API створення/статусу інвойсу (з затримкою та опційними
+5xx), порівнює латентність нового з'єднання на кожен запит (як requests.post)
+з пулом keep-alive з'єднань та async-варіантом, і перевіряє circuit breaker.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import asyncio
+import json
+import logging
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.payment.monobank_service import (
+    AsyncMonobankAcquiringService, CircuitBreaker, MonobankAcquiringService, MonobankClient,
+)
+
+
+def make_handler(latency, fail_every, handshake=0.0):
+    counter = {'requests': 0}
+    lock = threading.Lock()
+
+    class FakeMonobankHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, як у справжнього API
+        disable_nagle_algorithm = True  # інакше заголовки і тіло чекають delayed ACK (~40 мс)
+
+        def setup(self):
+            # Імітація TCP+TLS рукостискання: платиться лише за нове з'єднання
+            time.sleep(handshake)
+            super().setup()
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, data):
+            body = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                self.rfile.read(length)
+            with lock:
+                counter['requests'] += 1
+                number = counter['requests']
+            time.sleep(latency)
+            if fail_every and number % fail_every == 0:
+                return self._reply(503, {'errText': 'unavailable'})
+            invoice_id = uuid.uuid4().hex
+            if self.path.startswith('/api/merchant/invoice/create'):
+                return self._reply(200, {'invoiceId': invoice_id, 'pageUrl': f'https://pay.example/{invoice_id}'})
+            return self._reply(200, {'invoiceId': invoice_id, 'status': 'created'})
+
+        do_GET = _handle
+        do_POST = _handle
+
+    return FakeMonobankHandler
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = 'Бенчмарк p50/p99 клієнта Monobank (нове з\'єднання vs пул vs async) на фейковому сервері'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=400, help='Запитів на кожен режим')
+        parser.add_argument('--concurrency', type=int, default=8, help='Паралельних запитів')
+        parser.add_argument('--latency', type=float, default=0.02, help='Затримка відповіді сервера, с')
+        parser.add_argument('--handshake', type=float, default=0.04,
+                            help="Затримка встановлення з'єднання (TCP+TLS до api.monobank.ua), с")
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(options['latency'], fail_every=0, handshake=options['handshake']))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        self.stdout.write(
+            f'🏦 Фейковий Monobank: {base_url}, відповідь {options["latency"] * 1000:.0f} мс, '
+            f'рукостискання {options["handshake"] * 1000:.0f} мс'
+        )
+
+        try:
+            client = MonobankClient(base_url, max_concurrency=options['concurrency'])
+            service = MonobankAcquiringService(token='test', site_url='http://localhost', client=client)
+
+            def fresh_connection():
+                resp = requests.post(f'{base_url}/api/merchant/invoice/create', data='{}', timeout=20)
+                resp.raise_for_status()
+
+            def pooled():
+                invoice_id, _ = service.create_invoice('bench', Decimal('100.00'), 'Бенчмарк', 'Бенчмарк')
+                if not invoice_id:
+                    raise CommandError('Пул не створив інвойс')
+
+            self._report('Нове з\'єднання на запит', self._run_threads(fresh_connection, options))
+            self._report('Пул keep-alive з\'єднань', self._run_threads(pooled, options))
+            async_service = AsyncMonobankAcquiringService(token='test', site_url='http://localhost', client=client)
+            self._report('Async (asyncio.gather)', asyncio.run(self._run_async(async_service, options)))
+        finally:
+            server.shutdown()
+
+        self._check_circuit_breaker(options)
+
+    def _run_threads(self, call, options):
+        def timed(_):
+            start = time.perf_counter()
+            call()
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            return list(pool.map(timed, range(options['requests'])))
+
+    async def _run_async(self, service, options):
+        semaphore = asyncio.Semaphore(options['concurrency'])
+
+        async def timed():
+            async with semaphore:
+                start = time.perf_counter()
+                await service.create_invoice('bench', Decimal('100.00'), 'Бенчмарк', 'Бенчмарк')
+                return time.perf_counter() - start
+
+        return await asyncio.gather(*(timed() for _ in range(options['requests'])))
+
+    def _report(self, label, latencies):
+        self.stdout.write(
+            f'   {label}: p50 {statistics.median(latencies) * 1000:.1f} мс, '
+            f'p99 {percentile(latencies, 0.99) * 1000:.1f} мс'
+        )
+
+    def _check_circuit_breaker(self, options):
+        """Сервер, що завжди відповідає 503: після порогу запити мають відхилятись без мережі"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(options['latency'], fail_every=1))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        payment_logger = logging.getLogger('payment')
+        level = payment_logger.level
+        payment_logger.setLevel(logging.CRITICAL)  # 50 очікуваних помилок не мають засмічувати вивід
+        try:
+            breaker = CircuitBreaker(failure_threshold=5, reset_timeout=60)
+            client = MonobankClient(f'http://127.0.0.1:{server.server_address[1]}', breaker=breaker)
+            service = MonobankAcquiringService(token='test', site_url='http://localhost', client=client)
+            start = time.perf_counter()
+            for _ in range(50):
+                service.get_invoice_status('missing')
+            elapsed = time.perf_counter() - start
+        finally:
+            payment_logger.setLevel(level)
+            server.shutdown()
+
+        if breaker.state != 'open':
+            raise CommandError('Circuit breaker не відкрився після серії 5xx')
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Circuit breaker відкрився після {breaker.failures} помилок, 50 запитів за {elapsed * 1000:.0f} мс'
+        ))
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,102 @@
+"""
+Скрипт - replay-бенчмарк вебхука Monobank
+
+Створює тимчасові платіжні посилання, генерує для кожного події інвойсу
+(processing → success) і відтворює їх з повторними доставками в довільному
+порядку через повний стек Django. Міряє латентність нових подій і дублікатів
+та перевіряє, що кожне посилання оплачене рівно один раз.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import json
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.payment.models import MonobankWebhookEvent, PaymentLink
+
+BENCHMARK_CLIENT = 'webhook-benchmark'
+
+
+class Command(BaseCommand):
+    help = 'Replay-бенчмарк вебхука Monobank (за замовчуванням 10k доставок з дублікатами)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--deliveries', type=int, default=10000, help='Кількість доставок')
+        parser.add_argument('--links', type=int, default=1000, help='Кількість платіжних посилань')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        links = PaymentLink.objects.bulk_create([
+            PaymentLink(client_name=BENCHMARK_CLIENT, amount_usd=Decimal('10.00'), final_amount_uah=Decimal('400.00'),
+                        status=PaymentLink.Status.PENDING)
+            for _ in range(options['links'])
+        ])
+        references = [str(link.unique_id) for link in links]
+
+        # Унікальні події: processing та success для кожного інвойсу
+        base_time = timezone.now()
+        events = []
+        for number, reference in enumerate(references):
+            for offset, status in enumerate(('processing', 'success')):
+                events.append({
+                    'invoiceId': f'bench-{number}', 'status': status, 'reference': reference,
+                    'modifiedDate': (base_time + timedelta(seconds=offset)).isoformat(),
+                })
+        # Решта доставок - повтори випадкових подій (Monobank ретраїть до отримання 200)
+        deliveries = events + [rng.choice(events) for _ in range(max(0, options['deliveries'] - len(events)))]
+        rng.shuffle(deliveries)
+
+        url = reverse('payment:monobank_webhook')
+        client = Client()
+        first, duplicates = [], []
+        queries = {'first': 0, 'duplicate': 0}
+        start = time.perf_counter()
+        try:
+            for delivery in deliveries:
+                reset_queries()  # лог запитів у DEBUG обмежений, інакше підрахунок зламається
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = client.post(url, json.dumps(delivery), content_type='application/json')
+                    elapsed = time.perf_counter() - started
+                if response.status_code != 200:
+                    raise CommandError(f'Вебхук відповів {response.status_code}: {response.content[:200]}')
+                kind = 'duplicate' if response.json().get('duplicate') else 'first'
+                (duplicates if kind == 'duplicate' else first).append(elapsed)
+                queries[kind] += len(captured)
+            total = time.perf_counter() - start
+
+            paid = PaymentLink.objects.filter(client_name=BENCHMARK_CLIENT, status=PaymentLink.Status.PAID).count()
+            stored = MonobankWebhookEvent.objects.filter(reference__in=references).count()
+        finally:
+            MonobankWebhookEvent.objects.filter(reference__in=references).delete()
+            PaymentLink.objects.filter(client_name=BENCHMARK_CLIENT).delete()
+
+        self.stdout.write(f'📨 Доставок: {len(deliveries)} ({len(first)} нових, {len(duplicates)} дублікатів) '
+                          f'за {total:.2f} с - {len(deliveries) / total:.0f}/с ({connection.vendor})')
+        for label, latencies, kind in (('Нові події', first, 'first'), ('Дублікати', duplicates, 'duplicate')):
+            if latencies:
+                latencies.sort()
+                self.stdout.write(
+                    f'   {label}: медіана {statistics.median(latencies) * 1000:.2f} мс, '
+                    f'p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} мс, '
+                    f'{queries[kind] / len(latencies):.1f} SQL-запитів на доставку'
+                )
+
+        if paid != len(links) or stored != len(events) or len(first) != len(events):
+            raise CommandError(f'Оплачено {paid}/{len(links)}, подій {stored}/{len(events)}')
+        self.stdout.write(self.style.SUCCESS('✅ Кожна подія оброблена рівно один раз, всі посилання оплачені'))
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,50 @@
+"""
+Скрипт - мікробенчмарк кешу singleton-моделей
+
+L1-хіт проти читання зі спільного кешу та запиту в БД (PaymentSettings).
+Межу застарілості після правки перевіряють тести (apps/core/tests.py).
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import timeit
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+
+from apps.core.singletons import singleton_cache, singleton_store
+from apps.payment.models import PaymentSettings
+
+
+class Command(BaseCommand):
+    help = 'Мікробенчмарк L1-кешу singleton-моделей (PaymentSettings)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200000, help='Викликів у мікробенчмарку L1')
+
+    def handle(self, *args, **options):
+        settings_obj, created = PaymentSettings.objects.get_or_create()
+        try:
+            self._benchmark(options['iterations'])
+        finally:
+            if created:
+                settings_obj.delete()
+
+    def _benchmark(self, iterations):
+        cached = singleton_cache(PaymentSettings)
+        cached.get()
+        version_key = cached.version_key
+        rounds = max(1, iterations // 100)
+
+        results = [
+            ('L1 (пам\'ять процесу)', cached.get, iterations),
+            ('L2 (cache.get версії)', lambda: singleton_store.get(version_key), rounds * 10),
+            ('БД (objects.first)', lambda: PaymentSettings.objects.first(), rounds),
+        ]
+        self.stdout.write(f'⏱  Бекенд кешу: {caches["default"].__class__.__name__}')
+        for label, call, number in results:
+            elapsed = min(timeit.repeat(call, number=number, repeat=3))
+            self.stdout.write(f'   {label}: {elapsed / number * 1e9:,.0f} нс/виклик')
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,113 @@
+"""
+Скрипт для порівняння віддачі статики до і після хешованого маніфесту
+
+"До": WhiteNoise з WHITENOISE_USE_FINDERS + WHITENOISE_AUTOREFRESH - пошук файлу
+finders'ами та stat на кожен запит, нехешовані URL, max-age без immutable.
+"Після": HashedStaticFilesStorage (collectstatic у тимчасову теку) + StaticFilesMiddleware,
+індекс файлів у пам'яті, хешовані URL, готові .br/.gz.
+Запитуються CSS/JS з templates/base.html та сторінок, як їх запитує браузер
+(Accept-Encoding: br, gzip). Міряється пропускна здатність, байти та Cache-Control.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import re
+import statistics
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpResponseNotFound
+from django.test import RequestFactory, override_settings
+
+from prometey_project.middleware import StaticFilesMiddleware
+
+TEMPLATES = ['base.html', 'pages/home.html', 'pages/blog.html', 'pages/events.html']
+STATIC_TAG = re.compile(r"""{%\s*static\s+['"]([^'"]+\.(?:css|js))['"]\s*%}""")
+PLAIN_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+HASHED_STORAGE = 'apps.core.storage.HashedStaticFilesStorage'
+
+
+class Command(BaseCommand):
+    help = 'Пропускна здатність віддачі статики: finders+autorefresh vs хешований маніфест з .br/.gz'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Запитів на кожен режим')
+        parser.add_argument('--static-root', default='',
+                            help='Вже зібраний collectstatic STATIC_ROOT (інакше збирається в тимчасову теку)')
+
+    def handle(self, *args, **options):
+        names = self._asset_names()
+        if not names:
+            raise CommandError('У шаблонах не знайдено CSS/JS через {% static %}')
+        self.stdout.write(f'📄 {len(names)} CSS/JS файлів з {", ".join(TEMPLATES)}')
+
+        with tempfile.TemporaryDirectory() as tmp_root:
+            static_root = options['static_root'] or tmp_root
+            storages = {**settings.STORAGES, 'staticfiles': {'BACKEND': HASHED_STORAGE}}
+            with override_settings(DEBUG=False, STATIC_ROOT=static_root, STORAGES=storages):
+                if not options['static_root']:
+                    self.stdout.write('📦 collectstatic у тимчасову теку...')
+                    call_command('collectstatic', interactive=False, verbosity=0)
+
+                plain = {**settings.STORAGES, 'staticfiles': {'BACKEND': PLAIN_STORAGE}}
+                with override_settings(STORAGES=plain, WHITENOISE_USE_FINDERS=True, WHITENOISE_AUTOREFRESH=True,
+                                       WHITENOISE_MAX_AGE=31536000):
+                    before = self._bench('до (finders + autorefresh)', names, options['requests'])
+
+                with override_settings(WHITENOISE_USE_FINDERS=False, WHITENOISE_AUTOREFRESH=False,
+                                       WHITENOISE_MAX_AGE=3600):
+                    after = self._bench('після (маніфест + .br/.gz)', names, options['requests'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Пропускна здатність x{after / before:.1f} ({before:.0f} -> {after:.0f} запитів/с)'
+        ))
+
+    def _asset_names(self):
+        names = []
+        for template in TEMPLATES:
+            path = settings.BASE_DIR / 'templates' / template
+            for name in STATIC_TAG.findall(path.read_text(encoding='utf-8')):
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def _bench(self, label, names, count):
+        middleware = StaticFilesMiddleware(lambda request: HttpResponseNotFound())
+        factory = RequestFactory()
+        urls = [staticfiles_storage.url(name) for name in names]
+
+        page_bytes, cache_controls, encodings = 0, set(), set()
+        for url in urls:
+            response = middleware(factory.get(url, HTTP_ACCEPT_ENCODING='br, gzip'))
+            if response.status_code != 200:
+                raise CommandError(f'{label}: {url} -> {response.status_code}')
+            page_bytes += sum(len(chunk) for chunk in response.streaming_content)
+            cache_controls.add(response.get('Cache-Control'))
+            encodings.add(response.get('Content-Encoding') or 'identity')
+
+        latencies = []
+        for i in range(count):
+            request = factory.get(urls[i % len(urls)], HTTP_ACCEPT_ENCODING='br, gzip')
+            start = time.perf_counter()
+            response = middleware(request)
+            for _ in response.streaming_content:
+                pass
+            response.close()
+            latencies.append(time.perf_counter() - start)
+
+        throughput = count / sum(latencies)
+        self.stdout.write(self.style.MIGRATE_HEADING(f'🗂  {label}'))
+        self.stdout.write(
+            f'   {throughput:.0f} запитів/с, медіана {statistics.median(latencies) * 1000:.3f} мс, '
+            f'{page_bytes / 1024:.1f} КБ на {len(urls)} файлів\n'
+            f'   Content-Encoding: {", ".join(sorted(encodings))}\n'
+            f'   Cache-Control: {" | ".join(sorted(cache_controls))}'
+        )
+        return throughput
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,116 @@
+"""
+Скрипт для перевірки віддачі відео з Range-запитами через WhiteNoise
+
+Збирає драбину (build_videos) і статику (collectstatic) у тимчасові теки та
+запитує кожне відео через StaticFilesMiddleware так, як це робить браузер:
+GET без Range (Accept-Ranges, Cache-Control, без Content-Encoding),
+'bytes=0-1' (перевірка Safari), 'bytes=0-' (старт Chrome/Firefox) та 1 МБ
+із середини файлу (перемотування). Перевіряє 206, Content-Range/Content-Length,
+байти відповіді проти файлу, faststart (moov перед mdat) і порівнює час
+Range-відповіді з повним файлом.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpResponseNotFound
+from django.test import RequestFactory, override_settings
+
+from apps.core import videos
+from prometey_project.middleware import StaticFilesMiddleware
+
+HASHED_STORAGE = 'apps.core.storage.HashedStaticFilesStorage'
+SEEK_BYTES = 1024 * 1024
+
+
+class Command(BaseCommand):
+    help = 'Range-запити до відео через WhiteNoise: 206, Content-Range, faststart, час проти повного файлу'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Повторів для заміру часу')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as build_dir, tempfile.TemporaryDirectory() as static_root:
+            storages = {**settings.STORAGES, 'staticfiles': {'BACKEND': HASHED_STORAGE}}
+            static_dirs = [d for d in settings.STATICFILES_DIRS if d != settings.STATIC_BUILD_DIR] + [build_dir]
+            with override_settings(STATIC_BUILD_DIR=Path(build_dir), STATICFILES_DIRS=static_dirs,
+                                   STATIC_ROOT=static_root, STORAGES=storages, DEBUG=False):
+                self.stdout.write('🎬 build_videos + collectstatic у тимчасові теки...')
+                call_command('build_videos', verbosity=0)
+                call_command('collectstatic', interactive=False, verbosity=0)
+
+                manifest = Path(build_dir) / videos.STATIC_MANIFEST
+                names = []
+                for name, meta in (json.loads(manifest.read_text()) if manifest.exists() else {}).items():
+                    names += [name] + [rendition for _, rendition in meta['renditions']]
+                if not names:
+                    raise CommandError('Немає відео в маніфесті (ffmpeg недоступний?)')
+
+                middleware = StaticFilesMiddleware(lambda request: HttpResponseNotFound())
+                for name in names:
+                    self._check(middleware, name, static_root, options['requests'])
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {len(names)} відео віддаються з Range (206) та immutable кешем'))
+
+    def _get(self, middleware, url, **headers):
+        response = middleware(RequestFactory().get(url, HTTP_ACCEPT_ENCODING='br, gzip', **headers))
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        response.close()
+        return response, body
+
+    def _check(self, middleware, name, static_root, count):
+        url = staticfiles_storage.url(name)
+        path = os.path.join(static_root, unquote(url[len(settings.STATIC_URL):]))
+        with open(path, 'rb') as f:
+            data = f.read()
+        size = len(data)
+
+        response, body = self._get(middleware, url)
+        if response.status_code != 200 or body != data:
+            raise CommandError(f'{url}: {response.status_code}, {len(body)} з {size} байтів')
+        if response.get('Accept-Ranges') != 'bytes' or response.get('Content-Encoding'):
+            raise CommandError(f'{url}: Accept-Ranges={response.get("Accept-Ranges")}, '
+                               f'Content-Encoding={response.get("Content-Encoding")}')
+
+        cache_control = response.get('Cache-Control')
+        start = size // 2
+        end = min(start + SEEK_BYTES, size) - 1
+        for header, (first, last) in (('bytes=0-1', (0, 1)), ('bytes=0-', (0, size - 1)),
+                                      (f'bytes={start}-{end}', (start, end))):
+            response, body = self._get(middleware, url, HTTP_RANGE=header)
+            expected = f'bytes {first}-{last}/{size}'
+            if (response.status_code != 206 or response.get('Content-Range') != expected
+                    or int(response['Content-Length']) != last - first + 1 or body != data[first:last + 1]):
+                raise CommandError(f'{url} {header}: {response.status_code} {response.get("Content-Range")}, '
+                                   f'{len(body)} байтів')
+
+        full = self._time(middleware, url, count)
+        seek = self._time(middleware, url, count, HTTP_RANGE=f'bytes={start}-{end}')
+        faststart = '✓' if videos.is_faststart(path) else '✗ (moov після mdat - старт лише після повного файлу)'
+        self.stdout.write(
+            f'   {name} ({size / 1024:.0f} КБ): 206 для 0-1 / 0- / {(end - start + 1) / 1024:.0f} КБ із середини '
+            f'за {seek * 1000:.2f} мс (повний файл {full * 1000:.2f} мс); '
+            f'{cache_control}; faststart {faststart}'
+        )
+
+    def _time(self, middleware, url, count, **headers):
+        latencies = []
+        for _ in range(count):
+            started = time.perf_counter()
+            self._get(middleware, url, **headers)
+            latencies.append(time.perf_counter() - started)
+        return statistics.median(latencies)
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
@@ -0,0 +1,28 @@
+"""
+Бенчмарки та навантажувальні тести поза застосунками
+
+Скрипти не входять у management-команди застосунків, тож не потрапляють у
+`manage.py help` на продакшн-сервері. Запуск з кореня репозиторію, з тими ж
+налаштуваннями й аргументами, що й у manage.py:
+
+    DEBUG=True python scripts/bench/benchmark_blog_search.py --posts 2000
+
+Поведінкові перевірки (інвалідація кешів, відсутність переповнення тощо) -
+у тестах застосунків: python manage.py test
+"""
+import os
+import sys
+from pathlib import Path
+
+import django
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+
+def run(command_class):
+    """Розбирає аргументи й виконує команду так само, як manage.py"""
+    # prog у --help: 'python scripts/bench/<назва>.py'
+    command_class().run_from_argv(['python', sys.argv[0], *sys.argv[1:]])
@@ -0,0 +1,129 @@
+"""
+Скрипт для навантажувального тесту підказок пошуку
+
+Ганяє запити з префіксами реальних заголовків і рахує req/s та латентність на
+один процес. Рівні (--layer):
+  handler - повний стек Django (middleware, URL-роутинг, view) через WSGIHandler
+            з готовим environ, без накладних витрат тестового клієнта;
+  view    - лише blog_suggest із заздалегідь зібраними запитами;
+  trie    - лише suggest() (пошук у префіксному дереві).
+HTTP-сервер (uvicorn) та мережа в заміри не входять.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import io
+import random
+import statistics
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import reverse
+
+from apps.blog.index import get_blog_index
+from apps.blog.suggest import get_suggest_trie, normalize, suggest
+from apps.blog.views import blog_suggest
+
+LAYERS = ('handler', 'view', 'trie')
+TARGET_RPS = 2000
+
+
+class Command(BaseCommand):
+    help = 'Навантажувальний тест /blog/search/suggest/ (req/s та латентність на воркер)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000, help='Кількість запитів на рівень')
+        parser.add_argument('--threads', type=int, default=1, help='Кількість потоків')
+        parser.add_argument('--layer', choices=LAYERS, action='append', help='Рівень (можна кілька; за замовчуванням усі)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        titles = [normalize(post.title) for post in get_blog_index().posts()]
+        if not titles:
+            self.stdout.write(self.style.WARNING('Немає опублікованих статей для тесту'))
+            return
+
+        # Префікси як при наборі: 1..12 символів від початку заголовка або слова
+        prefixes = []
+        for _ in range(options['requests']):
+            words = rng.choice(titles).split(' ')
+            text = ' '.join(words[rng.randrange(len(words)):])
+            prefixes.append(text[:rng.randint(1, 12)])
+
+        get_suggest_trie()  # прогрів: побудова trie не входить у заміри
+        self.stdout.write(f'📨 Запитів на рівень: {len(prefixes)}, потоків: {options["threads"]}, '
+                          f'бекенд кешу: {settings.CACHES["default"]["BACKEND"].rsplit(".", 1)[-1]}')
+        for layer in options['layer'] or LAYERS:
+            call = getattr(self, f'_{layer}_call')()
+            for prefix in prefixes[:200]:
+                call(prefix)
+            rps, latencies, errors = self._run(call, prefixes, options['threads'])
+            style = self.style.SUCCESS if rps >= TARGET_RPS else self.style.WARNING
+            self.stdout.write(style(
+                f'{layer:<8} {rps:>7.0f} req/s (ціль {TARGET_RPS}), помилок: {errors}; '
+                f'медіана {statistics.median(latencies) * 1000:.3f} мс, '
+                f'p95 {latencies[int(len(latencies) * 0.95)] * 1000:.3f} мс, '
+                f'p99 {latencies[int(len(latencies) * 0.99)] * 1000:.3f} мс'
+            ))
+
+    def _handler_call(self):
+        handler = WSGIHandler()
+        path = reverse('blog:blog_suggest')
+        host = settings.ALLOWED_HOSTS[0]
+
+        def start_response(status, headers):
+            start_response.status = status
+
+        def call(prefix):
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': urlencode({'q': prefix}),
+                'SERVER_NAME': host, 'SERVER_PORT': '443', 'HTTP_HOST': host, 'SERVER_PROTOCOL': 'HTTP/1.1',
+                'wsgi.url_scheme': 'https', 'wsgi.input': io.BytesIO(), 'wsgi.errors': io.StringIO(),
+            }
+            b''.join(handler(environ, start_response))
+            return start_response.status.startswith('200')
+        return call
+
+    def _view_call(self):
+        factory = RequestFactory()
+        path = reverse('blog:blog_suggest')
+        return lambda prefix: blog_suggest(factory.get(path, {'q': prefix})).status_code == 200
+
+    def _trie_call(self):
+        return lambda prefix: suggest(prefix) is not None
+
+    def _run(self, call, prefixes, threads):
+        chunks = [prefixes[i::threads] for i in range(threads)]
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker(chunk):
+            local = []
+            for prefix in chunk:
+                start = time.perf_counter()
+                ok = call(prefix)
+                local.append(time.perf_counter() - start)
+                if not ok:
+                    errors.append(prefix)
+            with lock:
+                latencies.extend(local)
+
+        workers = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        return len(latencies) / elapsed, latencies, len(errors)
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
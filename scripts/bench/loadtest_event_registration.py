@@ -0,0 +1,108 @@
+"""
+Скрипт для навантажувального тесту реєстрацій на подію
+
+Відтворює флеш-анонс: N одночасних POST на event_registration через повний
+стек Django з кількох потоків. У режимі queue заявки йдуть у чергу, після чого
+вимірюється час drain_registrations; у режимі sync - пряма атомарна реєстрація.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import threading
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.events.intake import drain_registrations
+from apps.events.models import Event, EventCategory, EventRegistration, RegistrationIntake
+
+
+class Command(BaseCommand):
+    help = 'Навантажувальний тест реєстрацій на подію (за замовчуванням 1000 одночасних заявок)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help='Кількість заявок')
+        parser.add_argument('--threads', type=int, default=50, help='Кількість потоків')
+        parser.add_argument('--capacity', type=int, default=0, help='Ліміт учасників (0 - без обмежень)')
+        parser.add_argument('--mode', choices=['queue', 'sync'], default='queue')
+
+    def handle(self, *args, **options):
+        category, _ = EventCategory.objects.get_or_create(
+            slug='stress-test', defaults={'name': 'Стрес-тест'}
+        )
+        start_date = timezone.now() + timedelta(days=7)
+        event = Event.objects.create(
+            title=f'Навантажувальний тест реєстрацій {int(time.time() * 1000)}',
+            excerpt='Тимчасова подія', content='Тимчасова подія',
+            category=category, event_type='webinar',
+            start_date=start_date, end_date=start_date + timedelta(hours=1),
+            max_participants=options['capacity'] or None,
+        )
+        url = reverse('event_registration', args=[event.pk])
+        requests_count = options['requests']
+        threads_count = options['threads']
+
+        latencies = []
+        failures = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(threads_count)
+
+        def worker(numbers):
+            client = Client()
+            local = []
+            barrier.wait()
+            for number in numbers:
+                started = time.perf_counter()
+                response = client.post(url, {
+                    'name': f'Учасник {number}', 'email': f'user{number}@load.test', 'phone': '+380501234567',
+                })
+                local.append(time.perf_counter() - started)
+                if response.status_code != 302:
+                    failures.append(response.status_code)
+            connection.close()
+            with lock:
+                latencies.extend(local)
+
+        self.stdout.write(f'🚀 {requests_count} заявок, {threads_count} потоків, режим {options["mode"]} '
+                          f'({connection.vendor})')
+        chunks = [range(i, requests_count, threads_count) for i in range(threads_count)]
+        with override_settings(EVENTS_REGISTRATION_QUEUE=options['mode'] == 'queue'):
+            threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            intake_time = time.perf_counter() - started
+
+        latencies.sort()
+        self.stdout.write(
+            f'📨 Прийом: {len(latencies) / intake_time:.0f} req/s, медіана {latencies[len(latencies) // 2] * 1000:.1f} мс, '
+            f'p95 {latencies[int(len(latencies) * 0.95)] * 1000:.1f} мс, помилок: {len(failures)}'
+        )
+
+        if options['mode'] == 'queue':
+            started = time.perf_counter()
+            batches = 0
+            while drain_registrations():
+                batches += 1
+            self.stdout.write(f'🗂  Черга оброблена за {time.perf_counter() - started:.2f} с ({batches} пачок)')
+
+        event.refresh_from_db(fields=['current_participants'])
+        registrations = EventRegistration.objects.filter(event=event).count()
+        RegistrationIntake.objects.filter(event_id=event.pk).delete()
+        event.delete()
+
+        self.stdout.write(f'🔢 Лічильник: {event.current_participants}, реєстрацій у БД: {registrations}')
+        expected = min(requests_count, options['capacity'] or requests_count)
+        if event.current_participants != registrations or registrations != expected:
+            raise CommandError(f'Очікувалось {expected} реєстрацій')
+        self.stdout.write(self.style.SUCCESS('✅ Всі заявки зареєстровано, лічильник коректний'))
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
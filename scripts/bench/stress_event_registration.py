@@ -0,0 +1,106 @@
+"""
+Скрипт для стрес-тесту реєстрацій на подію
+
+Створює тимчасову подію з обмеженням місць, одночасно запускає реєстрації
+з багатьох потоків (частина з повторними email) і перевіряє, що подія
+не переповнена, а лічильник збігається з кількістю реєстрацій.
+Результат має сенс на PostgreSQL; SQLite серіалізує записи глобальним локом.
+"""
+import django_setup  # django.setup() - до імпорту моделей застосунків
+
+import threading
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.events.models import (
+    AlreadyRegisteredError, Event, EventCategory, EventFullError, EventRegistration,
+)
+
+
+class Command(BaseCommand):
+    help = 'Стрес-тест атомарних реєстрацій на подію з багатьох потоків'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=40, help='Кількість потоків')
+        parser.add_argument('--capacity', type=int, default=25, help='Максимальна кількість учасників')
+        parser.add_argument('--duplicates', type=int, default=5, help='Потоків з уже використаним email')
+
+    def handle(self, *args, **options):
+        threads_count = options['threads']
+        capacity = options['capacity']
+        duplicates = min(options['duplicates'], threads_count - 1)
+
+        category, _ = EventCategory.objects.get_or_create(
+            slug='stress-test', defaults={'name': 'Стрес-тест'}
+        )
+        start_date = timezone.now() + timedelta(days=7)
+        event = Event.objects.create(
+            title=f'Стрес-тест реєстрацій {int(time.time() * 1000)}',
+            excerpt='Тимчасова подія', content='Тимчасова подія',
+            category=category, event_type='webinar', is_published=False,
+            start_date=start_date, end_date=start_date + timedelta(hours=1),
+            max_participants=capacity,
+        )
+
+        # Останні потоки повторюють email перших - має спрацювати unique_together
+        emails = [f'user{number}@stress.test' for number in range(threads_count - duplicates)]
+        emails += emails[:duplicates]
+        barrier = threading.Barrier(threads_count)
+        outcomes = {'registered': 0, 'full': 0, 'duplicate': 0, 'error': 0}
+        errors = []
+        lock = threading.Lock()
+
+        def worker(email):
+            barrier.wait()
+            try:
+                EventRegistration.register(event, name='Stress', email=email, phone='0000000000')
+                outcome = 'registered'
+            except EventFullError:
+                outcome = 'full'
+            except AlreadyRegisteredError:
+                outcome = 'duplicate'
+            except Exception as exc:
+                outcome = 'error'
+                errors.append(repr(exc))
+            finally:
+                connection.close()
+            with lock:
+                outcomes[outcome] += 1
+
+        self.stdout.write(f'🚀 {threads_count} потоків, {capacity} місць, {duplicates} дублікатів email '
+                          f'({connection.vendor})')
+        threads = [threading.Thread(target=worker, args=(email,)) for email in emails]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        event.refresh_from_db(fields=['current_participants'])
+        registrations = EventRegistration.objects.filter(event=event).count()
+        event.delete()
+
+        self.stdout.write(
+            f'📊 Зареєстровано: {outcomes["registered"]}, місць немає: {outcomes["full"]}, '
+            f'дублікатів: {outcomes["duplicate"]}, помилок: {outcomes["error"]} за {elapsed:.2f} с'
+        )
+        for error in errors[:5]:
+            self.stdout.write(self.style.WARNING(f'   {error}'))
+        self.stdout.write(f'🔢 Лічильник: {event.current_participants}, реєстрацій у БД: {registrations}')
+
+        if event.current_participants != registrations:
+            raise CommandError('Лічильник учасників розійшовся з кількістю реєстрацій')
+        if registrations > capacity:
+            raise CommandError(f'Подію переповнено: {registrations} > {capacity}')
+        if outcomes['registered'] != registrations:
+            raise CommandError('Кількість успішних реєстрацій не збігається з БД')
+        self.stdout.write(self.style.SUCCESS('✅ Переповнення та втрачених інкрементів немає'))
+
+
+if __name__ == '__main__':
+    django_setup.run(Command)
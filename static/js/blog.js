@@ -7,6 +7,7 @@
 document.addEventListener('DOMContentLoaded', () => {
     initArticleAnimations();
     initArticleTracking();
+    initSearchSuggest();
     setActiveMenuLink();
 });
 
@@ -49,6 +50,64 @@ function initArticleTracking() {
     });
 }
 
+// ===== SEARCH SUGGEST =====
+function initSearchSuggest() {
+    const input = document.querySelector('.search-input[data-suggest-url]');
+    if (!input) return;
+
+    const list = document.createElement('ul');
+    list.className = 'search-suggestions';
+    list.hidden = true;
+    input.closest('.search-input-wrapper')?.appendChild(list);
+
+    // Відповіді на префікси кешуються на клієнті - повторні натискання не йдуть у мережу
+    const cache = new Map();
+    let controller = null;
+
+    const render = (suggestions) => {
+        list.replaceChildren(...suggestions.map(({ text, type, url }) => {
+            const item = document.createElement('li');
+            const link = document.createElement('a');
+            link.href = url;
+            link.textContent = text;
+            link.className = `search-suggestion search-suggestion--${type}`;
+            item.appendChild(link);
+            return item;
+        }));
+        list.hidden = suggestions.length === 0;
+    };
+
+    input.addEventListener('input', async () => {
+        const query = input.value.trim().toLowerCase();
+        if (!query) {
+            render([]);
+            return;
+        }
+        if (cache.has(query)) {
+            render(cache.get(query));
+            return;
+        }
+
+        controller?.abort();
+        controller = new AbortController();
+        try {
+            const response = await fetch(`${input.dataset.suggestUrl}?q=${encodeURIComponent(query)}`, {
+                signal: controller.signal
+            });
+            const data = await response.json();
+            cache.set(query, data.suggestions);
+            if (input.value.trim().toLowerCase() === query) {
+                render(data.suggestions);
+            }
+        } catch (error) {
+            if (error.name !== 'AbortError') render([]);
+        }
+    });
+
+    input.addEventListener('blur', () => setTimeout(() => { list.hidden = true; }, 150));
+    input.addEventListener('focus', () => { list.hidden = list.children.length === 0; });
+}
+
 // ===== ACTIVE MENU =====
 function setActiveMenuLink() {
     const blogLink = document.querySelector('.nav-link[href*="blog"]');
@@ -65,9 +65,9 @@ async function applyFilters(filters, container) {
 
         const data = await response.json();
 
-        if (data.events) {
-            updateEventsGrid(data.events, container);
-            updatePagination(data);
+        if (data.html !== undefined) {
+            updateEventsGrid(data.html, container);
+            updatePagination(data.pagination, container);
         }
     } catch (error) {
         console.error('Filter error:', error);
@@ -78,100 +78,19 @@ async function applyFilters(filters, container) {
     }
 }
 
-function updateEventsGrid(events, container) {
-    container.innerHTML = '';
-
-    if (events.length === 0) {
-        container.innerHTML = `
-            <div class="no-events">
-                <h3 class="text-medium color-brand-orange mb-sm">Події не знайдено</h3>
-                <p class="text-base">Спробуйте змінити фільтри</p>
-            </div>
-        `;
-        return;
-    }
-
-    events.forEach((event, index) => {
-        const card = createEventCard(event, index + 1);
-        container.appendChild(card);
-    });
+// Картки та пагінацію рендерить сервер (ті ж шаблони, що й сторінка)
+function updateEventsGrid(html, container) {
+    container.innerHTML = html;
 
     // Перезапуск анімацій
     initEventAnimations();
 }
 
-function createEventCard(event, number) {
-    const card = document.createElement('article');
-    card.className = 'event-card';
-    card.dataset.event = number;
-
-    const priceHtml = event.price !== 'Безкоштовно'
-        ? `<span class="detail-value price-value">${event.price}</span>`
-        : `<span class="detail-value free-price">Безкоштовно</span>`;
-
-    const registerBtn = event.is_registration_open
-        ? `<button class="register-btn btn btn-primary" data-event-id="${event.id}">Реєстрація</button>`
-        : `<span class="registration-closed text-small">Реєстрація закрита</span>`;
-
-    card.innerHTML = `
-        <div class="card-header">
-            <span class="event-number text-page color-brand-orange">${String(number).padStart(2, '0')}</span>
-            <div class="event-meta">
-                <time class="event-date text-small">${event.start_date}</time>
-                <span class="event-type" style="background-color: ${event.category_color}">
-                    ${event.event_type}
-                </span>
-            </div>
-        </div>
-        
-        <div class="card-content">
-            <h2 class="text-medium mb-xs">
-                <a href="${event.url}" class="event-link">${event.title}</a>
-            </h2>
-            <p class="text-base mb-sm event-excerpt">${event.excerpt}</p>
-            
-            <div class="event-details">
-                <div class="detail-item">
-                    <span class="detail-label">Категорія:</span>
-                    <span class="detail-value">${event.category_name}</span>
-                </div>
-                <div class="detail-item">
-                    <span class="detail-label">Ціна:</span>
-                    ${priceHtml}
-                </div>
-            </div>
-        </div>
-        
-        <div class="card-footer">
-            <a href="${event.url}" class="event-details-link text-base color-brand-orange">Детальніше →</a>
-            ${registerBtn}
-        </div>
-    `;
-
-    return card;
-}
-
-function updatePagination(data) {
-    const pagination = document.querySelector('.events-pagination');
-    if (!pagination) return;
-
-    if (data.total_pages <= 1) {
-        pagination.style.display = 'none';
-        return;
+function updatePagination(html, container) {
+    document.querySelector('.events-pagination')?.remove();
+    if (html) {
+        container.insertAdjacentHTML('afterend', html);
     }
-
-    pagination.style.display = 'flex';
-
-    let html = '';
-    if (data.has_previous) {
-        html += `<a href="?page=${data.current_page - 1}" class="pagination-link">← Попередня</a>`;
-    }
-    html += `<span class="pagination-info text-base">Сторінка ${data.current_page} з ${data.total_pages}</span>`;
-    if (data.has_next) {
-        html += `<a href="?page=${data.current_page + 1}" class="pagination-link">Наступна →</a>`;
-    }
-
-    pagination.innerHTML = html;
 }
 
 // ===== EVENT ANIMATIONS =====